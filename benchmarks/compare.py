@@ -0,0 +1,58 @@
+import argparse
+import json
+import sys
+
+
+def result_key(result: dict) -> tuple:
+    return result["name"], tuple(sorted(result["scale"].items()))
+
+
+def compare_results(baseline: dict, current: dict, threshold: float = 1.25) -> list[dict]:
+    """
+    Compare two benchmark runs from benchmarks.run, matching results on benchmark name and scale
+
+    Args:
+        baseline (dict): Results of the run to compare against
+        current (dict): Results of the new run
+        threshold (float, optional): Slowdown ratio counted as a regression. Defaults to 1.25.
+
+    Returns:
+        list[dict]: name, scale, baseline/current seconds, their ratio and whether it regressed, for each shared benchmark
+    """
+    baseline_results = {result_key(r): r for r in baseline["results"]}
+    comparisons = []
+    for r in current["results"]:
+        base = baseline_results.get(result_key(r))
+        if base is None:
+            continue
+        ratio = r["seconds"] / base["seconds"] if base["seconds"] else float("inf")
+        comparisons.append({
+            "name": r["name"],
+            "scale": r["scale"],
+            "baseline_seconds": base["seconds"],
+            "seconds": r["seconds"],
+            "ratio": ratio,
+            "regression": ratio > threshold,
+        })
+    return comparisons
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files, exiting with 1 if anything regressed")
+    parser.add_argument("baseline", help="Results JSON to compare against")
+    parser.add_argument("current", help="Results JSON of the new run")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Slowdown ratio counted as a regression")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    comparisons = compare_results(baseline, current, threshold=args.threshold)
+    print(f"{baseline.get('commit')} -> {current.get('commit')}")
+    for c in comparisons:
+        flag = "REGRESSION" if c["regression"] else ""
+        print(f"{c['name']:<40} {c['scale']['pages']:>5} pages {c['baseline_seconds']:>10.4f}s {c['seconds']:>10.4f}s {c['ratio']:>6.2f}x {flag}")
+
+    sys.exit(1 if any(c["regression"] for c in comparisons) else 0)
@@ -0,0 +1,167 @@
+import argparse
+from datetime import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+
+from benchmarks.synthetic import DEFAULT_CONFIG, generate_corpus
+from coleridge.data.parse_custom import parse_custom_string
+from coleridge.data.parse_xml import extract_entities, find_continued_text, parse_attributes, parse_custom_attribute_string, parse_region
+from coleridge.data.pipeline import load_report
+from coleridge.data.read_xml import iter_text_regions, ns
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Scripts run end to end, with the arguments that keep them from reusing earlier runs
+SCRIPTS = {
+    "extract_entities.py": ["--no-cache"],
+    "extract_places.py": ["--no-cache"],
+    "extract_maps.py": ["--no-cache"],
+    "extract_all.py": ["--no-cache"],
+    "check_tag_attributes.py": [],  # Reads the tags straight from the reports, there's no parse cache to skip
+    "check_overlapping_tags.py": [],
+}
+
+
+def time_it(func, repeat: int, setup=None) -> list[float]:
+    """
+    Wall clock seconds of each of repeat calls to func, setup is called untimed before each call
+    """
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def result(name: str, scale: dict, items: int, timings: list[float]) -> dict:
+    best = min(timings)
+    return {
+        "name": name,
+        "scale": scale,
+        "items": items,
+        "seconds": best,
+        "median_seconds": statistics.median(timings),
+        "us_per_item": best / items * 1e6 if items else None,
+    }
+
+
+def function_benchmarks(report_path: str, scale: dict, repeat: int) -> list[dict]:
+    """
+    Time the parse_xml functions over every line of a report
+    """
+    regions = [region[1:-1] for region in iter_text_regions(report_path, backend="etree")]
+    lines = [line for region in regions for line in region]
+    line_idxs = [(region, i) for region in regions for i in range(len(region))]
+    continued_idxs = [(region, i) for region, i in line_idxs if "continued:true" in (region[i].attrib.get("custom") or "")]
+
+    parsed_regions = [parse_region(region) for region in regions]
+    line_attributes = [attributes for region in parsed_regions for attributes in region]
+
+    results = [
+        result("parse_custom_attribute_string", scale, len(lines), time_it(
+            lambda: [parse_custom_attribute_string(line) for line in lines], repeat, setup=parse_custom_string.cache_clear)),
+        result("parse_custom_attribute_string_cached", scale, len(lines), time_it(
+            lambda: [parse_custom_attribute_string(line) for line in lines], repeat)),
+        result("parse_attributes", scale, len(line_idxs), time_it(
+            lambda: [parse_attributes(region, line_idx=i) for region, i in line_idxs], repeat, setup=parse_custom_string.cache_clear)),
+        result("parse_region", scale, len(line_idxs), time_it(
+            lambda: [parse_region(region) for region in regions], repeat, setup=parse_custom_string.cache_clear)),
+        result("find_continued_text", scale, len(continued_idxs), time_it(
+            lambda: [find_continued_text(region, line_idx=i, attr="") for region, i in continued_idxs], repeat)),
+        result("extract_entities", scale, len(line_attributes), time_it(
+            lambda: [extract_entities(attributes) for attributes in line_attributes], repeat)),
+        result("load_report", scale, len(lines), time_it(
+            lambda: load_report(report_path), repeat, setup=parse_custom_string.cache_clear)),
+    ]
+    return results
+
+
+def script_benchmarks(corpus_dir: str, scale: dict, repeat: int, lines: int) -> list[dict]:
+    """
+    Time each extraction script end to end in a scratch copy of the repo's data layout
+    """
+    env = os.environ | {"PYTHONPATH": REPO_ROOT + os.pathsep + os.environ.get("PYTHONPATH", "")}
+    results = []
+    for script, args in SCRIPTS.items():
+        def run():
+            subprocess.run(
+                [sys.executable, os.path.join(REPO_ROOT, script)] + args,
+                cwd=corpus_dir, env=env, check=True, stdout=subprocess.DEVNULL,
+            )
+        results.append(result(f"script:{script}", scale, lines, time_it(run, repeat)))
+    return results
+
+
+def git_commit() -> str|None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(pages: list[int], reports: int = 2, repeat: int = 3, seed: int = 0, scripts: bool = True) -> dict:
+    """
+    Generate a synthetic corpus at each scale and benchmark the parsing functions and extraction scripts on it
+
+    Args:
+        pages (list[int]): Pages per report for each scale to run
+        reports (int, optional): Reports in each corpus. Defaults to 2.
+        repeat (int, optional): Timed runs of each benchmark, the fastest is reported. Defaults to 3.
+        seed (int, optional): Random seed for the corpus. Defaults to 0.
+        scripts (bool, optional): Also run the extraction scripts end to end. Defaults to True.
+
+    Returns:
+        dict: Run metadata and a result per benchmark and scale
+    """
+    results = []
+    for n_pages in pages:
+        with tempfile.TemporaryDirectory() as corpus_dir:
+            for subdir in ["data/interim", "data/processed", "logs"]:
+                os.makedirs(os.path.join(corpus_dir, subdir))
+            report_paths = generate_corpus(
+                os.path.join(corpus_dir, "data", "interim"), list(range(1865, 1865 + reports)), seed=seed, pages=n_pages
+            )
+            lines = sum(1 for p in report_paths for _ in ET.parse(p).getroot().iter(f"{{{ns['page']}}}TextLine"))
+
+            results.extend(function_benchmarks(report_paths[0], {"pages": n_pages, "reports": 1}, repeat))
+            if scripts:
+                results.extend(script_benchmarks(corpus_dir, {"pages": n_pages, "reports": reports}, repeat, lines))
+
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": DEFAULT_CONFIG | {"seed": seed, "repeat": repeat},
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark parsing and extraction on synthetic PAGE XML reports")
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 40], help="Pages per report, one corpus per value")
+    parser.add_argument("--reports", type=int, default=2, help="Reports in each corpus")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs of each benchmark")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the corpus")
+    parser.add_argument("--no-scripts", action="store_true", help="Skip running the extraction scripts end to end")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON file to write results to")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.pages, reports=args.reports, repeat=args.repeat, seed=args.seed, scripts=not args.no_scripts)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    for r in results["results"]:
+        print(f"{r['name']:<40} {r['scale']['pages']:>5} pages {r['seconds']:>10.4f}s")
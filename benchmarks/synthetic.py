@@ -0,0 +1,247 @@
+import os
+import random
+import xml.etree.ElementTree as ET
+
+from coleridge.data.read_xml import ns
+
+ESCAPED_SPACE = "\\" + "u0020"  # Transkribus escapes spaces in tag values
+
+FIRSTNAMES = ["A. B.", "James", "Andrew", "J.", "Golam", "Abdool Samud", "Ramchunder", "William"]
+LASTNAMES = ["Melville", "Mulheran", "Chamarett", "Khan", "Pershad", "Robinson", "Mahomed", "Strahan"]
+TITLES = ["Captain", "Mr.", "Lieutenant", "Esquire", "Major"]
+PLACES = ["Hydrabad", "Kerowlee", "Gwalior", "Rewah", "Bundelkund", "Dholpore", "Dattiah"]
+WORDS = "the survey of country was carried on in and season party work maps Sheet Indian Atlas district hills".split()
+ROLE = "Executive Officer in charge"
+ROLE_TAIL = "Officer in charge"
+ATTRIBUTE_TEXTS = {
+    "military_branch": "Royal Engineers",
+    "organization": "Survey Department",
+    "medical": "sick leave",
+    "ethnicity": "Native",
+}
+
+DEFAULT_CONFIG = {
+    "pages": 20,
+    "regions_per_page": (3, 8),
+    "lines_per_region": (3, 15),
+    "credit_lines": (2, 8),
+    "heading_rate": 0.15,
+    "tag_density": 0.3,
+    "continued_rate": 0.2,
+    "overlap_rate": 0.3,
+}
+
+
+def q(tag: str) -> str:
+    return f"{{{ns['page']}}}{tag}"
+
+
+def escape(value: str) -> str:
+    return value.replace(" ", ESCAPED_SPACE)
+
+
+def tag(name: str, offset: int, length: int, **attributes) -> str:
+    """
+    A Transkribus custom tag, e.g. person {offset:0; length:5;lastname:Dutt;}
+    """
+    values = "".join(f"{k}:{escape(str(v))};" for k, v in attributes.items())
+    return f"{name} {{offset:{offset}; length:{length};{values}}}"
+
+
+def add_region(page: ET.Element, idx: int, structure: str = None) -> ET.Element:
+    region = ET.SubElement(page, q("TextRegion"), id=f"r_{idx}")
+    region.set("custom", f"readingOrder {{index:{idx};}}" + (f" structure {{type:{structure};}}" if structure else ""))
+    ET.SubElement(region, q("Coords"), points="0,0 1,1")
+    return region
+
+
+def add_line(region: ET.Element, idx: int, text: str, tags: list[str]):
+    line = ET.SubElement(region, q("TextLine"), id=f"{region.attrib['id']}_l{idx}")
+    line.set("custom", " ".join([f"readingOrder {{index:{idx};}}"] + tags))
+    ET.SubElement(line, q("Coords"), points="0,0 1,1")
+    ET.SubElement(line, q("Baseline"), points="0,0 1,1")
+    ET.SubElement(ET.SubElement(line, q("TextEquiv")), q("Unicode")).text = text
+
+
+def finish_region(region: ET.Element):
+    lines = [line[2][0].text for line in region if line.tag == q("TextLine")]
+    ET.SubElement(ET.SubElement(region, q("TextEquiv")), q("Unicode")).text = "\n".join(lines)
+
+
+def heading(page: ET.Element, rng: random.Random, idx: int, number: int):
+    region = add_region(page, idx, "heading")
+    party = f"No. {number}.—TOPOGRAPHICAL PARTY."
+    add_line(region, 0, party, [tag("survey_party", 0, len(party) - 1)])
+
+    place = rng.choice(PLACES).upper()
+    area = f"{place} SURVEY,"
+    add_line(region, 1, area, [
+        tag("survey_area", 0, len(area) - 1),
+        tag("place", 0, len(place), placeName=place, wikiData=f"Q{rng.randint(1, 999)}"),
+    ])
+    add_line(region, 2, f"Season 18{rng.randint(60, 79)}-{rng.randint(60, 79)}.", [])
+    finish_region(region)
+
+
+def credit(page: ET.Element, rng: random.Random, idx: int, config: dict, complete: bool = False):
+    """
+    Credit lines of person entities with overlapping role/leader/member/ethnicity tags and roles continued onto the next line
+    A complete credit uses every kind of tag, so every output column is filled at any scale
+    """
+    region = add_region(page, idx, "credit")
+    extra_tags = list(ATTRIBUTE_TEXTS) + ["place"]
+    n_lines = len(extra_tags) + 1 if complete else rng.randint(*config["credit_lines"])
+    role_tail = False
+    for i in range(n_lines):
+        text = ""
+        tags = []
+        if role_tail:
+            text = ROLE_TAIL + ", "
+            tags.append(tag("role", 0, len(ROLE_TAIL), continued="true", title="Sub- Assistant"))
+            role_tail = False
+
+        firstname, lastname, title = rng.choice(FIRSTNAMES), rng.choice(LASTNAMES), rng.choice(TITLES)
+        person = f"{title} {firstname} {lastname}"
+        person_offset = len(text)
+        text += person
+        person_attributes = {"firstname": firstname, "title": title, "lastname": lastname}
+        if rng.random() < 0.1 or (complete and i == 0):
+            person_attributes["dateOfDeath"] = "25/03/1869"
+        tags.append(tag("person", person_offset, len(person), **person_attributes))
+
+        if rng.random() < config["overlap_rate"]:
+            tags.append(tag(rng.choice(["leader", "member"]), person_offset, len(person)))
+        if rng.random() < config["overlap_rate"]:
+            tags.append(tag("ethnicity", person_offset, len(person)))
+        if rng.random() < config["overlap_rate"] / 2 or (complete and i == 0):
+            tags.append(tag("role", person_offset, 3, title="Native Surveyor", seniority="2nd grade"))
+
+        text += ", "
+        if complete and i < len(extra_tags) or rng.random() < config["tag_density"]:
+            name = extra_tags[i] if complete and i < len(extra_tags) else rng.choice(extra_tags)
+            value = rng.choice(PLACES) if name == "place" else ATTRIBUTE_TEXTS[name]
+            attributes = {"placeName": value, "wikiData": "Q7"} if name in ["place", "organization"] else {}
+            tags.append(tag(name, len(text), len(value), **attributes))
+            if name == "medical":
+                tags.append(tag("medical_label", len(text), 4))
+            text += value + ", "
+
+        # Roles end the line so a role can continue onto the next one
+        if i < n_lines - 1 and (rng.random() < config["continued_rate"] * 2 or (complete and i == 0)):
+            tags.append(tag("role", len(text), len("Executive"), continued="true", title="Sub- Assistant"))
+            text += "Executive"
+            role_tail = True
+        else:
+            tags.append(tag("role", len(text), len(ROLE), title="Sub- Assistant", seniority="1st Class"))
+            text += ROLE
+
+        add_line(region, i, text, tags)
+    finish_region(region)
+
+
+def narrative(page: ET.Element, rng: random.Random, idx: int, config: dict, complete: bool = False):
+    """
+    Narrative lines with places, and maps/places/medical tags continued across lines
+    A complete narrative continues a map and a place and tags a place on every line
+    """
+    region = add_region(page, idx)
+    n_lines = 5 if complete else rng.randint(*config["lines_per_region"])
+    carried = None
+    for i in range(n_lines):
+        text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 14)))
+        tags = []
+        if carried:
+            tail = "of the Atlas"
+            text = f"{tail} {text}"
+            tags.append(tag(carried, 0, len(tail), continued="true"))
+            carried = None
+
+        if complete or rng.random() < config["tag_density"]:
+            place = rng.choice(PLACES)
+            text += " "
+            tags.append(tag("place", len(text), len(place), placeName=place, country="India"))
+            text += place
+
+        if complete and i in [0, 2]:
+            carried = ["map", "place"][i // 2]
+        elif i < n_lines - 1 and rng.random() < config["continued_rate"]:
+            carried = rng.choice(["map", "map", "place", "medical"])
+        if carried:
+            sheet = "Sheet No. 5"
+            text += " "
+            attributes = {"title": sheet, "scale": "1 inch", "placeName": "Agra"} if carried == "map" else {}
+            tags.append(tag(carried, len(text), len(sheet), continued="true", **attributes))
+            text += sheet
+
+        add_line(region, i, text, tags)
+    finish_region(region)
+
+
+def generate_report(path: str, seed: int = 0, **config) -> dict:
+    """
+    Write a synthetic combined report in the layout combine_xmls produces, PcGts holding a Metadata and Page per page
+
+    Args:
+        path (str): Where to write the report, e.g. <dir>/1865_combined_pages.xml
+        seed (int, optional): Random seed, the same seed and config always give the same report. Defaults to 0.
+        **config: Overrides for DEFAULT_CONFIG
+
+    Returns:
+        dict: Counts of the pages, regions and lines written
+    """
+    config = DEFAULT_CONFIG | config
+    rng = random.Random(seed)
+    root = ET.Element(q("PcGts"))
+
+    idx = 0
+    headings = 0
+    for page_number in range(config["pages"]):
+        ET.SubElement(ET.SubElement(root, q("Metadata")), q("Creator")).text = "synthetic"
+        page = ET.SubElement(root, q("Page"), imageFilename=f"{page_number:04d}.jpg")
+        if page_number == 0:
+            # Reports open with a heading, credit and narrative that use every kind of tag
+            heading(page, rng, idx, headings)
+            credit(page, rng, idx + 1, config, complete=True)
+            narrative(page, rng, idx + 2, config, complete=True)
+            idx += 3
+            headings += 1
+
+        for _ in range(rng.randint(*config["regions_per_page"])):
+            if rng.random() < config["heading_rate"]:
+                heading(page, rng, idx, headings)
+                credit(page, rng, idx + 1, config)
+                idx += 2
+                headings += 1
+            else:
+                narrative(page, rng, idx, config)
+                idx += 1
+
+    ET.indent(root, space="    ")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    ET.ElementTree(root).write(path, encoding="UTF-8")
+    return {
+        "pages": config["pages"],
+        "regions": idx,
+        "lines": sum(1 for _ in root.iter(q("TextLine"))),
+    }
+
+
+def generate_corpus(output_dir: str, report_dates: list[int], seed: int = 0, **config) -> list[str]:
+    """
+    Write one synthetic report per year, named like the combined reports in data/interim
+
+    Args:
+        output_dir (str): Directory to write the reports to
+        report_dates (list[int]): Years to write reports for
+        seed (int, optional): Base random seed, each year gets its own. Defaults to 0.
+        **config: Overrides for DEFAULT_CONFIG
+
+    Returns:
+        list[str]: Paths to the reports
+    """
+    paths = []
+    for i, report_date in enumerate(report_dates):
+        path = os.path.join(output_dir, f"{report_date}_combined_pages.xml")
+        generate_report(path, seed=seed + i, **config)
+        paths.append(path)
+    return paths
@@ -0,0 +1,18 @@
+import argparse
+
+import pandas as pd
+
+from coleridge.network.cooccurrence import write_network
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the person co-occurrence network from the combined entities")
+    parser.add_argument("--entities", default="data/processed/combined_entities.csv", help="Combined entities CSV")
+    parser.add_argument("--output-dir", default="data/processed", help="Directory to write the edge list and GraphML to")
+    parser.add_argument("--person-column", default="person", help="Column identifying a person, e.g. unique_id")
+    parser.add_argument("--node-columns", nargs="*", default=["ethnicity", "dateOfDeath"], help="Columns copied onto each person node")
+    args = parser.parse_args()
+
+    entities = pd.read_csv(args.entities, index_col=0, encoding="utf8")
+    graph = write_network(entities, args.output_dir, person_column=args.person_column, node_columns=args.node_columns)
+    print(f"{graph.number_of_nodes()} persons, {graph.number_of_edges()} edges")
@@ -0,0 +1,181 @@
+import argparse
+from datetime import datetime
+import glob
+import logging
+import os
+
+# Only the standard library is imported here, each command imports what it needs when it runs
+# so quick commands like tag-stats don't pay for pandas or pyarrow
+
+# Log file name of each command that logs, as the extract scripts named them
+LOG_NAMES = {"entities": "entities", "places": "places", "maps": "maps", "all": "pipeline"}
+
+
+def combined_report_paths(interim_dir: str) -> list[str]:
+    return glob.glob(os.path.join(interim_dir, "*combined_pages.xml"))
+
+
+def configure_logging(log_dir: str, name: str):
+    logging.basicConfig(
+        filename=os.path.join(log_dir, f"{datetime.now().strftime('%y%m%d_%H%M%S')}_{name}.log"),
+        format='%(asctime)s %(name)-12s %(levelname)-8s %(message)s',
+        datefmt='%m-%d %H:%M',
+        encoding='utf-8',
+        level=logging.INFO)
+
+
+def build_stages(args: argparse.Namespace) -> list:
+    """
+    The extractor stages a command runs
+
+    Args:
+        args (argparse.Namespace): Parsed arguments of an extract command
+
+    Returns:
+        list: Stages to pass to run_pipeline
+    """
+    from coleridge.data.stages import EntityStage, EntityTableStage, MapStage, OverlapStatsStage, PlaceStage, TagStatsStage
+
+    entity_stage = EntityTableStage if getattr(args, "normalized", False) else EntityStage
+    match args.command:
+        case "entities":
+            return [entity_stage(output_format=args.format)]
+        case "places":
+            return [PlaceStage(output_format=args.format)]
+        case "maps":
+            return [MapStage(output_format=args.format)]
+        case "all":
+            return [
+                entity_stage(output_format=args.format),
+                PlaceStage(output_format=args.format),
+                MapStage(output_format=args.format),
+                TagStatsStage(),
+                OverlapStatsStage(),
+            ]
+    raise ValueError(f"Unknown extract command {args.command}")
+
+
+def run_combine(args: argparse.Namespace):
+    from coleridge.data.combine import combine_reports
+    from coleridge.data.manifest import Manifest
+
+    manifest = Manifest(args.manifest) if args.incremental else None
+    combined = combine_reports(
+        args.report_dates,
+        raw_dir=args.raw_dir,
+        interim_dir=args.interim_dir,
+        pretty=not args.no_indent,
+        workers=args.workers,
+        manifest=manifest,
+        read_ahead=args.read_ahead,
+    )
+    if manifest is not None:
+        print(f"Combined {len(combined)} of {len(args.report_dates)} reports")
+
+
+def run_extract(args: argparse.Namespace):
+    from coleridge.data.manifest import Manifest
+    from coleridge.data.pipeline import run_pipeline
+
+    if args.command in LOG_NAMES:
+        configure_logging(args.log_dir, LOG_NAMES[args.command])
+
+    run_pipeline(
+        combined_report_paths(args.interim_dir),
+        stages=build_stages(args),
+        output_dir=args.output_dir,
+        workers=args.workers,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        metrics_dir=args.metrics,
+        manifest=Manifest(args.manifest) if args.incremental else None,
+        read_ahead=args.read_ahead,
+    )
+
+
+def run_overlaps(args: argparse.Namespace):
+    from coleridge.data.overlaps import analyze_reports
+    from coleridge.data.stages import OverlapStatsStage
+
+    # Overlaps only need each line's tag spans, so the reports are read without parsing them for the pipeline
+    report_stats = analyze_reports(combined_report_paths(args.interim_dir), workers=args.workers, read_ahead=args.read_ahead)
+    OverlapStatsStage().write(report_stats, args.output_dir)
+
+
+def run_tag_stats(args: argparse.Namespace):
+    from coleridge.data.stages import TagStatsStage
+    from coleridge.data.tag_stats import count_reports
+
+    # Tag counts only need each line's tag names and attribute keys, so the reports are read without parsing them for the pipeline
+    report_stats = count_reports(combined_report_paths(args.interim_dir), workers=args.workers, read_ahead=args.read_ahead)
+    TagStatsStage(clean=args.clean, check_tags=not args.no_tags, check_attributes=not args.no_attributes).write(report_stats, args.output_dir)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="coleridge", description="Combine and extract the Survey of India reports")
+    commands = parser.add_subparsers(dest="command", required=True, metavar="command")
+
+    combine = commands.add_parser("combine", help="Combine the exported pages of each report into one XML")
+    combine.add_argument("report_dates", nargs="*", type=int, default=[1871, 1872], help="Report years to combine")
+    combine.add_argument("--raw-dir", default="data/raw", help="Directory holding the <year> Exported Files exports")
+    combine.add_argument("--interim-dir", default="data/interim", help="Directory to write the combined reports to")
+    combine.add_argument("--workers", type=int, default=1, help="Number of years to combine in parallel")
+    combine.add_argument("--no-indent", action="store_true", help="Write the combined XML without pretty printing")
+    combine.add_argument("--incremental", action="store_true", help="Only combine years whose pages changed since the last incremental run")
+    combine.add_argument("--manifest", default="data/manifest.json", help="Manifest of the inputs of each year, used with --incremental")
+    combine.add_argument("--read-ahead", type=int, default=2, help="Pages read on background threads ahead of the one being combined, 0 to read each when needed")
+    combine.set_defaults(run=run_combine)
+
+    extract_help = {
+        "entities": "Extract person entities from the combined reports",
+        "places": "Extract places from the combined reports",
+        "maps": "Extract maps from the combined reports",
+        "all": "Run every extractor over the combined reports in one pass",
+    }
+    for command, help_text in extract_help.items():
+        extract = commands.add_parser(command, help=help_text, description=help_text)
+        extract.add_argument("--interim-dir", default="data/interim", help="Directory holding the combined reports")
+        extract.add_argument("--output-dir", default="data/processed", help="Directory to write outputs to")
+        extract.add_argument("--workers", type=int, default=1, help="Number of processes to extract reports with")
+        extract.add_argument("--cache-dir", default="data/cache", help="Directory to cache parsed reports in")
+        extract.add_argument("--no-cache", action="store_true", help="Parse every report, ignoring the cache")
+        extract.add_argument("--metrics", metavar="DIR", help="Write stage timings and counters as JSON to this directory")
+        extract.add_argument("--incremental", action="store_true", help="Only extract reports that changed since the last incremental run")
+        extract.add_argument("--manifest", default="data/manifest.json", help="Manifest of each report's extracted results, used with --incremental")
+        extract.add_argument("--read-ahead", type=int, default=2, help="Reports read on background threads ahead of the one being parsed, 0 to read each when needed")
+        if command in ["entities", "places", "maps", "all"]:
+            extract.add_argument("--format", choices=["csv", "parquet"], default="csv", help="Output file format")
+        if command in ["entities", "all"]:
+            extract.add_argument("--normalized", action="store_true", help="Write entities.csv keyed to a headings.csv table instead of combined_entities.csv")
+        if command in LOG_NAMES:
+            extract.add_argument("--log-dir", default="logs", help="Directory to write the run's log to")
+        extract.set_defaults(run=run_extract)
+
+    overlaps = commands.add_parser("overlaps", help="Count the groups and pairs of tags that overlap on the same line")
+    overlaps.add_argument("--interim-dir", default="data/interim", help="Directory holding the combined reports")
+    overlaps.add_argument("--output-dir", default="data/processed", help="Directory to write outputs to")
+    overlaps.add_argument("--workers", type=int, default=1, help="Number of reports to read in parallel")
+    overlaps.add_argument("--read-ahead", type=int, default=2, help="Reports read on background threads ahead of the one being analyzed, 0 to read each when needed")
+    overlaps.set_defaults(run=run_overlaps)
+
+    tag_stats = commands.add_parser("tag-stats", help="Count tags and their attributes across the combined reports")
+    tag_stats.add_argument("--interim-dir", default="data/interim", help="Directory holding the combined reports")
+    tag_stats.add_argument("--output-dir", default="data/processed", help="Directory to write outputs to")
+    tag_stats.add_argument("--workers", type=int, default=1, help="Number of reports to read in parallel")
+    tag_stats.add_argument("--read-ahead", type=int, default=2, help="Reports read on background threads ahead of the one being counted, 0 to read each when needed")
+    tag_stats.add_argument("--clean", action="store_true", help="Leave readingOrder and offset/length/continued out of the counts")
+    tag_stats.add_argument("--no-tags", action="store_true", help="Skip counting tags")
+    tag_stats.add_argument("--no-attributes", action="store_true", help="Skip counting tag attributes")
+    tag_stats.set_defaults(run=run_tag_stats)
+
+    return parser
+
+
+def main(argv: list[str] = None):
+    """
+    Run a coleridge command, e.g. python -m coleridge entities --workers 4
+
+    Args:
+        argv (list[str], optional): Command line arguments. Defaults to None, sys.argv.
+    """
+    args = build_parser().parse_args(argv)
+    args.run(args)
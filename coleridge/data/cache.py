@@ -0,0 +1,84 @@
+import hashlib
+import logging
+import os
+import pickle
+
+from coleridge import metrics
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever parse_report, parse_xml or parse_custom change what a parsed report contains.
+# The SectionIndex isn't cached, it's rebuilt on every load, so changes to coleridge.data.sections don't need a bump
+PARSER_VERSION = 4
+
+
+def file_hash(path: str, chunk_size: int = 2 ** 20) -> str:
+    """
+    sha256 of a file's contents
+
+    Args:
+        path (str): Path to the file
+        chunk_size (int, optional): Bytes read at a time. Defaults to 2**20.
+
+    Returns:
+        str: Hex digest of the file
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_path(path: str, cache_dir: str, data: bytes = None) -> str:
+    """
+    Where the parsed version of a report is cached, keyed on the report's contents and the parser version
+
+    Args:
+        path (str): Path to a combined report
+        cache_dir (str): Directory holding cached reports
+        data (bytes, optional): The report's contents if they've already been read, hashed rather than reading the file again. Defaults to None.
+
+    Returns:
+        str: Path of the cache file
+    """
+    digest = file_hash(path) if data is None else hashlib.sha256(data).hexdigest()
+    return os.path.join(cache_dir, f"{digest}_v{PARSER_VERSION}.pickle")
+
+
+def load_cached_report(path: str, cache_dir: str, load, data: bytes = None) -> dict:
+    """
+    Load a parsed report from the cache, parsing and caching it with load(path) if it isn't there
+
+    Args:
+        path (str): Path to a combined report
+        cache_dir (str): Directory holding cached reports
+        load (Callable[[str], dict]): Parses a report, e.g. coleridge.data.pipeline.parse_report
+        data (bytes, optional): The report's contents if they've already been read, see cache_path. Defaults to None.
+
+    Returns:
+        dict: The parsed report
+    """
+    from coleridge.data.pipeline import report_date_from_path  # pipeline imports the cache
+
+    cached = cache_path(path, cache_dir, data=data)
+    if os.path.exists(cached):
+        try:
+            with metrics.timer("cache_load"), open(cached, "rb") as f:
+                report = pickle.load(f)
+            # Reports with the same contents share a cache file, so the path and year come from this report's path
+            report["path"] = path
+            report["report_date"] = report_date_from_path(path)
+            metrics.count("cache_hits")
+            return report
+        except (OSError, EOFError, pickle.UnpicklingError) as e:
+            logger.warning(f"Re-parsing {path}, could not read cache {cached}: {e}")
+
+    metrics.count("cache_misses")
+    report = load(path)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{cached}.{os.getpid()}.tmp"  # Workers may be writing the same report
+    with open(tmp_path, "wb") as f:
+        pickle.dump(report, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, cached)
+    return report
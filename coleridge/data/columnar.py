@@ -0,0 +1,77 @@
+import os
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Repeated strings are dictionary encoded, everything else not listed here is a plain string
+DICTIONARY_STRING = pa.dictionary(pa.int32(), pa.string())
+
+DICTIONARY_COLUMNS = [
+    "heading_survey_area", "heading_survey_party", "season", "structure",
+    "heading_places", "heading_place_names", "heading_place_wikidata_ids", "heading_place_countries",
+]
+
+COLUMN_TYPES = {
+    "report_date": pa.int32(),
+    "frequency": pa.int64(),
+    "leader": pa.bool_(),
+} | {column: DICTIONARY_STRING for column in DICTIONARY_COLUMNS}
+
+
+def schema_for(columns: list[str]) -> pa.Schema:
+    """
+    Arrow schema for an ordered list of output columns, repeated column names are only included once
+
+    Args:
+        columns (list[str]): Output columns, e.g. coleridge.data.stages.ENTITY_COLUMNS
+
+    Returns:
+        pa.Schema: Typed schema for the columns
+    """
+    return pa.schema([(column, COLUMN_TYPES.get(column, pa.string())) for column in dict.fromkeys(columns)])
+
+
+class ColumnBuilder:
+    """
+    Collects rows straight into one list per column of a schema, missing values become nulls
+    """
+    def __init__(self, schema: pa.Schema):
+        self.schema = schema
+        self.columns = {name: [] for name in schema.names}
+
+    def append(self, row: dict):
+        for name, values in self.columns.items():
+            values.append(row.get(name))
+
+    def extend(self, rows: list[dict]):
+        for row in rows:
+            self.append(row)
+
+    def __len__(self) -> int:
+        return len(self.columns[self.schema.names[0]]) if self.schema.names else 0
+
+    def to_table(self) -> pa.Table:
+        return pa.Table.from_arrays(
+            [pa.array(self.columns[field.name], type=field.type) for field in self.schema],
+            schema=self.schema,
+        )
+
+
+def write_parquet(rows: list[dict], columns: list[str], path: str) -> pa.Table:
+    """
+    Write rows to parquet with the typed schema for their columns
+
+    Args:
+        rows (list[dict]): Output rows, keys not in columns are dropped
+        columns (list[str]): Ordered output columns
+        path (str): Parquet file to write
+
+    Returns:
+        pa.Table: The table that was written
+    """
+    builder = ColumnBuilder(schema_for(columns))
+    builder.extend(rows)
+    table = builder.to_table()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    pq.write_table(table, path)
+    return table
@@ -0,0 +1,144 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import glob
+import io
+import os
+import re
+import xml.etree.ElementTree as ET
+
+from coleridge.data.manifest import Manifest
+from coleridge.data.prefetch import READ_AHEAD, prefetch
+
+
+def ordered_page_paths(report_date: int, raw_dir: str = "data/raw") -> list[str]:
+    """
+    Find the exported PAGE XMLs of a report, in page order, leaving out Table pages
+
+    Args:
+        report_date (int): The report year
+        raw_dir (str, optional): Directory holding the "<year> Exported Files" exports. Defaults to "data/raw".
+
+    Returns:
+        list[str]: Paths to the report's pages ordered by page number
+    """
+    pages = glob.glob(os.path.join(raw_dir, f"{report_date} Exported Files", "XML", "*", "page", "00*.xml"))
+    pages = [p for p in pages if "Table" not in p]
+    return sorted(pages, key=lambda x: int(os.path.basename(x).split("_")[0]))
+
+
+def combine_pages(page_paths: list[str], output_path: str, pretty: bool = True, space: str = "    ", read_ahead: int = READ_AHEAD):
+    """
+    Write the pages of a report as one document, parsing and writing a single page at a time
+    The first page's root holds the children of every page in order, the same structure as appending
+    every page's children to the first root, so region[1:-1] and line[2][0] index the same elements
+
+    Args:
+        page_paths (list[str]): Paths to PAGE XMLs in page order
+        output_path (str): Path to write the combined XML to
+        pretty (bool, optional): Indent the output the same way as ET.indent over the combined tree. Defaults to True.
+        space (str, optional): Indent for each level when pretty printing. Defaults to "    ".
+        read_ahead (int, optional): Pages read on background threads ahead of the one being written, see coleridge.data.prefetch.
+            Defaults to READ_AHEAD.
+    """
+    if not page_paths:
+        raise ValueError(f"No pages to combine into {output_path}")
+
+    root_declarations = None
+    with open(output_path, "w", encoding="utf-8") as f:
+        for i, (page_path, page) in enumerate(prefetch(page_paths, read_ahead=read_ahead)):
+            root = ET.parse(io.BytesIO(page)).getroot()
+            if not len(root):
+                raise ValueError(f"{page_path} has no Metadata or Page")
+
+            if pretty:
+                ET.indent(root, space=space)
+                if i > 0:
+                    root.text = None  # The previous page's last child is already followed by an indent
+                if i < len(page_paths) - 1:
+                    root[-1].tail = "\n" + space
+
+            page_xml = ET.tostring(root, encoding="unicode")
+            start_tag_end = page_xml.index(">") + 1
+            end_tag_start = page_xml.rindex("</")
+
+            declarations = re.findall(r'xmlns(?::\w+)?="[^"]*"', page_xml[:start_tag_end])
+            if root_declarations is None:
+                root_declarations = declarations
+                end_tag = page_xml[end_tag_start:]
+                f.write(page_xml[:start_tag_end])
+            elif declarations != root_declarations:
+                raise ValueError(f"{page_path} uses different namespaces to {page_paths[0]}")
+
+            f.write(page_xml[start_tag_end:end_tag_start])
+
+        f.write(end_tag)
+
+
+def combined_path(report_date: int, interim_dir: str = "data/interim") -> str:
+    return os.path.join(interim_dir, f"{report_date}_combined_pages.xml")
+
+
+def combine_report(report_date: int, raw_dir: str = "data/raw", interim_dir: str = "data/interim", pretty: bool = True, read_ahead: int = READ_AHEAD) -> str:
+    """
+    Combine the exported pages of a report into <interim_dir>/<report_date>_combined_pages.xml
+
+    Args:
+        report_date (int): The report year
+        raw_dir (str, optional): Directory holding the "<year> Exported Files" exports. Defaults to "data/raw".
+        interim_dir (str, optional): Directory to write the combined report to. Defaults to "data/interim".
+        pretty (bool, optional): Indent the combined report. Defaults to True.
+        read_ahead (int, optional): Pages read ahead of the one being written, see combine_pages. Defaults to READ_AHEAD.
+
+    Returns:
+        str: Path to the combined report
+    """
+    output_path = combined_path(report_date, interim_dir)
+    combine_pages(ordered_page_paths(report_date, raw_dir=raw_dir), output_path, pretty=pretty, read_ahead=read_ahead)
+    return output_path
+
+
+def combine_reports(
+        report_dates: list[int],
+        raw_dir: str = "data/raw",
+        interim_dir: str = "data/interim",
+        pretty: bool = True,
+        workers: int = 1,
+        manifest: Manifest = None,
+        read_ahead: int = READ_AHEAD
+) -> list[int]:
+    """
+    Combine the pages of each report, with a manifest only the reports whose pages changed are combined again
+
+    Args:
+        report_dates (list[int]): Report years to combine
+        raw_dir (str, optional): Directory holding the "<year> Exported Files" exports. Defaults to "data/raw".
+        interim_dir (str, optional): Directory to write the combined reports to. Defaults to "data/interim".
+        pretty (bool, optional): Indent the combined reports. Defaults to True.
+        workers (int, optional): Number of reports to combine in parallel. Defaults to 1.
+        manifest (Manifest, optional): Record of the pages each report was last combined from, see coleridge.data.manifest.
+            Defaults to None, combine every report.
+        read_ahead (int, optional): Pages read ahead of the one being written, see combine_pages. Defaults to READ_AHEAD.
+
+    Returns:
+        list[int]: The report years that were combined
+    """
+    page_paths = {report_date: ordered_page_paths(report_date, raw_dir=raw_dir) for report_date in report_dates}
+    if manifest is not None:
+        report_dates = [
+            report_date for report_date in report_dates
+            if not manifest.combined_current(report_date, page_paths[report_date], combined_path(report_date, interim_dir), pretty=pretty)
+        ]
+
+    combine = partial(combine_report, raw_dir=raw_dir, interim_dir=interim_dir, pretty=pretty, read_ahead=read_ahead)
+    if workers > 1 and len(report_dates) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(report_dates))) as executor:
+            list(executor.map(combine, report_dates))
+    else:
+        for report_date in report_dates:
+            combine(report_date)
+
+    if manifest is not None:
+        for report_date in report_dates:
+            manifest.record_combined(report_date, page_paths[report_date], combined_path(report_date, interim_dir), pretty=pretty)
+        manifest.save()
+    return report_dates
@@ -0,0 +1,48 @@
+import os
+
+import pandas as pd
+
+from coleridge.data.stages import ENTITY_COLUMNS
+
+
+def join_headings(entities: pd.DataFrame, headings: pd.DataFrame) -> pd.DataFrame:
+    """
+    Join entities to their headings, giving the layout of combined_entities.csv
+    Heading fields take precedence over any entity column of the same name, as they do when extracted onto each entity
+
+    Args:
+        entities (pd.DataFrame): Entities with a heading_id, e.g. entities.csv from EntityTableStage
+        headings (pd.DataFrame): One row per heading_id, e.g. headings.csv
+
+    Returns:
+        pd.DataFrame: Entities with their heading fields, in ENTITY_COLUMNS order followed by any other columns, keeping the entities' index
+    """
+    heading_fields = headings.columns.drop("heading_id")
+    wide = entities.drop(columns=entities.columns.intersection(heading_fields)).merge(
+        headings, on="heading_id", how="left", validate="many_to_one"
+    )
+    wide.index = entities.index
+
+    columns = list(dict.fromkeys(ENTITY_COLUMNS))
+    extra_columns = [column for column in wide.columns if column not in columns and column != "heading_id"]
+    return wide.reindex(columns=columns + extra_columns)
+
+
+def read_entity_tables(output_dir: str = "data/processed", output_format: str = "csv") -> pd.DataFrame:
+    """
+    Read the headings and entities tables written by EntityTableStage and join them, see join_headings
+
+    Args:
+        output_dir (str, optional): Directory the tables were written to. Defaults to "data/processed".
+        output_format (str, optional): "csv" or "parquet". Defaults to "csv".
+
+    Returns:
+        pd.DataFrame: Entities in the combined_entities.csv layout
+    """
+    if output_format == "parquet":
+        headings = pd.read_parquet(os.path.join(output_dir, "headings.parquet"))
+        entities = pd.read_parquet(os.path.join(output_dir, "entities.parquet"))
+    else:
+        headings = pd.read_csv(os.path.join(output_dir, "headings.csv"), dtype={"heading_id": str})
+        entities = pd.read_csv(os.path.join(output_dir, "entities.csv"), dtype={"heading_id": str})
+    return join_headings(entities, headings)
@@ -0,0 +1,82 @@
+from collections import deque
+
+
+def build_automaton(needles: list[str]) -> tuple[list[dict[str, int]], list[int], list[list[int]]]:
+    """
+    Build an Aho-Corasick automaton over a list of needles
+
+    Args:
+        needles (list[str]): Non-empty strings to search for
+
+    Returns:
+        tuple[list[dict[str, int]], list[int], list[list[int]]]: The goto transitions, failure links,
+        and the needle indices matched on reaching each state
+    """
+    goto = [{}]
+    outputs = [[]]
+    for n, needle in enumerate(needles):
+        state = 0
+        for c in needle:
+            if c not in goto[state]:
+                goto.append({})
+                outputs.append([])
+                goto[state][c] = len(goto) - 1
+            state = goto[state][c]
+        outputs[state].append(n)
+
+    fail = [0] * len(goto)
+    queue = deque(goto[0].values())
+    while queue:
+        state = queue.popleft()
+        for c, child in goto[state].items():
+            queue.append(child)
+            f = fail[state]
+            while f and c not in goto[f]:
+                f = fail[f]
+            fail[child] = goto[f].get(c, 0)
+            outputs[child] = outputs[child] + outputs[fail[child]]
+
+    return goto, fail, outputs
+
+
+def count_occurrences(text: str, needles: list[str]) -> dict[str, int]:
+    """
+    Count every needle in a text with a single pass, the counts are the same as text.count(needle),
+    i.e. non-overlapping matches of each needle scanning left to right
+
+    Args:
+        text (str): Text to search, e.g. a report's full text
+        needles (list[str]): Strings to count, duplicates are counted once
+
+    Returns:
+        dict[str, int]: Count of each needle
+    """
+    counts = {needle: 0 for needle in needles}
+    if "" in counts:
+        counts[""] = len(text) + 1
+    unique_needles = [needle for needle in counts if needle]
+    if not unique_needles:
+        return counts
+
+    goto, fail, outputs = build_automaton(unique_needles)
+    lengths = [len(needle) for needle in unique_needles]
+    found = [0] * len(unique_needles)
+    next_start = [0] * len(unique_needles)  # Matches starting before this would overlap the last one counted
+
+    root = goto[0]
+    state = 0
+    for i, c in enumerate(text):
+        while state and c not in goto[state]:
+            state = fail[state]
+        state = goto[state].get(c, 0) if state else root.get(c, 0)
+        if not state:
+            continue
+
+        for n in outputs[state]:
+            start = i - lengths[n] + 1
+            if start >= next_start[n]:
+                found[n] += 1
+                next_start[n] = i + 1
+
+    counts.update(zip(unique_needles, found))
+    return counts
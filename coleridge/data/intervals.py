@@ -0,0 +1,47 @@
+import heapq
+
+
+def overlapping_pairs(spans: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """
+    Find every pair of overlapping spans with a sort and sweep
+    Spans are closed intervals, so spans that touch at one character overlap
+
+    Args:
+        spans (list[tuple[int, int]]): (start, end) spans
+
+    Returns:
+        list[tuple[int, int]]: (i, j) index pairs of overlapping spans, with i < j, sorted
+    """
+    order = sorted(range(len(spans)), key=lambda i: spans[i][0])
+    active = []  # heap of (end, idx) for spans that could still overlap the next start
+    pairs = []
+    for i in order:
+        start, end = spans[i]
+        while active and active[0][0] < start:
+            heapq.heappop(active)
+
+        pairs.extend((j, i) if j < i else (i, j) for _, j in active)
+        heapq.heappush(active, (end, i))
+
+    return sorted(pairs)
+
+
+def group_overlaps(spans: list[tuple[str, int, int]]) -> dict[tuple[int, int], list[str]]:
+    """
+    Group tags by overlapping spans
+    Each span collects itself and every later span it overlaps, spans with identical extents share a group
+
+    Args:
+        spans (list[tuple[str, int, int]]): (tag, start, end) spans in the order the tags appear on the line
+
+    Returns:
+        dict[tuple[int, int], list[str]]: Groups of overlapping tags, keyed by the (start, end) of the span that started the group
+    """
+    grouped = {(start, end): {} for _, start, end in spans}
+    for i, j in overlapping_pairs([(start, end) for _, start, end in spans]):
+        tag_i, start, end = spans[i]
+        group = grouped[(start, end)]
+        group[tag_i] = None
+        group[spans[j][0]] = None
+
+    return {k: list(v) for k, v in grouped.items() if v}
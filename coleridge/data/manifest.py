@@ -0,0 +1,163 @@
+import json
+import logging
+import os
+import pickle
+
+from coleridge.data.cache import PARSER_VERSION, file_hash
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the layout of the manifest changes, older manifests are discarded
+MANIFEST_VERSION = 1
+
+
+class Manifest:
+    """
+    Record of the raw pages and combined report behind each year, and of the stage results extracted from each combined report
+    Lets combine_xmls and the extractors redo only the years whose inputs changed
+
+    Files are identified by their sha256, a file whose size and mtime are unchanged since it was last hashed isn't hashed again.
+    Stage results are kept per report in results_dir/<report_date>/<stage name>.pickle, so a rerun only
+    extracts changed reports and merges them with the kept results of the rest
+    """
+    def __init__(self, path: str = "data/manifest.json", results_dir: str = "data/interim/extracted"):
+        self.path = path
+        self.results_dir = results_dir
+        self.files = {}
+        self.reports = {}
+
+        if os.path.exists(path):
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Rebuilding everything, could not read manifest {path}: {e}")
+            else:
+                if data.get("version") == MANIFEST_VERSION:
+                    self.files = data["files"]
+                    self.reports = data["reports"]
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"version": MANIFEST_VERSION, "files": self.files, "reports": self.reports}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def file_hash(self, path: str) -> str|None:
+        """
+        sha256 of a file, reusing the recorded hash if the file's size and mtime haven't changed
+
+        Args:
+            path (str): Path to the file
+
+        Returns:
+            str|None: Hex digest of the file, None if it doesn't exist
+        """
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            self.files.pop(path, None)
+            return None
+
+        record = self.files.get(path)
+        if record is None or record["size"] != stat.st_size or record["mtime"] != stat.st_mtime_ns:
+            record = {"hash": file_hash(path), "size": stat.st_size, "mtime": stat.st_mtime_ns}
+            self.files[path] = record
+        return record["hash"]
+
+    def _report(self, report_date: int) -> dict:
+        return self.reports.setdefault(str(report_date), {})
+
+    def _combined_inputs(self, page_paths: list[str], pretty: bool) -> dict:
+        return {"pages": [[path, self.file_hash(path)] for path in page_paths], "pretty": pretty}
+
+    def combined_current(self, report_date: int, page_paths: list[str], output_path: str, pretty: bool = True) -> bool:
+        """
+        Whether a combined report was written from the same pages, in the same order and style, and is unchanged since
+
+        Args:
+            report_date (int): The report year
+            page_paths (list[str]): The report's pages, see coleridge.data.combine.ordered_page_paths
+            output_path (str): Path to the combined report
+            pretty (bool, optional): Whether the report would be indented. Defaults to True.
+
+        Returns:
+            bool: True if the combined report can be kept
+        """
+        combined = self._report(report_date).get("combined")
+        return (
+            combined is not None
+            and combined["inputs"] == self._combined_inputs(page_paths, pretty)
+            and combined["output"] == [output_path, self.file_hash(output_path)]
+        )
+
+    def record_combined(self, report_date: int, page_paths: list[str], output_path: str, pretty: bool = True):
+        """
+        Record the pages a combined report was just written from
+        """
+        self._report(report_date)["combined"] = {
+            "inputs": self._combined_inputs(page_paths, pretty),
+            "output": [output_path, self.file_hash(output_path)],
+        }
+
+    @staticmethod
+    def _stage_key(stage) -> str:
+        # A stage that changes the results it returns bumps its version, so results kept from the old code aren't reused
+        if getattr(stage, "version", None) is None:
+            raise ValueError(f"Stage {stage.name} has no version, the manifest can't tell when its kept results are stale")
+        return f"{stage.name}_v{stage.version}"
+
+    def _results_path(self, report_date: int, stage) -> str:
+        return os.path.join(self.results_dir, str(report_date), f"{stage.name}.pickle")
+
+    def load_results(self, report_path: str, report_date: int, stages: list) -> list|None:
+        """
+        Stage results kept from an earlier run over the same combined report with the same parser
+
+        Args:
+            report_path (str): Path to a combined report
+            report_date (int): The report year
+            stages (list): Extractor stages, see coleridge.data.stages
+
+        Returns:
+            list|None: Each stage's results in stage order, None if any stage has to extract the report again
+        """
+        extracted = self._report(report_date).get("extracted")
+        if extracted is None or extracted["input"] != [report_path, self.file_hash(report_path)] or extracted["parser_version"] != PARSER_VERSION:
+            return None
+
+        results = []
+        for stage in stages:
+            if self._stage_key(stage) not in extracted["stages"]:
+                return None
+            try:
+                with open(self._results_path(report_date, stage), "rb") as f:
+                    results.append(pickle.load(f))
+            except (OSError, EOFError, pickle.UnpicklingError) as e:
+                logger.warning(f"Re-extracting {report_path}, could not read {stage.name} results: {e}")
+                return None
+        return results
+
+    def save_results(self, report_path: str, report_date: int, stages: list, results: list):
+        """
+        Keep each stage's results for a report and record the combined report they were extracted from
+
+        Args:
+            report_path (str): Path to a combined report
+            report_date (int): The report year
+            stages (list): Extractor stages, see coleridge.data.stages
+            results (list): Each stage's results in stage order
+        """
+        stage_keys = {self._stage_key(stage) for stage in stages}
+        os.makedirs(os.path.join(self.results_dir, str(report_date)), exist_ok=True)
+        for stage, stage_results in zip(stages, results):
+            with open(self._results_path(report_date, stage), "wb") as f:
+                pickle.dump(stage_results, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        extracted = self._report(report_date).get("extracted")
+        input_ = [report_path, self.file_hash(report_path)]
+        if extracted is None or extracted["input"] != input_ or extracted["parser_version"] != PARSER_VERSION:
+            extracted = {"input": input_, "parser_version": PARSER_VERSION, "stages": []}
+        extracted["stages"] = sorted(set(extracted["stages"]) | stage_keys)
+        self._report(report_date)["extracted"] = extracted
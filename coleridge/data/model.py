@@ -0,0 +1,114 @@
+from xml.etree.ElementTree import Element
+
+from coleridge.data.parse_custom import ParsedCustom, parse_custom_string
+
+
+def local_name(tag: str) -> str:
+    """
+    Strip the namespace from an element tag, e.g. {http://...}TextLine becomes TextLine
+
+    Args:
+        tag (str): A namespaced element tag
+
+    Returns:
+        str: The tag without its namespace
+    """
+    return tag.rsplit("}", 1)[-1]
+
+
+def unicode_text(element: Element) -> str|None:
+    """
+    Text of the TextEquiv/Unicode child of a TextLine or TextRegion, found by tag rather than position
+
+    Args:
+        element (Element): A TextLine or TextRegion element
+
+    Returns:
+        str|None: The Unicode text, None if there is none
+    """
+    for child in element:
+        if local_name(child.tag) == "TextEquiv":
+            for text_equiv in child:
+                if local_name(text_equiv.tag) == "Unicode":
+                    return text_equiv.text
+            return None
+    return None
+
+
+class TextLine:
+    """
+    The parts of a PAGE XML TextLine the extractors use
+    tags is the tokenized custom string, attributes is filled with the parse_attributes output once the region is parsed
+    """
+    __slots__ = ("id", "text", "custom", "tags", "attributes")
+
+    def __init__(self, id: str, text: str|None, custom: str = "", attributes: dict = None):
+        self.id = id
+        self.text = text
+        self.custom = custom
+        self.tags = parse_custom_string(custom)
+        self.attributes = attributes if attributes is not None else {}
+
+    @classmethod
+    def from_element(cls, element: Element) -> "TextLine":
+        return cls(id=element.attrib.get("id"), text=unicode_text(element), custom=element.attrib.get("custom", ""))
+
+    def __repr__(self) -> str:
+        return f"TextLine(id={self.id!r}, text={self.text!r})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TextLine):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    def __getstate__(self) -> tuple:
+        return self.id, self.text, self.custom, self.attributes
+
+    def __setstate__(self, state: tuple):
+        self.id, self.text, self.custom, self.attributes = state
+        self.tags = parse_custom_string(self.custom)
+
+
+class TextRegion:
+    """
+    The parts of a PAGE XML TextRegion the extractors use, indexing a TextRegion indexes its TextLines
+    so it can be passed to parse_attributes/parse_region in place of region[1:-1]
+    """
+    __slots__ = ("idx", "attrib", "custom", "attributes", "lines")
+
+    def __init__(self, idx: int, attrib: dict[str, str], lines: list[TextLine], attributes: dict = None):
+        self.idx = idx
+        self.attrib = attrib
+        self.custom = attrib.get("custom", "")
+        self.lines = lines
+        self.attributes = attributes if attributes is not None else {}
+
+    @classmethod
+    def from_element(cls, element: Element, idx: int = 0) -> "TextRegion":
+        lines = [TextLine.from_element(child) for child in element if local_name(child.tag) == "TextLine"]
+        return cls(idx=idx, attrib=dict(element.attrib), lines=lines)
+
+    @property
+    def id(self) -> str:
+        return self.attrib.get("id")
+
+    @property
+    def tags(self) -> ParsedCustom:
+        return parse_custom_string(self.custom)
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def __getitem__(self, idx: int) -> TextLine:
+        return self.lines[idx]
+
+    def __iter__(self):
+        return iter(self.lines)
+
+    def __repr__(self) -> str:
+        return f"TextRegion(idx={self.idx}, id={self.id!r}, lines={len(self.lines)})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TextRegion):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
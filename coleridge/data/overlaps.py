@@ -0,0 +1,220 @@
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import csv
+import io
+import os
+
+from coleridge.data.intervals import group_overlaps, overlapping_pairs
+from coleridge.data.model import TextRegion
+from coleridge.data.parse_custom import ParsedCustom
+from coleridge.data.parse_xml import de_dupe
+from coleridge.data.pipeline import report_date_from_path
+from coleridge.data.prefetch import READ_AHEAD, prefetch
+from coleridge.data.read_xml import iter_text_regions
+
+# Locations kept for each group and pair, the first found in report order
+SAMPLE_LIMIT = 3
+
+# How two overlapping spans relate, spans are closed so adjacent spans share one character
+RELATIONS = ("identical", "contains", "partial", "adjacent")
+
+
+def unique_tags(tags: list[str]) -> list[str]:
+    """
+    Number tags that appear more than once on a line, e.g. person0 and person1, as parse_attributes does
+
+    Args:
+        tags (list[str]): Tags in the order they appear on the line
+
+    Returns:
+        list[str]: Tags unique within the line
+    """
+    counts = Counter(tags)
+    seen = Counter()
+    unique = []
+    for tag in tags:
+        if counts[tag] > 1:
+            unique.append(f"{tag}{seen[tag]}")
+            seen[tag] += 1
+        else:
+            unique.append(tag)
+    return unique
+
+
+def line_spans(line_tags: ParsedCustom) -> list[tuple[str, int, int]]:
+    """
+    (tag, start, end) spans of the tags on a line, the same spans parse_attributes groups
+    Tags without an offset and length, e.g. readingOrder, have no span
+
+    Args:
+        line_tags (ParsedCustom): Tokenized custom string of a line, see TextLine.tags
+
+    Returns:
+        list[tuple[str, int, int]]: Spans with the tags numbered by unique_tags
+    """
+    spans = []
+    for tag, attrs in zip(unique_tags([tag for tag, _ in line_tags]), (attrs for _, attrs in line_tags)):
+        attrs = dict(attrs)
+        if attrs.get("offset") and attrs.get("length"):
+            start = int(attrs["offset"])
+            spans.append((tag, start, start + int(attrs["length"])))
+    return spans
+
+
+def relation(a: tuple[int, int], b: tuple[int, int]) -> str:
+    """
+    How two overlapping (start, end) spans relate, one of RELATIONS
+    """
+    if a == b:
+        return "identical"
+    if (a[0] <= b[0] and b[1] <= a[1]) or (b[0] <= a[0] and a[1] <= b[1]):
+        return "contains"
+    if min(a[1], b[1]) == max(a[0], b[0]):
+        return "adjacent"
+    return "partial"
+
+
+class OverlapStats:
+    """
+    Counts, and sample locations, of the groups of overlapping tags and of every overlapping pair of tags
+    Groups are the ones parse_attributes sees, de-duplicated and sorted. Pairs are keyed by (relation, tag, tag),
+    the containing tag first for contains and sorted otherwise, samples by pair key or ("group", *group).
+    Stats of separate reports merge into the corpus totals
+    """
+    __slots__ = ("groups", "pairs", "samples")
+
+    def __init__(self, groups: Counter = None, pairs: Counter = None, samples: dict[tuple, list[tuple]] = None):
+        self.groups = groups if groups is not None else Counter()
+        self.pairs = pairs if pairs is not None else Counter()
+        self.samples = samples if samples is not None else {}
+
+    @classmethod
+    def merged(cls, stats: list["OverlapStats"]) -> "OverlapStats":
+        total = cls()
+        for s in stats:
+            total.merge(s)
+        return total
+
+    def _sample(self, key: tuple, location: tuple):
+        samples = self.samples.setdefault(key, [])
+        if len(samples) < SAMPLE_LIMIT:
+            samples.append(location)
+
+    def add(self, line_tags: ParsedCustom, location: tuple):
+        """
+        Count the overlaps of one line
+
+        Args:
+            line_tags (ParsedCustom): Tokenized custom string of the line
+            location (tuple): Where the line is, (report_date, region index, line id)
+        """
+        spans = line_spans(line_tags)
+        if len(spans) < 2:
+            return
+
+        for group in group_overlaps(spans).values():
+            group = tuple(de_dupe(tag) for tag in sorted(group))
+            self.groups[group] += 1
+            self._sample(("group", *group), location)
+
+        for i, j in overlapping_pairs([(start, end) for _, start, end in spans]):
+            (tag_i, *span_i), (tag_j, *span_j) = spans[i], spans[j]
+            kind = relation(tuple(span_i), tuple(span_j))
+            tag_i, tag_j = de_dupe(tag_i), de_dupe(tag_j)
+            if kind == "contains":
+                inner_first = span_i[0] >= span_j[0] and span_i[1] <= span_j[1]
+                key = (kind, tag_j, tag_i) if inner_first else (kind, tag_i, tag_j)
+            else:
+                key = (kind, *sorted([tag_i, tag_j]))
+            self.pairs[key] += 1
+            self._sample(key, location)
+
+    def add_regions(self, report_date: int, regions: list[TextRegion]):
+        for region in regions:
+            for line in region.lines:
+                if line.text is not None:  # parse_attributes skips lines without text
+                    self.add(line.tags, (report_date, region.idx, line.id))
+
+    def merge(self, other: "OverlapStats") -> "OverlapStats":
+        self.groups.update(other.groups)
+        self.pairs.update(other.pairs)
+        for key, locations in other.samples.items():
+            for location in locations:
+                self._sample(key, location)
+        return self
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, OverlapStats):
+            return NotImplemented
+        return self.groups == other.groups and self.pairs == other.pairs and self.samples == other.samples
+
+    def __repr__(self) -> str:
+        return f"OverlapStats(groups={len(self.groups)}, pairs={len(self.pairs)})"
+
+
+def read_overlaps(path: str, encoding: str = "utf-8", backend: str = None, data: bytes = None) -> OverlapStats:
+    """
+    Overlap stats of a combined report read straight from its custom strings
+    Only the tags are tokenized, nothing is parsed with parse_attributes, so this is much quicker than load_report
+
+    Args:
+        path (str): Path to a combined report
+        encoding (str, optional): Encoding of the report XML. Defaults to "utf-8".
+        backend (str, optional): XML parser, see coleridge.data.read_xml. Defaults to None, lxml if it is installed.
+        data (bytes, optional): The report's contents if they've already been read, e.g. by coleridge.data.prefetch. Defaults to None, read path.
+
+    Returns:
+        OverlapStats: The report's overlaps
+    """
+    stats = OverlapStats()
+    report_date = report_date_from_path(path)
+    source = path if data is None else io.BytesIO(data)
+    for i, element in enumerate(iter_text_regions(source, encoding=encoding, backend=backend)):
+        stats.add_regions(report_date, [TextRegion.from_element(element, idx=i)])
+    return stats
+
+
+def analyze_reports(report_paths: list[str], workers: int = 1, read_ahead: int = READ_AHEAD) -> list[OverlapStats]:
+    """
+    Overlap stats of each report, see read_overlaps
+
+    Args:
+        report_paths (list[str]): Paths to combined reports
+        workers (int, optional): Number of reports to read in parallel. Defaults to 1.
+        read_ahead (int, optional): Reports read ahead of the one being analyzed by a single worker, see coleridge.data.prefetch.
+            Defaults to READ_AHEAD.
+
+    Returns:
+        list[OverlapStats]: Each report's stats in report_paths order
+    """
+    if workers > 1 and len(report_paths) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(report_paths))) as executor:
+            return list(executor.map(read_overlaps, report_paths))
+    return [read_overlaps(path, data=data) for path, data in prefetch(report_paths, read_ahead=read_ahead)]
+
+
+def format_location(location: tuple) -> str:
+    report_date, region_idx, line_id = location
+    return f"{report_date}:{region_idx}:{line_id}"
+
+
+def write_overlaps(stats: OverlapStats, output_dir: str):
+    """
+    Write the group counts to overlapping_groups.txt, the file the grouping rules of parse_attributes are based on,
+    and every group and pair with their sample locations to tag_overlaps.csv
+
+    Args:
+        stats (OverlapStats): Corpus overlap stats
+        output_dir (str): Directory to write to
+    """
+    sorted_groups = sorted(stats.groups.items(), key=lambda x: x[1], reverse=True)
+    with open(os.path.join(output_dir, "overlapping_groups.txt"), "w") as f:
+        f.writelines(f"{group}: {count}\n" for group, count in sorted_groups)
+
+    with open(os.path.join(output_dir, "tag_overlaps.csv"), "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow(["kind", "tags", "count", "samples"])
+        for group, count in sorted_groups:
+            writer.writerow(["group", " ".join(group), count, " ".join(format_location(loc) for loc in stats.samples[("group", *group)])])
+        for key, count in sorted(stats.pairs.items(), key=lambda x: (RELATIONS.index(x[0][0]), -x[1])):
+            writer.writerow([key[0], " ".join(key[1:]), count, " ".join(format_location(loc) for loc in stats.samples[key])])
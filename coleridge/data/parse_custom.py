@@ -0,0 +1,125 @@
+from functools import lru_cache
+
+from coleridge import metrics
+
+# Characters allowed in a tag value, matching the character classes used by the original regexes
+# [\.\w\s\d\\'’\-/] for values and [\.\w\s:;\d\\'’\-/] for the contents of a {...} block
+VALUE_PUNCTUATION = frozenset(".\\'’-/")
+BLOCK_PUNCTUATION = VALUE_PUNCTUATION | frozenset(":;")
+
+CUSTOM_CACHE_SIZE = 2 ** 16
+
+ParsedCustom = tuple[tuple[str, tuple[tuple[str, str], ...]], ...]
+
+
+def _is_word(c: str) -> bool:
+    return c.isalnum() or c == "_"
+
+
+def _is_value(c: str) -> bool:
+    return c.isalnum() or c == "_" or c.isspace() or c in VALUE_PUNCTUATION
+
+
+def _is_block(c: str) -> bool:
+    return c.isalnum() or c == "_" or c.isspace() or c in BLOCK_PUNCTUATION
+
+
+def normalise_custom_string(custom: str, normalise_role: bool = True) -> str:
+    """
+    Clean up a raw Transkribus custom string before tokenizing
+
+    Args:
+        custom (str): The raw custom attribute string
+        normalise_role (bool, optional): Lower case " Role " tags. Defaults to True.
+
+    Returns:
+        str: The custom string with escaped spaces/apostrophes replaced
+    """
+    # Handle misformatted Unicode, U+0020 (space), U+0027 (apostrophe)
+    if "\\u" in custom:
+        custom = custom.replace(r"\u0020", " ").replace(r"\u0027", "'")
+    if normalise_role and " Role " in custom:  # There are upper and lower cased R/role tags
+        custom = custom.replace(" Role ", " role ")
+    return custom
+
+
+def tokenize_block(block: str) -> tuple[tuple[str, str], ...]:
+    """
+    Split the inside of a tag block, e.g. "offset:0; length:5;lastname:Dutt;", into key/value pairs
+
+    Args:
+        block (str): The text between the braces of a tag
+
+    Returns:
+        tuple[tuple[str, str], ...]: (key, value) pairs in the order they appear
+    """
+    pairs = []
+    n = len(block)
+    pos = 0
+    while pos < n:
+        colon = block.find(":", pos)
+        if colon == -1:
+            break
+
+        key_start = colon
+        while key_start > pos and _is_word(block[key_start - 1]):
+            key_start -= 1
+
+        value_end = colon + 1
+        while value_end < n and _is_value(block[value_end]):
+            value_end += 1
+
+        if key_start < colon and value_end > colon + 1:
+            pairs.append((block[key_start:colon], block[colon + 1:value_end]))
+            pos = value_end
+        else:
+            pos = colon + 1
+
+    return tuple(pairs)
+
+
+@lru_cache(maxsize=CUSTOM_CACHE_SIZE)
+def parse_custom_string(custom: str, normalise_role: bool = True) -> ParsedCustom:
+    """
+    Tokenize a Transkribus custom string in a single pass
+    e.g. "readingOrder {index:1;} person {offset:0; length:5;}" becomes
+    (("readingOrder", (("index", "1"),)), ("person", (("offset", "0"), ("length", "5"))))
+
+    Results are cached on the raw string, and are immutable so the cached values can be shared
+
+    Args:
+        custom (str): The raw custom attribute string
+        normalise_role (bool, optional): Lower case " Role " tags. Defaults to True.
+
+    Returns:
+        ParsedCustom: (tag, ((key, value), ...)) pairs in the order they appear
+    """
+    metrics.count("custom_strings_tokenized")
+    custom = normalise_custom_string(custom, normalise_role=normalise_role)
+
+    tags = []
+    n = len(custom)
+    pos = 0
+    while pos < n:
+        brace = custom.find("{", pos)
+        if brace == -1:
+            break
+
+        # A tag is a run of word characters followed by a single space and the opening brace
+        space = brace - 1
+        tag_start = space
+        if space > pos and custom[space] == " ":
+            while tag_start > pos and _is_word(custom[tag_start - 1]):
+                tag_start -= 1
+
+        block_end = brace + 1
+        while block_end < n and _is_block(custom[block_end]):
+            block_end += 1
+
+        if tag_start < space and block_end > brace + 1 and block_end < n and custom[block_end] == "}":
+            tags.append((custom[tag_start:space], tokenize_block(custom[brace + 1:block_end])))
+            pos = block_end + 1
+        else:
+            pos = brace + 1
+
+    return tuple(tags)
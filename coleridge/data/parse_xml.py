@@ -1,41 +1,72 @@
 from collections import Counter
-from itertools import combinations
-import re
 from xml.etree.ElementTree import Element
 
+from coleridge import metrics
+from coleridge.data.intervals import group_overlaps
+from coleridge.data.model import TextLine, TextRegion
+from coleridge.data.parse_custom import normalise_custom_string, parse_custom_string
 
-def parse_custom_attribute_string(element: Element, normalise_role: bool = True) -> list[tuple[str, tuple[str, str]]]:
+# Line classes of classify_line, each counted as lines_<class> when metrics are enabled
+TAG_FREE = "tag_free"
+SINGLE_TAG = "single_tag"
+MULTI_TAG = "multi_tag"
+
+
+def custom_string(element: Element|TextLine|TextRegion) -> str:
+    """
+    The raw custom string of an XML element or of a TextLine/TextRegion
+
+    Args:
+        element (Element|TextLine|TextRegion): A line or region
+
+    Returns:
+        str: The custom attribute string
+    """
+    if isinstance(element, (TextLine, TextRegion)):
+        return element.custom
+    return element.attrib.get("custom")
+
+
+def line_text(line: Element|TextLine) -> str|None:
+    """
+    The text of a line, read from a TextLine directly or from the TextEquiv/Unicode position of a TextLine Element
+
+    Args:
+        line (Element|TextLine): A text line
+
+    Returns:
+        str|None: The line's text, None if it has none
+    """
+    if isinstance(line, TextLine):
+        return line.text
+    return line[2][0].text
+
+
+def parse_custom_attribute_string(element: Element|TextLine|TextRegion, normalise_role: bool = True) -> list[tuple[str, tuple[tuple[str, str], ...]]]:
     """
     Parse the custom attributes of an XML element
     Convert the custom string into a list of (Transkribus) tags and tag values
 
     Args:
-        element (Element): _description_
+        element (Element|TextLine|TextRegion): A line or region, TextLines reuse the tags parsed when they were built
 
     Returns:
-        list[tuple[str, tuple[str, str]]]: _description_
+        list[tuple[str, tuple[tuple[str, str], ...]]]: (tag, ((key, value), ...)) pairs in the order they appear
     """
-    attributes_raw = element.attrib.get("custom")
-    # Handle misformatted Unicode, U+0020 (space), U+0027 (apostrophe)
-    attributes = attributes_raw.replace(r"\u0020", " ").replace(r"\u0027", "'")
-    if " Role " in attributes and normalise_role:  # There are upper and lower cased R/role tags
-        attributes = attributes.replace(" Role ", " role ")
-    attrib_pair_re = re.compile(r"(?P<tag>\w+) (?P<text>\{[\.\w\s:;\d\\'’\-/]+\})")
-    attrib_inner_re = re.compile(r"(?P<tag>\w+):(?P<text>[\.\w\s\d\\'’\-/]+)")
-    all_attribs = attrib_pair_re.findall(attributes)
-
-    inner_found = [(k, attrib_inner_re.findall(v[1:-1])) for k,v in all_attribs]
-    # breakpoint()
-    return inner_found
+    metrics.count("custom_strings_parsed")
+    if normalise_role and isinstance(element, TextLine):
+        return list(element.tags)
+    return list(parse_custom_string(custom_string(element), normalise_role=normalise_role))
 
 
-def parse_attributes(region: Element, line_idx: int = None, normalise_role: bool = True) -> dict[str, dict[str, str]|list[dict[str, str]]]:
+def parse_attributes(region: Element|TextRegion, line_idx: int = None, normalise_role: bool = True, continuations: dict[int, str|None] = None) -> dict[str, dict[str, str]|list[dict[str, str]]]:
     """
     Parse a string of attributes from an xml
 
     Args:
         attrib (str): A string of attributes from an xml
-        region_lines (Element[str]): All lines after the current line in the parent text region (inclusive)
+        region_lines (Element[str]|TextRegion): All lines after the current line in the parent text region (inclusive)
+        continuations (dict[int, str|None], optional): Continued text already gathered for lines in this region. Defaults to None.
 
     Returns:
         dict[str, dict[str, str]|list[dict[str, str]]]: A well formatted dictionary of attributes
@@ -48,14 +79,27 @@ def parse_attributes(region: Element, line_idx: int = None, normalise_role: bool
     
     element = region[line_idx]
 
-    if "Coord" in element.tag or "TextEquiv" in element.tag:
+    if not isinstance(element, TextLine) and ("Coord" in element.tag or "TextEquiv" in element.tag):
         raise ValueError(f"Only TextLines should be passed to parse_attributes, {element.tag.split("}")[1]} was passed")
-    elif element[2][0].text is None:
+    elif line_text(element) is None:
         return dict()  # No text
+
+    metrics.count("lines_parsed")
     
     inner_found = parse_custom_attribute_string(element, normalise_role=normalise_role)
-    
-    formatted_attributes = {}
+    line_class = classify_line(inner_found)
+    metrics.count(f"lines_{line_class}")
+    # Only counted, continued lines take the single or multi tag path like any other, see classify_line
+    if metrics.enabled() and any(k == "continued" for _, vals in inner_found for k, _ in vals):
+        metrics.count("lines_continued")
+
+    if line_class == TAG_FREE:
+        return dict()  # readingOrder is never part of the output
+    elif line_class == SINGLE_TAG:
+        # One tag can't overlap anything, so there are no groups to merge
+        unique_attr_dicts = {attr: {k: v for k, v in vals} for attr, vals in inner_found}
+        return format_attributes(region, line_idx, unique_attr_dicts, continuations=continuations)
+
     counts = Counter([x[0] for x in inner_found])  # TODO implement checking for multiple attrs in one line
     multiples = {k:0 for k,v in counts.items() if v > 1}
 
@@ -68,16 +112,9 @@ def parse_attributes(region: Element, line_idx: int = None, normalise_role: bool
         else:
             unique_attr_dicts[attr] = vals
 
-    overlaps = [(a, (d.get("offset"), d.get("length"))) for a, d in unique_attr_dicts.items()]
-    overlaps = [(a, {x for x in range(int(d[0]), int(d[0]) + int(d[1]) + 1)}) for a, d in overlaps if d[0]]
-
-    sets = combinations(overlaps, r=2)
-    grouped_sets = {slice(min(span), max(span)): [] for k,span in overlaps}
-    for ((tag1, span1), (tag2, span2)) in sets:
-        if span1 & span2:
-            grouped_sets[slice(min(span1), max(span1))].extend([tag1, tag2])
-
-    grouped_sets = {k:list(set(v)) for k,v in grouped_sets.items() if v}
+    spans = [(a, int(d["offset"]), int(d["offset"]) + int(d.get("length"))) for a, d in unique_attr_dicts.items() if d.get("offset")]
+    grouped_sets = group_overlaps(spans)
+    metrics.count("overlap_groups", len(grouped_sets))
     grouping_tags = ["medical", "acknowledgement", "criticism", "role"]
 
     for gs in grouped_sets.values():
@@ -100,7 +137,7 @@ def parse_attributes(region: Element, line_idx: int = None, normalise_role: bool
                 if de_duped[t] not in unique_attr_dicts:
                     # Part of an overlapping subset of a group that's previously been processed 
                     break
-                person[t] = gather_attribute_text(region, line_idx, attr=t, attr_dict=unique_attr_dicts[de_duped[t]])
+                person[t] = gather_attribute_text(region, line_idx, attr=t, attr_dict=unique_attr_dicts[de_duped[t]], continuations=continuations)
                 person |= unique_attr_dicts[de_duped[t]]
 
             for k, v in de_duped.items():
@@ -124,13 +161,52 @@ def parse_attributes(region: Element, line_idx: int = None, normalise_role: bool
                 del unique_attr_dicts[de_duped["ethnicity"]]
 
 
-    # breakpoint()
+    return format_attributes(region, line_idx, unique_attr_dicts, continuations=continuations)
+
+
+def classify_line(tags: list[tuple[str, tuple[tuple[str, str], ...]]]) -> str:
+    """
+    Which parse_attributes path a line's tags need, TAG_FREE, SINGLE_TAG or MULTI_TAG
+    readingOrder is never part of the output, so a line with only readingOrder has no attributes
+    and a line with one other tag has nothing to overlap.
+    Continued tags aren't a class of their own, they are only counted as lines_continued. A continued tag is never
+    readingOrder, so its line takes the SINGLE_TAG or MULTI_TAG path, and both resolve continuations the same way
+
+    Args:
+        tags (list[tuple[str, tuple[tuple[str, str], ...]]]): A line's tags, see parse_custom_attribute_string
+
+    Returns:
+        str: The line's class
+    """
+    reading_orders = sum(1 for tag, _ in tags if tag == "readingOrder")
+    if reading_orders > 1:
+        return MULTI_TAG  # Numbered readingOrder0, readingOrder1 tags are kept in the output
+    others = len(tags) - reading_orders
+    if others == 0:
+        return TAG_FREE
+    return SINGLE_TAG if others == 1 else MULTI_TAG
+
+
+def format_attributes(region: Element|TextRegion, line_idx: int, unique_attr_dicts: dict[str, dict[str, str]], continuations: dict[int, str|None] = None) -> dict[str, dict[str, str]]:
+    """
+    Add the text of each tag on a line, leaving out readingOrder and tags continued from a previous line
+
+    Args:
+        region (Element|TextRegion): The TextRegion the line is a child of
+        line_idx (int): The idx of the line within region
+        unique_attr_dicts (dict[str, dict[str, str]]): The line's attributes, keyed by tags unique within the line
+        continuations (dict[int, str|None], optional): Continued text already gathered for lines in this region. Defaults to None.
+
+    Returns:
+        dict[str, dict[str, str]]: The attributes that start on this line, with their text
+    """
+    formatted_attributes = {}
     for attr, attr_dict in unique_attr_dicts.items():
         if attr == "readingOrder":
             continue
         
         if "offset" in attr_dict:
-            attr_text = gather_attribute_text(region=region, line_idx=line_idx, attr=attr, attr_dict=attr_dict)
+            attr_text = gather_attribute_text(region=region, line_idx=line_idx, attr=attr, attr_dict=attr_dict, continuations=continuations)
             # breakpoint()
             if attr_text is None:  # This was text continued from a previous line
                 continue            
@@ -139,19 +215,38 @@ def parse_attributes(region: Element, line_idx: int = None, normalise_role: bool
         output_dict = {attr:attr_dict}
         formatted_attributes |= output_dict
     
-    # breakpoint()
     return formatted_attributes
 
 
-def gather_attribute_text(region: Element, line_idx: int, attr: str, attr_dict: dict[str, str]) -> str:
+def parse_region(region: Element|TextRegion, normalise_role: bool = True) -> list[dict[str, dict[str, str]|list[dict[str, str]]]]:
+    """
+    Parse the attributes of every line in a TextRegion in one sweep
+    Continued text is gathered once per line and shared, rather than re-parsed for every line that continues onto it
+
+    Args:
+        region (Element|TextRegion): TextRegion, excluding Coords and TextEquiv lines
+        normalise_role (bool, optional): Lower case " Role " tags. Defaults to True.
+
+    Returns:
+        list[dict[str, dict[str, str]|list[dict[str, str]]]]: The parse_attributes output for each line, in order
+    """
+    continuations = {}
+    return [
+        parse_attributes(region, line_idx=i, normalise_role=normalise_role, continuations=continuations)
+        for i in range(len(region))
+    ]
+
+
+def gather_attribute_text(region: Element|TextRegion, line_idx: int, attr: str, attr_dict: dict[str, str], continuations: dict[int, str|None] = None) -> str:
     """
     Extract text from lines after the line_idx line that have the continued tag and are associated with
     a continued attr tag from the line_idx line
 
     Args:
-        region (Element): The TextRegion the current line is a child of
+        region (Element|TextRegion): The TextRegion the current line is a child of
         line_idx (int): The idx of the current line with region
         attr (str): The attr to search for continued tags of in following lines
+        continuations (dict[int, str|None], optional): Continued text already gathered for lines in this region. Defaults to None.
 
     Returns:
         str: A concatenated, new line joined string representing all continued text
@@ -159,7 +254,7 @@ def gather_attribute_text(region: Element, line_idx: int, attr: str, attr_dict:
     # breakpoint()    
     offset = int(attr_dict["offset"])
     length = int(attr_dict["length"])
-    line_length = len(region[line_idx][2][0].text)
+    line_length = len(line_text(region[line_idx]))
     line_attr_text = extract_line_text(line=region[line_idx], attr=attr, attr_dict=attr_dict)
 
     if "continued" not in attr_dict:
@@ -189,8 +284,7 @@ def gather_attribute_text(region: Element, line_idx: int, attr: str, attr_dict:
         # other tags have attributes we can compare between lines to check continuity
 
         if attr != "acknowledgement" and line_idx > 0:            
-            prev_line_attrs_raw = region[line_idx - 1].attrib.get("custom")
-            prev_line_attrs = prev_line_attrs_raw.replace(r"\u0020", " ").replace(r"\u0027", "'")
+            prev_line_attrs = normalise_custom_string(custom_string(region[line_idx - 1]), normalise_role=False)
             
             common_overlap_keys = ["continued", "scale", "member", "leader", "ethnicity"]  # tag attributes that are likely to be the same as the prev line by chance
             if attr == "role":
@@ -202,17 +296,17 @@ def gather_attribute_text(region: Element, line_idx: int, attr: str, attr_dict:
                 return None                    
         
         # breakpoint()
-        continued_text = find_continued_text(region=region, line_idx=line_idx, attr=attr)
+        continued_text = find_continued_text(region=region, line_idx=line_idx, attr=attr, continuations=continuations)
         line_attr_text += continued_text
         return line_attr_text
     
 
-def extract_line_text(line: Element, attr: str, attr_dict: dict[any, any]):
+def extract_line_text(line: Element|TextLine, attr: str, attr_dict: dict[any, any]):
     """
     Extract text from an Tkb PAGE XML line by getting the offset and length attributes
 
     Args:
-        line (Element): A text line in an xml
+        line (Element|TextLine): A text line in an xml
         attrib_name (str): The name of an attribute
         attribs (dict[str, str]): A dictionary of attributes containing length and offset
 
@@ -225,53 +319,94 @@ def extract_line_text(line: Element, attr: str, attr_dict: dict[any, any]):
         raise KeyError(f"length not in attributes for {attr}")
     
     offset, length = int(attr_dict.pop("offset")), int(attr_dict.pop("length"))
-    return line[2][0].text[offset:offset + length]
+    return line_text(line)[offset:offset + length]
 
 
-def find_continued_text(region: Element, line_idx: int, attr: str) -> str:
+def find_continued_text(region: Element|TextRegion, line_idx: int, attr: str, continuations: dict[int, str|None] = None) -> str:
     """
     Find text of an attribute continuing from one line to another
 
     Args:
-        region (Element): TextRegion, excluding Coords and TextEquiv lines
+        region (Element|TextRegion): TextRegion, excluding Coords and TextEquiv lines
         line_idx (int): The current line being parsed in the TextRegion
         attr (str): Name of the continued tag
+        continuations (dict[int, str|None], optional): Continued text already gathered for lines in this region. Defaults to None.
 
     Returns:
         str: The text of the tag continued on succeeding lines
     """
-    continued_text = "\n"
-    
-    for i, line in enumerate(region[line_idx + 1:]): # Coords/TextEquiv lines are checked for in parse_attributes()
-        # breakpoint()
-        if line[2][0].text is None:
-            return ""
-        
-        line_length = len(line[2][0].text)
-        inner_found = parse_custom_attribute_string(line)
+    if continuations is None:
+        continuations = {}
+
+    with metrics.timer("continuation_resolution"):
+        continued_text = _continued_tail(region=region, start_idx=line_idx + 1, continuations=continuations)
+    if continued_text is None:
+        return ""
+
+    return ("\n" + continued_text).rstrip("\n")
+
+
+def _continued_tail(region: Element|TextRegion, start_idx: int, continuations: dict[int, str|None]) -> str|None:
+    """
+    Gather the continued text starting at start_idx, memoising the result for every line on the way
+    A line's continued text only depends on the lines after it, so each line is visited once per region
+
+    Args:
+        region (Element|TextRegion): TextRegion, excluding Coords and TextEquiv lines
+        start_idx (int): The first line to look for continued text in
+        continuations (dict[int, str|None]): Continued text already gathered, keyed by line idx
 
-        for attr, vals in inner_found:
-            attr_dict = {attr: {k: v for k,v in vals}}
-            if "continued" not in attr_dict[attr]:
+    Returns:
+        str|None: New line terminated continued text, or None if a line without text ended the search
+    """
+    chain = []
+    tail = ""
+    line_idx = start_idx
+    while line_idx < len(region):  # Coords/TextEquiv lines are checked for in parse_attributes()
+        if line_idx in continuations:
+            metrics.count("continuation_memo_hits")
+            tail = continuations[line_idx]
+            break
+
+        metrics.count("continuation_lookaheads")
+        line = region[line_idx]
+        if line_text(line) is None:
+            tail = None
+            continuations[line_idx] = tail
+            break
+
+        line_attr_text = None
+        for attr, vals in parse_custom_attribute_string(line):
+            attr_dict = {k: v for k,v in vals}
+            if "continued" not in attr_dict:
                 continue
 
-            length = int(attr_dict[attr]["length"])
-            offset = int(attr_dict[attr]["offset"])
+            length = int(attr_dict["length"])
+            offset = int(attr_dict["offset"])
 
             if offset != 0:
                 continue
 
-            if attr == attr:
-                attr_text = extract_line_text(line=line, attr=attr, attr_dict=attr_dict[attr])
-                # breakpoint()
-                continued_text += attr_text + "\n"
-                if line_idx + i + 2 == len(region):  # End of a region
-                    return continued_text.rstrip("\n")
-                elif length < line_length:
-                    return continued_text.rstrip("\n")
-                break
-        else:
-            return continued_text.rstrip("\n")
+            line_attr_text = extract_line_text(line=line, attr=attr, attr_dict=attr_dict)
+            break
+
+        if line_attr_text is None:
+            continuations[line_idx] = tail
+            break
+        elif line_idx + 1 == len(region) or length < len(line_text(line)):  # End of a region or of the continued tag
+            tail = line_attr_text + "\n"
+            continuations[line_idx] = tail
+            break
+
+        chain.append((line_idx, line_attr_text))
+        line_idx += 1
+
+    for line_idx, line_attr_text in reversed(chain):
+        if tail is not None:
+            tail = line_attr_text + "\n" + tail
+        continuations[line_idx] = tail
+
+    return tail
 
 
 def de_dupe(s: str) -> str:
@@ -295,22 +430,26 @@ def de_dupe(s: str) -> str:
 def extract_entities(attribs, heading_attribs=dict()):
     """
     Extract person entities from a list of tags derived from line attributes
+    attribs is left unchanged, so the same line attributes can be shared with other extractors
 
     Args:
-        attribs (dict): A dictionary of tags and tag values
+        attribs (dict|TextLine): A dictionary of tags and tag values, or a parsed TextLine
         heading_attribs (dict, optional): A dictionary of tags extracted from the heading region associated with the line attribs came from. Defaults to dict().
 
     Returns:
         dict|list: Either a dictionary corresponding to an entity, or a list of multiple entity tags that occur on a line
     """
+    if isinstance(attribs, TextLine):
+        attribs = attribs.attributes
+
     single_attrs = [a for a in attribs if de_dupe(a) == a]
     multi_attrs = [a for a in attribs if de_dupe(a) != a]
     de_dupe_multi = [de_dupe(a) for a in multi_attrs]
     # breakpoint()
     if any(x in single_attrs for x in ["person", "member"]):
         if "person" in single_attrs:
-            entity = {"person": attribs["person"].pop("text")}
-            entity |= attribs["person"]
+            entity = {"person": attribs["person"]["text"]}
+            entity |= {k: v for k, v in attribs["person"].items() if k != "text"}
             single_attrs.remove("person")
         elif "member" in single_attrs:
             entity = {"person": attribs["member"]["text"]}
@@ -344,16 +483,16 @@ def extract_entities(attribs, heading_attribs=dict()):
         entities = list()
         for dd, attr in zip(de_dupe_multi, multi_attrs):
             if dd == "person":
-                entity = {"person": attribs[attr].pop("text")}
-                entity |= attribs[attr]
+                entity = {"person": attribs[attr]["text"]}
+                entity |= {k: v for k, v in attribs[attr].items() if k != "text"}
                 if "leader" not in entity:
                     entity["leader"] = False
                 entity |= heading_attribs
                 entities.append(entity)
             elif dd == "member":  # this is never the case as of 76a90c8
                 breakpoint()
-                entity = {"person": attribs[attr].pop("text")}
-                entity |= attribs[attr]
+                entity = {"person": attribs[attr]["text"]}
+                entity |= {k: v for k, v in attribs[attr].items() if k != "text"}
                 entity["leader"] = False
                 entity |= heading_attribs
                 entities.append(entity)
@@ -0,0 +1,245 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import io
+from itertools import repeat
+import logging
+import os
+import time
+
+from coleridge import metrics
+from coleridge.data.cache import load_cached_report
+from coleridge.data.manifest import Manifest
+from coleridge.data.model import TextRegion
+from coleridge.data.parse_xml import parse_attributes, parse_region
+from coleridge.data.prefetch import READ_AHEAD, prefetch
+from coleridge.data.read_xml import iter_text_regions
+from coleridge.data.sections import SectionIndex
+
+logger = logging.getLogger(__name__)
+
+
+def report_date_from_path(path: str) -> int:
+    """
+    Get the report year from a combined report path, e.g. data/interim/1865_combined_pages.xml
+
+    Args:
+        path (str): Path to a combined report
+
+    Returns:
+        int: The report year
+    """
+    return int(os.path.basename(path).split("_")[0])
+
+
+def parse_report(path: str, encoding: str = "utf-8", backend: str = None, data: bytes = None) -> dict:
+    """
+    Parse a combined report once into the plain structure every stage reads from, the part of a report that's cached
+    Each line's custom string and continued text is parsed exactly once, the XML itself is streamed and discarded.
+    Every parsed TextRegion and the report text are kept until the stages have run, so memory grows with the size
+    of the report, about half of what ET.parse of the same report holds but not the single region iter_text_regions holds
+
+    Args:
+        path (str): Path to a combined report
+        encoding (str, optional): Encoding of the report XML. Defaults to "utf-8".
+        backend (str, optional): XML parser, "lxml" or "etree", see coleridge.data.read_xml. Defaults to None, lxml if it is installed.
+        data (bytes, optional): The report's contents if they've already been read, e.g. by coleridge.data.prefetch. Defaults to None, read path.
+
+    Returns:
+        dict: report_date, path, report text and the parsed TextRegions of the report
+    """
+    source = path if data is None else io.BytesIO(data)
+    regions = []
+    report_text = ""
+    for i, element in enumerate(metrics.timed_iter(iter_text_regions(source, encoding=encoding, backend=backend), "xml_load")):
+        with metrics.timer("region_build"):
+            region = TextRegion.from_element(element, idx=i)
+
+        with metrics.timer("attribute_parsing"):
+            for line, line_attributes in zip(region.lines, parse_region(region)):
+                line.attributes = line_attributes
+            if "custom" in region.attrib:
+                region.attributes = parse_attributes(region=region)
+
+        with metrics.timer("report_text"):
+            for line in region.lines:
+                if line.text:
+                    report_text += line.text + " "
+
+        metrics.count("regions_parsed")
+        regions.append(region)
+
+    return {
+        "report_date": report_date_from_path(path),
+        "path": path,
+        "text": report_text,
+        "regions": regions,
+    }
+
+
+def index_sections(report: dict) -> dict:
+    """
+    Add the SectionIndex of a parsed report's regions
+    It's built from the region attributes every time a report is loaded rather than cached,
+    so changes to coleridge.data.sections apply to cached reports too
+
+    Args:
+        report (dict): A report from parse_report
+
+    Returns:
+        dict: The same report with its SectionIndex under sections
+    """
+    with metrics.timer("section_index"):
+        report["sections"] = SectionIndex(report["regions"])
+    return report
+
+
+def load_report(path: str, encoding: str = "utf-8", backend: str = None, data: bytes = None) -> dict:
+    """
+    Parse a combined report and index its sections, see parse_report and index_sections
+
+    Args:
+        path (str): Path to a combined report
+        encoding (str, optional): Encoding of the report XML. Defaults to "utf-8".
+        backend (str, optional): XML parser, "lxml" or "etree", see coleridge.data.read_xml. Defaults to None, lxml if it is installed.
+        data (bytes, optional): The report's contents if they've already been read, e.g. by coleridge.data.prefetch. Defaults to None, read path.
+
+    Returns:
+        dict: report_date, path, report text, the parsed TextRegions of the report and their SectionIndex
+    """
+    return index_sections(parse_report(path, encoding=encoding, backend=backend, data=data))
+
+
+def extract_report(path: str, stages: list, cache_dir: str = None, collect_metrics: bool = False, data: bytes = None) -> tuple[int, list, dict|None]:
+    """
+    Parse one report and run every stage's extract over it
+    Only the stage results are returned, so a worker process sends back row batches rather than the parsed report
+
+    Args:
+        path (str): Path to a combined report
+        stages (list): Extractor stages, see coleridge.data.stages
+        cache_dir (str, optional): Directory of parsed reports to reuse, see coleridge.data.cache. Defaults to None, always parse.
+        collect_metrics (bool, optional): Time and count the work done on this report, see coleridge.metrics. Defaults to False.
+        data (bytes, optional): The report's contents if they've already been read, see load_report. Defaults to None.
+
+    Returns:
+        tuple[int, list, dict|None]: The report year, each stage's results in stage order, and the report's metrics if collected
+    """
+    if collect_metrics:
+        metrics.enable()  # Resets, in a worker process this clears the previous report's metrics
+
+    with metrics.timer("load"):
+        if cache_dir:
+            report = index_sections(load_cached_report(path, cache_dir, partial(parse_report, data=data), data=data))
+        else:
+            report = load_report(path, data=data)
+    logger.info(f"{report['report_date']} parsed {len(report['regions'])} regions")
+
+    report_results = []
+    for stage in stages:
+        with metrics.timer(f"extract:{stage.name}"):
+            stage_results = stage.extract(report)
+        if isinstance(stage_results, list):
+            metrics.count(f"rows:{stage.name}", len(stage_results))
+        report_results.append(stage_results)
+
+    summary = None
+    if collect_metrics:
+        summary = metrics.snapshot()
+        metrics.disable()
+    return report["report_date"], report_results, summary
+
+
+def run_pipeline(
+        report_paths: list[str],
+        stages: list,
+        output_dir: str = "data/processed",
+        workers: int = 1,
+        cache_dir: str = None,
+        metrics_dir: str = None,
+        manifest: Manifest = None,
+        read_ahead: int = READ_AHEAD
+) -> dict[str, list]:
+    """
+    Parse each report once and feed it to every stage, then have each stage write its own output
+    Stages need a name, an extract(report) method returning that report's results,
+    and a write(results, output_dir) method taking the results of every report in order.
+    With a manifest stages also need a version, bumped whenever their results change so the manifest doesn't reuse old ones
+
+    With more than one worker reports are extracted in a process pool, results are still merged in
+    report_paths order so the outputs are the same as a serial run. With one worker the next reports are
+    read on background threads while the current one is parsed
+
+    Args:
+        report_paths (list[str]): Paths to combined reports
+        stages (list): Extractor stages, see coleridge.data.stages
+        output_dir (str, optional): Directory stages write their outputs to. Defaults to "data/processed".
+        workers (int, optional): Number of processes to extract reports with. Defaults to 1.
+        cache_dir (str, optional): Directory of parsed reports to reuse, see coleridge.data.cache. Defaults to None, always parse.
+        metrics_dir (str, optional): Directory to write timers and counters to, a <report_date>.json per report
+            and run.json for the whole run. Defaults to None, metrics are not collected.
+        manifest (Manifest, optional): Only extract reports that changed since the manifest last saw them and reuse the
+            kept results of the rest, see coleridge.data.manifest. Defaults to None, extract every report.
+        read_ahead (int, optional): Reports read ahead of the one being parsed by a single worker, see coleridge.data.prefetch.
+            Defaults to READ_AHEAD.
+
+    Returns:
+        dict[str, list]: Per report results for each stage, keyed by stage name
+    """
+    collect_metrics = metrics_dir is not None
+    run_start = time.perf_counter()
+    report_results = [None] * len(report_paths)
+    report_summaries = {}
+
+    if manifest is not None:
+        for i, path in enumerate(report_paths):
+            report_results[i] = manifest.load_results(path, report_date_from_path(path), stages)
+            if report_results[i] is not None:
+                logger.info(f"{report_date_from_path(path)} unchanged, reusing extracted results")
+    pending = [i for i, stage_results in enumerate(report_results) if stage_results is None]
+    pending_paths = [report_paths[i] for i in pending]
+
+    def collect(extracted):
+        for i, (report_date, stage_results, summary) in zip(pending, extracted):
+            logger.info(f"{report_date} extracted")
+            report_results[i] = stage_results
+            if collect_metrics:
+                report_summaries[report_date] = summary
+            if manifest is not None:
+                manifest.save_results(report_paths[i], report_date, stages, stage_results)
+
+    if workers > 1 and len(pending_paths) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending_paths))) as executor:
+            collect(executor.map(extract_report, pending_paths, repeat(stages), repeat(cache_dir), repeat(collect_metrics)))
+    else:
+        collect(
+            extract_report(path, stages, cache_dir=cache_dir, collect_metrics=collect_metrics, data=data)
+            for path, data in prefetch(pending_paths, read_ahead=read_ahead)
+        )
+
+    if manifest is not None:
+        manifest.save()
+
+    results = {stage.name: [stage_results[j] for stage_results in report_results] for j, stage in enumerate(stages)}
+
+    if collect_metrics:
+        metrics.enable()
+    for stage in stages:
+        with metrics.timer(f"write:{stage.name}"):
+            stage.write(results[stage.name], output_dir)
+
+    if collect_metrics:
+        write_summary = metrics.snapshot()
+        metrics.disable()
+        for report_date, summary in report_summaries.items():
+            metrics.write_summary({"report_date": report_date} | summary, os.path.join(metrics_dir, f"{report_date}.json"))
+
+        run_summary = metrics.merge(list(report_summaries.values()) + [write_summary])
+        run_summary = {
+            "reports": sorted(report_summaries),
+            "reused": len(report_paths) - len(pending),
+            "workers": workers,
+            "seconds": time.perf_counter() - run_start,
+        } | run_summary
+        metrics.write_summary(run_summary, os.path.join(metrics_dir, "run.json"))
+
+    return results
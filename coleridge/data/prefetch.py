@@ -0,0 +1,44 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
+
+# Files read ahead of the one being parsed, enough to hide a read behind a parse without holding the corpus in memory
+READ_AHEAD = 2
+
+
+def read_bytes(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def prefetch(paths: list[str], read_ahead: int = READ_AHEAD) -> Iterator[tuple[str, bytes]]:
+    """
+    Read files into memory on background threads while the caller works on the previous ones
+    At most read_ahead files are read ahead of the one last yielded, so memory stays bounded however many paths there are.
+    File reads release the GIL, so the reads overlap with parsing on the main thread
+
+    Args:
+        paths (list[str]): Paths of the files to read, in the order they're needed
+        read_ahead (int, optional): Files to read ahead. Defaults to READ_AHEAD, 0 reads each file when it's needed.
+
+    Yields:
+        Iterator[tuple[str, bytes]]: (path, contents) pairs in paths order
+    """
+    if read_ahead < 1:
+        for path in paths:
+            yield path, read_bytes(path)
+        return
+
+    executor = ThreadPoolExecutor(max_workers=read_ahead, thread_name_prefix="prefetch")
+    try:
+        pending = deque()
+        for path in paths:
+            pending.append((path, executor.submit(read_bytes, path)))
+            if len(pending) > read_ahead:
+                path, read = pending.popleft()
+                yield path, read.result()
+        while pending:
+            path, read = pending.popleft()
+            yield path, read.result()
+    finally:
+        executor.shutdown(cancel_futures=True)
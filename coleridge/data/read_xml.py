@@ -0,0 +1,84 @@
+from typing import IO, Iterator
+import xml.etree.ElementTree as ET
+from xml.etree.ElementTree import Element
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+ns = {
+    "page": "http://schema.primaresearch.org/PAGE/gts/pagecontent/2013-07-15",
+    "xsi": "http://www.w3.org/2001/XMLSchema-instance"
+}
+
+TEXT_REGION_TAG = f"{{{ns['page']}}}TextRegion"
+
+XML_BACKENDS = ("lxml", "etree")
+DEFAULT_XML_BACKEND = "lxml" if lxml_etree is not None else "etree"
+
+
+def _iterparse(source: str|IO[bytes], encoding: str = None, backend: str = None):
+    """
+    Start and end events from lxml or ElementTree, both give elements with the same interface
+    Comments and processing instructions are dropped by lxml so positional indexing, e.g. line[2][0], is the same for both
+
+    Args:
+        source (str|IO[bytes]): Path to, or file object of, an XML
+        encoding (str, optional): Override the encoding declared in the XML. Defaults to None.
+        backend (str, optional): "lxml" or "etree". Defaults to None, lxml if it is installed.
+
+    Returns:
+        Iterator[tuple[str, Element]]: (event, element) pairs
+    """
+    backend = backend or DEFAULT_XML_BACKEND
+    if backend not in XML_BACKENDS:
+        raise ValueError(f"Unknown XML backend {backend}, expected one of {XML_BACKENDS}")
+
+    if backend == "lxml":
+        if lxml_etree is None:
+            raise ImportError("lxml is not installed, use the etree backend")
+        return lxml_etree.iterparse(source, events=("start", "end"), encoding=encoding, remove_comments=True, remove_pis=True)
+
+    parser = ET.XMLParser(encoding=encoding) if encoding else None
+    return ET.iterparse(source, events=("start", "end"), parser=parser)
+
+
+def iter_text_regions(source: str|IO[bytes], encoding: str = None, backend: str = None) -> Iterator[Element]:
+    """
+    Stream the TextRegions of a combined (or single page) PAGE XML in document order
+    Regions are yielded as soon as they have been parsed, then cleared and dropped from the tree
+    when the next region is requested, so copy anything needed from a region before moving on.
+    Nested TextRegions are yielded after their parent, in the same order as root.iter()
+
+    Args:
+        source (str|IO[bytes]): Path to, or file object of, a PAGE XML
+        encoding (str, optional): Override the encoding declared in the XML. Defaults to None.
+        backend (str, optional): "lxml" or "etree". Defaults to None, lxml if it is installed.
+
+    Yields:
+        Iterator[Element]: TextRegion elements
+    """
+    ancestors = []
+    region_depth = 0
+
+    for event, element in _iterparse(source, encoding=encoding, backend=backend):
+        if event == "start":
+            ancestors.append(element)
+            if element.tag == TEXT_REGION_TAG:
+                region_depth += 1
+            continue
+
+        ancestors.pop()
+        if element.tag == TEXT_REGION_TAG:
+            region_depth -= 1
+            if region_depth:
+                continue  # Nested region, yielded along with the outermost region
+            yield from element.iter(TEXT_REGION_TAG)
+        elif region_depth:
+            continue  # Part of a region that hasn't been yielded yet
+
+        # Anything outside a region is finished with once it closes
+        element.clear()
+        if ancestors:
+            ancestors[-1].remove(element)
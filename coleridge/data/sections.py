@@ -0,0 +1,157 @@
+from coleridge.data.model import TextRegion
+from coleridge.data.parse_xml import de_dupe
+
+REGION_KINDS = ("heading", "credit", "narrative", "table")
+
+# How many regions after a heading its credits can start, credits further away are skipped
+CREDIT_WINDOW = 2
+
+
+def region_structure(region: TextRegion) -> str:
+    """
+    The structure type tagged on a region, e.g. heading or credit
+
+    Args:
+        region (TextRegion): A region from load_report
+
+    Returns:
+        str: The structure type, "" if the region has none
+    """
+    return region.attributes.get("structure", {"type": ""}).get("type")
+
+
+def region_kind(structure: str) -> str:
+    """
+    Classify a region by its structure type, untagged regions and structure types outside REGION_KINDS are narrative
+
+    Args:
+        structure (str): The region's structure type
+
+    Returns:
+        str: One of REGION_KINDS
+    """
+    return structure if structure in REGION_KINDS else "narrative"
+
+
+def heading_context(region: TextRegion) -> dict[str, str]:
+    """
+    Survey party, area, places and season named in a heading region
+
+    Args:
+        region (TextRegion): A heading region from load_report
+
+    Returns:
+        dict[str, str]: The heading context copied onto entities, places and maps under the heading
+    """
+    survey_parties = []
+    survey_areas = []
+    place_names = []
+    place_wikidata_ids = []
+    place_countries = []
+    season = ""
+
+    for line in region.lines:
+        if line.text is None:
+            continue
+        line_attributes = line.attributes
+
+        if line_attributes.get("survey_party", {}).get("text"):
+            survey_parties.append(line_attributes["survey_party"]["text"])
+        if line_attributes.get("survey_area", {}).get("text"):
+            survey_areas.append(line_attributes["survey_area"]["text"])
+
+        for attr, val in line_attributes.items():
+            if de_dupe(attr) == "place":
+                place_names.append(val.get("placeName", ""))
+                place_wikidata_ids.append(val.get("wikiData", ""))
+                place_countries.append(val.get("country", ""))
+
+        if "Season" in line.text:
+            season = line.text
+
+    place_names = ", ".join(place_names)
+    return {
+        "heading_survey_area": ", ".join(survey_areas).strip(","),
+        "heading_survey_party": ", ".join(survey_parties).strip('"'),
+        "season": season.strip("Season ").strip("."),
+        "heading_places": place_names,
+        "heading_place_names": place_names,
+        "heading_place_wikidata_ids": ", ".join(place_wikidata_ids),
+        "heading_place_countries": ", ".join(place_countries),
+    }
+
+
+def heading_id(report_date: int, region_idx: int) -> str:
+    """
+    Id of a heading unique across reports, e.g. 1865_12 for region 12 of the 1865 report
+    """
+    return f"{report_date}_{region_idx}"
+
+
+class SectionIndex:
+    """
+    Every region of a report classified and attached to the heading that governs it, built once per report
+    Regions before the first heading have no heading, and an empty heading context
+    """
+    __slots__ = ("structures", "heading_idxs", "contexts", "credit_positions")
+
+    def __init__(self, regions: list[TextRegion]):
+        self.structures = [region_structure(region) for region in regions]
+        self.heading_idxs = []
+        self.contexts = {}
+        self.credit_positions = {}
+
+        heading_idx = None
+        credit_position = 0
+        for i, (region, structure) in enumerate(zip(regions, self.structures)):
+            if structure == "heading":
+                heading_idx = i
+                credit_position = 0
+                self.contexts[i] = heading_context(region)
+            elif structure == "credit":
+                self.credit_positions[i] = credit_position
+                credit_position += 1
+            self.heading_idxs.append(heading_idx)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, SectionIndex):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    def kind(self, region_idx: int) -> str:
+        return region_kind(self.structures[region_idx])
+
+    def heading(self, region_idx: int) -> int|None:
+        """
+        Index of the heading governing a region, a heading governs itself
+        """
+        return self.heading_idxs[region_idx]
+
+    def context(self, region_idx: int) -> dict[str, str]:
+        """
+        Heading context of the heading governing a region, empty before the first heading
+        """
+        heading_idx = self.heading_idxs[region_idx]
+        return self.contexts[heading_idx] if heading_idx is not None else {}
+
+    def heading_rows(self, report_date: int) -> list[dict[str, str]]:
+        """
+        One row per heading of the report, its heading_id, the report date and its heading context
+        """
+        return [
+            {"heading_id": heading_id(report_date, idx), "report_date": report_date} | context
+            for idx, context in self.contexts.items()
+        ]
+
+    def follows_heading(self, region_idx: int) -> bool:
+        """
+        Whether a region starts within CREDIT_WINDOW regions of its heading, not counting the heading itself
+        """
+        heading_idx = self.heading_idxs[region_idx]
+        return heading_idx is not None and 0 < region_idx - heading_idx <= CREDIT_WINDOW
+
+    def credit_position(self, region_idx: int) -> int:
+        """
+        How many credits come before this one under the same heading
+        """
+        return self.credit_positions[region_idx]
@@ -0,0 +1,286 @@
+import logging
+import os
+from typing import TYPE_CHECKING
+
+from coleridge.data.frequency import count_occurrences
+from coleridge.data.overlaps import OverlapStats, write_overlaps
+from coleridge.data.parse_xml import de_dupe, extract_entities
+from coleridge.data.sections import heading_id
+from coleridge.data.tag_stats import TagStats
+
+# pandas is only imported by the stages that write DataFrames, so the stats stages start quickly
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Every stage has a version, bumped whenever the results its extract returns change, in content or in form.
+# That includes changes to the code it extracts with, e.g. heading_context, extract_entities or count_occurrences,
+# otherwise the manifest keeps serving results extracted by the old code on --incremental runs
+
+ENTITY_COLUMNS = [
+    "title", "firstname", "lastname", "person", "report_date", "leader", "frequency", "role_title", "role_text", "role_seniority", "role", "seniority", "ethnicity", "ethnicity_text", "heading_survey_area", "heading_survey_party", "heading_places", "heading_place_names", "heading_place_wikidata_ids", "heading_place_countries", "season",
+    "military_branch_text", "organization_text", "organization_wikiData", "dateOfDeath", "medical_label_text", "medical_text", "dateOfDeath", "place_placeName",  "place_text", "place_wikiData",
+]
+# not in single entities: "survey_party", "survey_area"
+
+# Columns of the headings table, written once per heading by EntityTableStage rather than on every entity
+HEADING_COLUMNS = [
+    "heading_id", "report_date", "heading_survey_area", "heading_survey_party", "heading_places", "heading_place_names",
+    "heading_place_wikidata_ids", "heading_place_countries", "season",
+]
+
+ENTITY_TABLE_COLUMNS = ["heading_id"] + [column for column in dict.fromkeys(ENTITY_COLUMNS) if column not in HEADING_COLUMNS]
+
+PLACE_COLUMNS = [
+    "heading_survey_area","heading_survey_party","report_date",
+    "text", "frequency", "text_lb", "placeName", "wikiData", "country", "structure", "continued"
+]
+
+MAP_COLUMNS = [
+    "heading_survey_area","heading_survey_party","report_date", "title", "scale",
+    "text", "text_lb", "frequency", "structure","placeName", "continued"
+]
+
+
+class EntityStage:
+    """
+    Person entities from credit regions immediately following a heading, written to combined_entities.csv
+    """
+    name = "entities"
+    version = 1
+
+    def __init__(self, output_format: str = "csv"):
+        self.output_format = output_format
+
+    def extract(self, report: dict) -> list[dict]:
+        report_date = report["report_date"]
+        regions = report["regions"]
+        entities = []
+
+        sections = report["sections"]
+        for i, region in enumerate(regions):
+            kind = sections.kind(i)
+
+            if kind == "heading":
+                logger.info(f"{report_date} heading {i}")
+                print({"child_idx": i} | region.attrib)
+
+            elif kind == "credit" and sections.follows_heading(i):
+                credit_child = sections.credit_position(i)
+                logger.info(f"{report_date} credit region {i} credit child {credit_child}")
+                print({"child_idx": i, "credit_child": credit_child} | region.attrib)
+
+                heading_attribs = self.heading_attribs(report, i)
+                for line in region.lines:
+                    entities.extend(extract_entities(attribs=line.attributes, heading_attribs=heading_attribs))
+
+            elif kind == "credit":
+                credit_child = sections.credit_position(i)
+                print(f"Skipping credit {credit_child} as not immediately succeeding a heading tag")
+                logger.info(f"{report_date} skipped credit region {i} credit child {credit_child} as not immediately succeeding a heading tag")
+
+        names = [e["lastname"] if "lastname" in e else e["person"] for e in entities]
+        frequencies = count_occurrences(report["text"], names)
+        for e, name in zip(entities, names):
+            e["frequency"] = frequencies[name]
+
+        logger.info(f"{report_date} {len(entities)} entities")
+        return entities
+
+    def heading_attribs(self, report: dict, region_idx: int) -> dict:
+        """
+        Heading fields copied onto each entity of a credit region
+        """
+        return {"report_date": report["report_date"]} | report["sections"].context(region_idx)
+
+    def write(self, results: list[list[dict]], output_dir: str):
+        if self.output_format == "parquet":
+            from coleridge.data.columnar import write_parquet
+            write_parquet([e for entities in results for e in entities], ENTITY_COLUMNS, os.path.join(output_dir, "combined_entities.parquet"))
+            return
+
+        import pandas as pd
+        entity_dfs = [pd.DataFrame(entities) for entities in results if entities]
+
+        combined_entities = pd.concat(entity_dfs)
+        combined_entities_ordered = combined_entities[ENTITY_COLUMNS]
+        missing_cols = combined_entities.columns.difference(combined_entities_ordered.columns)
+
+        if not missing_cols.empty:
+            print(f"{missing_cols} not ordered in output")
+
+        combined_entities_ordered.to_csv(os.path.join(output_dir, "combined_entities.csv"), encoding="utf8")
+        combined_entities_ordered.groupby(by="report_date").count().apply(lambda x: logger.info(f"{int(x.name)} {x['person']} entities"), axis=1)
+
+
+class EntityTableStage(EntityStage):
+    """
+    Person entities as two tables, headings.csv with a row per heading and entities.csv where each entity only carries
+    its heading_id. See coleridge.data.entity_tables.join_headings to get back the combined_entities.csv layout
+    """
+    name = "entity_tables"
+    version = 1
+
+    def extract(self, report: dict) -> dict[str, list[dict]]:
+        return {"headings": report["sections"].heading_rows(report["report_date"]), "entities": super().extract(report)}
+
+    def heading_attribs(self, report: dict, region_idx: int) -> dict:
+        return {"heading_id": heading_id(report["report_date"], report["sections"].heading(region_idx))}
+
+    def write(self, results: list[dict[str, list[dict]]], output_dir: str):
+        headings = [row for tables in results for row in tables["headings"]]
+        entities = [row for tables in results for row in tables["entities"]]
+
+        if self.output_format == "parquet":
+            from coleridge.data.columnar import write_parquet
+            write_parquet(headings, HEADING_COLUMNS, os.path.join(output_dir, "headings.parquet"))
+            write_parquet(entities, ENTITY_TABLE_COLUMNS, os.path.join(output_dir, "entities.parquet"))
+        else:
+            import pandas as pd
+            pd.DataFrame(headings, columns=HEADING_COLUMNS).to_csv(os.path.join(output_dir, "headings.csv"), index=False, encoding="utf8")
+            pd.DataFrame(entities, columns=ENTITY_TABLE_COLUMNS).to_csv(os.path.join(output_dir, "entities.csv"), index=False, encoding="utf8")
+        logger.info(f"{len(headings)} headings, {len(entities)} entities")
+
+
+class TaggedTextStage:
+    """
+    Every tag of one kind in a report with the survey heading it falls under, e.g. places or maps
+    """
+    name = ""
+    version = 1
+    tag = ""
+    columns = []
+    output_file = ""
+
+    def __init__(self, output_format: str = "csv"):
+        self.output_format = output_format
+
+    def extract(self, report: dict) -> list[dict]:
+        report_date = report["report_date"]
+        rows = []
+
+        sections = report["sections"]
+        for i, region in enumerate(report["regions"]):
+            structure = sections.structures[i]
+
+            if structure == "heading":
+                logger.info(f"{report_date} heading {i}")
+                print({"heading_region_idx": i} | region.attrib)
+            context = sections.context(i)
+
+            for j, line in enumerate(region.lines):
+                for k, v in line.attributes.items():
+                    if self.tag in de_dupe(k):
+                        print({f"{self.tag}_idx": j} | region.attrib)
+                        row = dict(v)
+                        row["report_date"] = report_date
+                        row["heading_survey_area"] = context.get("heading_survey_area", "")
+                        row["heading_survey_party"] = context.get("heading_survey_party", "")
+                        row["structure"] = structure
+                        row["text_lb"] = row["text"]
+                        row["text"] = row["text"].replace("\n", " ")
+                        rows.append(row)
+
+        frequencies = count_occurrences(report["text"], [row["text"] for row in rows])
+        for row in rows:
+            row["frequency"] = frequencies[row["text"]]
+
+        return rows
+
+    def rows(self, results: list[list[dict]]) -> list[dict]:
+        return [row for rows in results for row in rows]
+
+    def to_frame(self, results: list[list[dict]]) -> "pd.DataFrame":
+        import pandas as pd
+        return pd.DataFrame([row for rows in results for row in rows])
+
+    def write(self, results: list[list[dict]], output_dir: str):
+        if self.output_format == "parquet":
+            from coleridge.data.columnar import write_parquet
+            write_parquet(self.rows(results), self.columns, os.path.join(output_dir, self.output_file.replace(".csv", ".parquet")))
+            return
+
+        df = self.to_frame(results)
+        df[self.columns].to_csv(os.path.join(output_dir, self.output_file), encoding="utf-8-sig")
+
+
+class PlaceStage(TaggedTextStage):
+    """
+    Place tags, de-duplicated within each survey heading and written to report_places.csv
+    """
+    name = "places"
+    tag = "place"
+    columns = PLACE_COLUMNS
+    output_file = "report_places.csv"
+    unique_columns = ["heading_survey_area", "heading_survey_party", "report_date", "text", "frequency"]
+
+    def rows(self, results: list[list[dict]]) -> list[dict]:
+        unique_rows = {}
+        for row in super().rows(results):
+            unique_rows.setdefault(tuple(row.get(c) for c in self.unique_columns), row)
+        return list(unique_rows.values())
+
+    def to_frame(self, results: list[list[dict]]) -> "pd.DataFrame":
+        places_df = super().to_frame(results)
+        return places_df.drop_duplicates(subset=self.unique_columns).reset_index()
+
+
+class MapStage(TaggedTextStage):
+    """
+    Map tags, written to report_maps.csv
+    """
+    name = "maps"
+    tag = "map"
+    columns = MAP_COLUMNS
+    output_file = "report_maps.csv"
+
+
+class TagStatsStage:
+    """
+    Counts of each tag, and of the attributes used with each tag, across all reports
+    Each report is counted into a TagStats where it's extracted, the reports' stats are merged to write the totals
+    """
+    name = "tag_stats"
+    version = 2  # Results are TagStats rather than each line's tags
+
+    def __init__(self, clean: bool = False, check_tags: bool = True, check_attributes: bool = True):
+        self.clean = clean
+        self.check_tags = check_tags
+        self.check_attributes = check_attributes
+
+    def extract(self, report: dict) -> TagStats:
+        return TagStats.from_lines(line.tags for region in report["regions"] for line in region.lines)
+
+    def write(self, results: list[TagStats], output_dir: str):
+        stats = TagStats.merged(results)
+        suffix = "_clean" if self.clean else ""
+
+        if self.check_tags:
+            tag_counts = stats.tag_counts(clean=self.clean)
+            with open(os.path.join(output_dir, f"tag_counts{suffix}.txt"), "w") as f:
+                f.writelines(f"{tag}: {count}\n" for tag, count in tag_counts)
+            print(f"Tag total: {sum(count for _, count in tag_counts)}")
+
+        if self.check_attributes:
+            attribute_counts = stats.attribute_counts(clean=self.clean)
+            with open(os.path.join(output_dir, f"tag_attribute_counts{suffix}.txt"), "w") as f:
+                f.writelines(f"{tag}: {attr}, {count}\n" for tag, counts in attribute_counts.items() for attr, count in counts)
+            print(f"Tag attribute total: {sum(count for counts in attribute_counts.values() for _, count in counts)}")
+
+
+class OverlapStatsStage:
+    """
+    Counts of the groups of tags found on the same line, written to overlapping_groups.txt, with every overlapping pair in tag_overlaps.csv
+    See coleridge.data.overlaps, which can also read the overlaps without parsing the reports
+    """
+    name = "overlaps"
+    version = 2  # Results are OverlapStats of tag spans rather than each parsed tag's attribute keys
+
+    def extract(self, report: dict) -> OverlapStats:
+        stats = OverlapStats()
+        stats.add_regions(report["report_date"], report["regions"])
+        return stats
+
+    def write(self, results: list[OverlapStats], output_dir: str):
+        write_overlaps(OverlapStats.merged(results), output_dir)
@@ -0,0 +1,182 @@
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import io
+
+from coleridge.data.model import local_name
+from coleridge.data.parse_custom import ParsedCustom, parse_custom_string
+from coleridge.data.prefetch import READ_AHEAD, prefetch
+from coleridge.data.read_xml import iter_text_regions
+
+# Order tags are written in by attribute_counts, tags not listed here follow in the order they're first seen
+TAG_ATTRIBUTES = [
+    "readingOrder", "place", "person", "Role", "ethnicity", "acknowledgement", "survey_area", "member", "map", "medical", "survey_party", "role",
+    "criticism", "organization", "military_branch", "leader", "ethnic_group", "abbrev", "report_number", "date", "unclear", "remuneration",
+    "medical_label", "ethnic_label", "structure"
+]
+
+# Left out of the clean counts, readingOrder tags every line and offset/length/continued are on every tag
+CLEAN_EXCLUDED_TAGS = {"readingOrder"}
+CLEAN_EXCLUDED_ATTRIBUTES = {"offset", "length", "continued"}
+
+
+def sorted_counts(counts: Counter) -> list[tuple[str, int]]:
+    # Most common first, ties stay in the order they were first seen
+    return sorted(counts.items(), key=lambda x: x[1], reverse=True)
+
+
+class TagStats:
+    """
+    Counts of each tag, and of each attribute key used with each tag, collected in one pass over the lines
+    Stats add up, so per-report stats counted in worker processes or kept from an earlier run merge into the corpus totals,
+    both the clean and the raw counts come from the same stats
+    """
+    __slots__ = ("tags", "attributes")
+
+    def __init__(self, tags: Counter = None, attributes: dict[str, Counter] = None):
+        self.tags = tags if tags is not None else Counter()
+        self.attributes = attributes if attributes is not None else {}
+
+    @classmethod
+    def from_lines(cls, lines_tags: list[ParsedCustom]) -> "TagStats":
+        """
+        Count the tags of each line
+
+        Args:
+            lines_tags (list[ParsedCustom]): Tokenized custom string of each line, see TextLine.tags
+
+        Returns:
+            TagStats: The lines' counts
+        """
+        stats = cls()
+        for line_tags in lines_tags:
+            stats.add(line_tags)
+        return stats
+
+    @classmethod
+    def merged(cls, stats: list["TagStats"]) -> "TagStats":
+        """
+        Add up stats, e.g. the stats of each report in report order
+
+        Args:
+            stats (list[TagStats]): Stats to add up
+
+        Returns:
+            TagStats: The totals, counts that tie are in the order they were first seen across stats
+        """
+        total = cls()
+        for s in stats:
+            total.merge(s)
+        return total
+
+    def add(self, line_tags: ParsedCustom):
+        for tag, attrs in line_tags:
+            self.tags[tag] += 1
+            tag_attributes = self.attributes.get(tag)
+            if tag_attributes is None:
+                tag_attributes = self.attributes[tag] = Counter()
+            for key, _ in attrs:
+                tag_attributes[key] += 1
+
+    def merge(self, other: "TagStats") -> "TagStats":
+        """
+        Add another stats' counts to these
+
+        Args:
+            other (TagStats): Stats to add
+
+        Returns:
+            TagStats: self, updated
+        """
+        self.tags.update(other.tags)
+        for tag, attrs in other.attributes.items():
+            self.attributes.setdefault(tag, Counter()).update(attrs)
+        return self
+
+    def __add__(self, other: "TagStats") -> "TagStats":
+        return TagStats.merged([self, other])
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TagStats):
+            return NotImplemented
+        return self.tags == other.tags and self.attributes == other.attributes
+
+    def __repr__(self) -> str:
+        return f"TagStats(tags={sum(self.tags.values())}, distinct={len(self.tags)})"
+
+    def tag_counts(self, clean: bool = False) -> list[tuple[str, int]]:
+        """
+        Count of each tag, most common first
+
+        Args:
+            clean (bool, optional): Leave out readingOrder. Defaults to False.
+
+        Returns:
+            list[tuple[str, int]]: (tag, count) pairs
+        """
+        counts = sorted_counts(self.tags)
+        if clean:
+            return [(tag, count) for tag, count in counts if tag not in CLEAN_EXCLUDED_TAGS]
+        return counts
+
+    def attribute_counts(self, clean: bool = False) -> dict[str, list[tuple[str, int]]]:
+        """
+        Count of each attribute key of each tag, tags in TAG_ATTRIBUTES order and keys most common first
+
+        Args:
+            clean (bool, optional): Leave out readingOrder and the offset/length/continued keys. Defaults to False.
+
+        Returns:
+            dict[str, list[tuple[str, int]]]: (key, count) pairs of each tag
+        """
+        tags = TAG_ATTRIBUTES + [tag for tag in self.attributes if tag not in TAG_ATTRIBUTES]
+        counts = {}
+        for tag in tags:
+            if clean and tag in CLEAN_EXCLUDED_TAGS:
+                continue
+            tag_counts = sorted_counts(self.attributes.get(tag, Counter()))
+            if clean:
+                tag_counts = [(key, count) for key, count in tag_counts if key not in CLEAN_EXCLUDED_ATTRIBUTES]
+            counts[tag] = tag_counts
+        return counts
+
+
+def read_tag_stats(path: str, encoding: str = "utf-8", backend: str = None, data: bytes = None) -> TagStats:
+    """
+    Tag stats of a combined report read straight from its lines' custom strings
+    Only the tags are tokenized, nothing is parsed with parse_attributes and no TextRegions are built, so this is much quicker than load_report
+
+    Args:
+        path (str): Path to a combined report
+        encoding (str, optional): Encoding of the report XML. Defaults to "utf-8".
+        backend (str, optional): XML parser, see coleridge.data.read_xml. Defaults to None, lxml if it is installed.
+        data (bytes, optional): The report's contents if they've already been read, e.g. by coleridge.data.prefetch. Defaults to None, read path.
+
+    Returns:
+        TagStats: The report's counts, the same as TagStatsStage extracts from the parsed report
+    """
+    stats = TagStats()
+    source = path if data is None else io.BytesIO(data)
+    for element in iter_text_regions(source, encoding=encoding, backend=backend):
+        for child in element:
+            if local_name(child.tag) == "TextLine":
+                stats.add(parse_custom_string(child.attrib.get("custom", "")))
+    return stats
+
+
+def count_reports(report_paths: list[str], workers: int = 1, read_ahead: int = READ_AHEAD) -> list[TagStats]:
+    """
+    Tag stats of each report, see read_tag_stats
+
+    Args:
+        report_paths (list[str]): Paths to combined reports
+        workers (int, optional): Number of reports to read in parallel. Defaults to 1.
+        read_ahead (int, optional): Reports read ahead of the one being counted by a single worker, see coleridge.data.prefetch.
+            Defaults to READ_AHEAD.
+
+    Returns:
+        list[TagStats]: Each report's stats in report_paths order
+    """
+    if workers > 1 and len(report_paths) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(report_paths))) as executor:
+            return list(executor.map(read_tag_stats, report_paths))
+    return [read_tag_stats(path, data=data) for path, data in prefetch(report_paths, read_ahead=read_ahead)]
@@ -0,0 +1,159 @@
+from collections import Counter, defaultdict
+from contextlib import nullcontext
+import json
+import os
+import time
+
+# Off by default, timers and counters cost a flag check until enable() is called
+_enabled = False
+_seconds = defaultdict(float)
+_calls = Counter()
+_counters = Counter()
+
+_NULL_TIMER = nullcontext()
+
+
+class _Timer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        _seconds[self.name] += time.perf_counter() - self.start
+        _calls[self.name] += 1
+        return False
+
+
+def enable(reset_metrics: bool = True):
+    """
+    Start collecting timers and counters in this process
+
+    Args:
+        reset_metrics (bool, optional): Clear anything collected before. Defaults to True.
+    """
+    global _enabled
+    _enabled = True
+    if reset_metrics:
+        reset()
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def reset():
+    _seconds.clear()
+    _calls.clear()
+    _counters.clear()
+
+
+def timer(name: str):
+    """
+    Context manager adding the wall clock time of its block to the named timer
+
+    Args:
+        name (str): Timer name, e.g. xml_load
+
+    Returns:
+        A context manager, a shared no-op one when metrics are disabled
+    """
+    return _Timer(name) if _enabled else _NULL_TIMER
+
+
+def timed_iter(iterable, name: str):
+    """
+    Yield from an iterable, adding the time spent producing each item to the named timer
+    Useful for streaming parsers, where the work happens in next() rather than in one block
+
+    Args:
+        iterable (Iterable): Items to yield
+        name (str): Timer name, e.g. xml_load
+
+    Yields:
+        The items of iterable
+    """
+    if not _enabled:
+        yield from iterable
+        return
+
+    iterator = iter(iterable)
+    while True:
+        with _Timer(name):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+
+def count(name: str, n: int = 1):
+    """
+    Add n to the named counter
+
+    Args:
+        name (str): Counter name, e.g. lines_parsed
+        n (int, optional): Amount to add. Defaults to 1.
+    """
+    if _enabled:
+        _counters[name] += n
+
+
+def snapshot() -> dict:
+    """
+    Everything collected so far
+
+    Returns:
+        dict: timers, with the seconds and calls of each, and counters
+    """
+    return {
+        "timers": {name: {"seconds": _seconds[name], "calls": _calls[name]} for name in sorted(_seconds)},
+        "counters": dict(sorted(_counters.items())),
+    }
+
+
+def merge(summaries: list[dict]) -> dict:
+    """
+    Add up snapshots, e.g. from each report of a run
+
+    Args:
+        summaries (list[dict]): Snapshots to combine
+
+    Returns:
+        dict: A snapshot with the totals of every timer and counter
+    """
+    seconds = defaultdict(float)
+    calls = Counter()
+    counters = Counter()
+    for summary in summaries:
+        for name, t in summary["timers"].items():
+            seconds[name] += t["seconds"]
+            calls[name] += t["calls"]
+        counters.update(summary["counters"])
+
+    return {
+        "timers": {name: {"seconds": seconds[name], "calls": calls[name]} for name in sorted(seconds)},
+        "counters": dict(sorted(counters.items())),
+    }
+
+
+def write_summary(summary: dict, path: str):
+    """
+    Write a snapshot, or merged snapshots, to a JSON file
+
+    Args:
+        summary (dict): Metrics to write, plus anything else describing them
+        path (str): JSON file to write
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(summary, f, indent=2)
@@ -0,0 +1,144 @@
+import os
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+# Persons are linked by being credited in the same survey party and area in the same report
+GROUP_COLUMNS = ["report_date", "heading_survey_party", "heading_survey_area"]
+
+
+def incidence_matrix(entities: pd.DataFrame, person_column: str = "person", group_columns: list[str] = None) -> tuple[sp.csr_matrix, pd.Index, pd.MultiIndex]:
+    """
+    Sparse person x group matrix with a 1 where a person is credited in a group
+    Entities missing the person or any group column are left out
+
+    Args:
+        entities (pd.DataFrame): Entities, e.g. combined_entities.csv
+        person_column (str, optional): Column identifying a person, e.g. unique_id after coleridge.network.dedupe. Defaults to "person".
+        group_columns (list[str], optional): Columns that together identify a group. Defaults to GROUP_COLUMNS.
+
+    Returns:
+        tuple[sp.csr_matrix, pd.Index, pd.MultiIndex]: The incidence matrix, the person of each row and the group of each column
+    """
+    group_columns = GROUP_COLUMNS if group_columns is None else group_columns
+    entities = entities.dropna(subset=[person_column] + group_columns)
+
+    person_codes, persons = pd.factorize(entities[person_column])
+    group_codes, groups = pd.factorize(pd.MultiIndex.from_frame(entities[group_columns]))
+
+    incidence = sp.csr_matrix(
+        (np.ones(len(entities), dtype=np.int64), (person_codes, group_codes)),
+        shape=(len(persons), len(groups)),
+    )
+    incidence.data[:] = 1  # A person credited twice in a group is still one membership
+    return incidence, pd.Index(persons, name=person_column), groups
+
+
+def shared_groups(incidence: sp.csr_matrix, persons: pd.Index) -> pd.DataFrame:
+    """
+    Edges between the persons of an incidence matrix, weighted by the number of groups they share
+    The incidence matrix times its transpose counts every shared group at once, the work grows with the group sizes
+    rather than with every pair of entities
+
+    Args:
+        incidence (sp.csr_matrix): Person x group matrix from incidence_matrix
+        persons (pd.Index): The person of each row
+
+    Returns:
+        pd.DataFrame: source, target and weight of each edge, each pair once in order of the persons' first entities
+    """
+    shared = sp.triu(incidence @ incidence.T, k=1).tocoo()
+    order = np.lexsort((shared.col, shared.row))
+    return pd.DataFrame({
+        "source": persons[shared.row[order]].tolist(),
+        "target": persons[shared.col[order]].tolist(),
+        "weight": shared.data[order].tolist(),
+    })
+
+
+def cooccurrence_edges(entities: pd.DataFrame, person_column: str = "person", group_columns: list[str] = None) -> pd.DataFrame:
+    """
+    Person to person co-occurrence edges, see shared_groups
+
+    Args:
+        entities (pd.DataFrame): Entities, e.g. combined_entities.csv
+        person_column (str, optional): Column identifying a person. Defaults to "person".
+        group_columns (list[str], optional): Columns that together identify a group. Defaults to GROUP_COLUMNS.
+
+    Returns:
+        pd.DataFrame: source, target and weight of each edge
+    """
+    incidence, persons, _ = incidence_matrix(entities, person_column=person_column, group_columns=group_columns)
+    return shared_groups(incidence, persons)
+
+
+def build_graph(persons: pd.Index, edges: pd.DataFrame, entities: pd.DataFrame = None, node_columns: list[str] = None) -> nx.Graph:
+    """
+    Graph of persons and their co-occurrence edges, persons who share no group are kept as isolated nodes
+
+    Args:
+        persons (pd.Index): Persons from incidence_matrix, named after the person column
+        edges (pd.DataFrame): Edges from shared_groups
+        entities (pd.DataFrame, optional): Entities to take node_columns from. Defaults to None.
+        node_columns (list[str], optional): Columns copied onto each node from the person's first entity, e.g. ethnicity. Defaults to None.
+
+    Returns:
+        nx.Graph: Persons as nodes with weighted edges
+    """
+    graph = nx.Graph()
+    if node_columns:
+        # GraphML has no missing values, so they are written as empty strings
+        first_entities = entities.drop_duplicates(subset=persons.name).set_index(persons.name)[node_columns].fillna("")
+        graph.add_nodes_from(zip(persons.tolist(), first_entities.loc[persons].to_dict(orient="records")))
+    else:
+        graph.add_nodes_from(persons.tolist())
+    graph.add_weighted_edges_from(edges.itertuples(index=False, name=None))
+    return graph
+
+
+def cooccurrence_graph(entities: pd.DataFrame, person_column: str = "person", group_columns: list[str] = None, node_columns: list[str] = None) -> nx.Graph:
+    """
+    Person co-occurrence graph, see build_graph
+
+    Args:
+        entities (pd.DataFrame): Entities, e.g. combined_entities.csv
+        person_column (str, optional): Column identifying a person. Defaults to "person".
+        group_columns (list[str], optional): Columns that together identify a group. Defaults to GROUP_COLUMNS.
+        node_columns (list[str], optional): Columns copied onto each node from the person's first entity. Defaults to None.
+
+    Returns:
+        nx.Graph: Persons as nodes with weighted edges
+    """
+    incidence, persons, _ = incidence_matrix(entities, person_column=person_column, group_columns=group_columns)
+    return build_graph(persons, shared_groups(incidence, persons), entities=entities, node_columns=node_columns)
+
+
+def write_network(
+        entities: pd.DataFrame,
+        output_dir: str,
+        person_column: str = "person",
+        group_columns: list[str] = None,
+        node_columns: list[str] = None
+) -> nx.Graph:
+    """
+    Write the co-occurrence edge list to cooccurrence_edges.csv and the graph to cooccurrence.graphml
+
+    Args:
+        entities (pd.DataFrame): Entities, e.g. combined_entities.csv
+        output_dir (str): Directory to write to
+        person_column (str, optional): Column identifying a person. Defaults to "person".
+        group_columns (list[str], optional): Columns that together identify a group. Defaults to GROUP_COLUMNS.
+        node_columns (list[str], optional): Columns copied onto each node, see build_graph. Defaults to None.
+
+    Returns:
+        nx.Graph: The graph written
+    """
+    incidence, persons, _ = incidence_matrix(entities, person_column=person_column, group_columns=group_columns)
+    edges = shared_groups(incidence, persons)
+    graph = build_graph(persons, edges, entities=entities, node_columns=node_columns)
+
+    edges.to_csv(os.path.join(output_dir, "cooccurrence_edges.csv"), index=False, encoding="utf-8-sig")
+    nx.write_graphml(graph, os.path.join(output_dir, "cooccurrence.graphml"))
+    return graph
@@ -0,0 +1,171 @@
+import numpy as np
+import pandas as pd
+from rapidfuzz import fuzz, process, utils
+
+# Native surveyor names vary more in spelling between reports, so they match at a lower score
+NATIVE_THRESHOLD = 80
+THRESHOLD = 90
+
+# Names scoring at least this with a later name are candidates, only candidates start a group
+CANDIDATE_CUTOFF = 75
+SCORERS = (fuzz.token_set_ratio, fuzz.ratio)
+
+# Rows of a block scored per cdist call, bounds the score matrix held in memory
+CHUNK_SIZE = 1000
+
+
+def name_threshold(ethnicity: str) -> int:
+    """
+    Score a name must beat to match another, lower for Native names
+
+    Args:
+        ethnicity (str): Ethnicity of the name's first entity
+
+    Returns:
+        int: The match threshold
+    """
+    return NATIVE_THRESHOLD if ethnicity == "Native" else THRESHOLD
+
+
+def token_initials(name: str) -> set[str]:
+    """
+    Blocking keys of a processed name, the first letter of each word
+    Names that share no initial, e.g. J. Harper and Mr. Kitchen, are never scored against each other
+    Much faster on large tables, but misses matches where every word's first letter differs, e.g. an OCR error in a lone lastname
+
+    Args:
+        name (str): A name processed with rapidfuzz.utils.default_process
+
+    Returns:
+        set[str]: The name's blocks
+    """
+    return {token[0] for token in name.split()}
+
+
+def candidate_blocks(processed_names: list[str], block_key=None) -> list[list[int]]:
+    """
+    Group names by blocking key, a name is in one block per key
+
+    Args:
+        processed_names (list[str]): Names processed with rapidfuzz.utils.default_process
+        block_key (callable, optional): Name to its keys, e.g. token_initials. Defaults to None, every name in one block.
+
+    Returns:
+        list[list[int]]: Ascending name indexes of each block
+    """
+    if block_key is None:
+        return [list(range(len(processed_names)))]
+
+    blocks = {}
+    for i, name in enumerate(processed_names):
+        for key in block_key(name):
+            blocks.setdefault(key, []).append(i)
+    return [blocks[key] for key in sorted(blocks)]
+
+
+def candidate_matches(names: list[str], block_key=None, workers: int = -1) -> list[dict[int, float]]:
+    """
+    Score each name against every later name in its blocks with token_set_ratio and ratio, keeping the higher score
+    Scores are batched with rapidfuzz.process.cdist, which runs across workers cores
+
+    Args:
+        names (list[str]): Unique names in order
+        block_key (callable, optional): See candidate_blocks. Defaults to None, every pair of names is scored.
+        workers (int, optional): Cores for cdist, -1 uses all of them. Defaults to -1.
+
+    Returns:
+        list[dict[int, float]]: For each name, the indexes of later names scoring at least CANDIDATE_CUTOFF and their scores
+    """
+    processed = [utils.default_process(name) for name in names]
+    forward = [{} for _ in names]
+    for block in candidate_blocks(processed, block_key=block_key):
+        if len(block) < 2:
+            continue
+
+        block_names = [processed[i] for i in block]
+        for start in range(0, len(block), CHUNK_SIZE):
+            # Only later names are scored, so each chunk is compared to the rest of the block from its own start
+            queries = block_names[start:start + CHUNK_SIZE]
+            choices = block_names[start:]
+            scores = np.maximum.reduce([
+                process.cdist(queries, choices, scorer=scorer, score_cutoff=CANDIDATE_CUTOFF, dtype=np.float64, workers=workers)
+                for scorer in SCORERS
+            ])
+            rows, cols = np.nonzero(np.triu(scores >= CANDIDATE_CUTOFF, k=1))
+            for row, col in zip(rows.tolist(), cols.tolist()):
+                forward[block[start + row]][block[start + col]] = float(scores[row, col])
+
+    return forward
+
+
+def name_group(seed: int, forward: list[dict[int, float]], threshold: int) -> list[int]:
+    """
+    Every name reachable from seed through later names scoring above threshold
+
+    Args:
+        seed (int): Index of the name starting the group
+        forward (list[dict[int, float]]): Candidate matches from candidate_matches
+        threshold (int): Score a match must beat, the seed's name_threshold
+
+    Returns:
+        list[int]: Indexes of the names in the group, including seed
+    """
+    group = [seed]
+    seen = {seed}
+    for i in group:
+        for j, score in forward[i].items():
+            if score > threshold and j not in seen:
+                seen.add(j)
+                group.append(j)
+    return group
+
+
+def match_names(names: list[str], ethnicities: list[str], block_key=None, workers: int = -1) -> list[list[str]]:
+    """
+    Group names referring to the same person
+    Each name with candidates, in order, starts a group of the names it reaches at its own threshold that aren't already grouped,
+    names left over are groups of their own
+
+    Args:
+        names (list[str]): Unique names in order
+        ethnicities (list[str]): Ethnicity of each name
+        block_key (callable, optional): See candidate_blocks. Defaults to None, every pair of names is scored.
+        workers (int, optional): Cores for cdist, -1 uses all of them. Defaults to -1.
+
+    Returns:
+        list[list[str]]: Sorted names of each group, a group's position is its unique id
+    """
+    forward = candidate_matches(names, block_key=block_key, workers=workers)
+    matched = set()
+    groups = []
+    for i, ethnicity in enumerate(ethnicities):
+        if i in matched or not forward[i]:
+            continue
+        group = [j for j in name_group(i, forward, name_threshold(ethnicity)) if j not in matched]
+        matched.update(group)
+        groups.append(sorted(names[j] for j in group))
+
+    groups.extend([name] for i, name in enumerate(names) if i not in matched)
+    return groups
+
+
+def dedupe_entities(entities: pd.DataFrame, name_column: str = "fullname", block_key=None, workers: int = -1) -> pd.Series:
+    """
+    Give every entity the unique id of the person its name matches
+    A name's threshold is set by the ethnicity of its first entity, entities without a name get no id
+
+    Args:
+        entities (pd.DataFrame): Entities with name_column and ethnicity columns, e.g. combined_entities.csv with a fullname added
+        name_column (str, optional): Column of names to match. Defaults to "fullname".
+        block_key (callable, optional): See candidate_blocks. Defaults to None, every pair of names is scored.
+        workers (int, optional): Cores for cdist, -1 uses all of them. Defaults to -1.
+
+    Returns:
+        pd.Series: Unique id of each entity, aligned to entities
+    """
+    first_entities = entities.dropna(subset=name_column).drop_duplicates(subset=name_column)
+    groups = match_names(
+        first_entities[name_column].tolist(), first_entities["ethnicity"].tolist(), block_key=block_key, workers=workers
+    )
+    unique_ids = {name: unique_id for unique_id, group in enumerate(groups) for name in group}
+    return entities[name_column].map(unique_ids).astype("Int64").rename("unique_id")
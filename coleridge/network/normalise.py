@@ -0,0 +1,170 @@
+import pandas as pd
+
+# Rules are str method names and their arguments, applied in order, e.g. ("replace", "HYDRABAD", "HYDERABAD")
+PERSON_RULES = [
+    ("replace", "\xa0", " "),
+    ("replace", "\n", " "),
+    ("strip", "."), ("strip", " "),
+    ("strip", "("), ("strip", ")"),
+]
+
+SURVEY_AREA_RULES = [
+    ("upper",), ("strip", "."), ("strip", "'"),
+    ("replace", "  ", " "),
+    ("replace", "THE ", ""),
+    ("replace", " SURVEY", ""),
+    ("replace", ", DIVISION", ""),
+    ("replace", " DIVISION", ""),
+    ("replace", "HYDRABAD", "HYDERABAD"),
+    ("replace", "CENTRAL PROVINCES AND VIZAGAPATAM, AGENCY", "CENTRAL PROVINCES AND VIZAGAPATAM AGENCY"),
+    ("replace", "CENTRAL PROVINCES AND VIZAGAPATAM\nAGENCY", "CENTRAL PROVINCES AND VIZAGAPATAM AGENCY"),
+    ("replace", "COSSYAH AND GARROW HILLS", "KHASIA AND GARO HILLS"),
+    ("replace", "KOSSIA AND GARROW HILLS", "KHASIA AND GARO HILLS"),
+    ("replace", "KHASIA AND GARROW HILLS", "KHASIA AND GARO HILLS"),
+    ("replace", "BUNDELCUND", "BUNDELKUND"),
+    ("replace", "REWAH AND BUNDELKUND", "REWAH, BUNDELKUND"),
+    ("replace", "REWAH TERRITORY", "REWAH"),
+    ("replace", "CENTRAL PROVINCES AND VIZAGAPATAM AGENCY", "CENTRAL PROVINCES, VIZAGAPATAM AGENCY"),
+    ("replace", "CENTRAL PROVINCES, LATE HYDERABAD", "CENTRAL PROVINCES, HYDERABAD"),
+    ("replace", "PROVINES", "PROVINCES"),
+    ("replace", ", AND", ","),
+    ("strip",), ("strip", "'"),
+]
+
+SURVEY_PARTY_RULES = [
+    ("upper",), ("strip", "."), ("strip", ","),
+    ("replace", " SURVEY", ""),
+    ("replace", " PARTY", ""),
+    # Longer numerals before their prefixes, so NO. VII isn't read as NO. V
+    ("replace", "NO. III", "3"),
+    ("replace", "NO. IV", "4"),
+    ("replace", "NO. VII", "7"),
+    ("replace", "NO. VI", "6"),
+    ("replace", "NO. V", "5"),
+    ("replace", "NO. I", "1"),
+    ("replace", "NO. ", ""),
+    ("replace", "TOPOGRAPHICAL", ""),
+    ("replace", "TOPOGRAPHIICAL", ""),
+    ("replace", ".—", ""),
+    ("replace", "THE ", ""),
+    ("replace", "PEGU", "8"),
+    ("replace", ", ", ""),
+    ("strip",),
+]
+
+COLUMN_RULES = {
+    "person": PERSON_RULES,
+    "heading_survey_area": SURVEY_AREA_RULES,
+    "heading_survey_party": SURVEY_PARTY_RULES,
+}
+
+# Prefix of the corrected columns of a corrections table, see apply_corrections
+SET_PREFIX = "set_"
+
+# Multi-area headings, e.g. REWAH, BUNDELKUND, are split into a row per area
+AREA_SEPARATOR = ", "
+
+
+def apply_rules(value: str, rules: list[tuple]) -> str:
+    """
+    Apply normalisation rules to one value
+
+    Args:
+        value (str): Value to normalise
+        rules (list[tuple]): str method names and their arguments, e.g. SURVEY_AREA_RULES
+
+    Returns:
+        str: The normalised value
+    """
+    for method, *args in rules:
+        value = getattr(str, method)(value, *args)
+    return value
+
+
+def normalise_column(values: pd.Series, rules: list[tuple]) -> pd.Series:
+    """
+    Apply normalisation rules once to each unique value of a column rather than to every row
+    Missing values are kept as they are
+
+    Args:
+        values (pd.Series): Column to normalise
+        rules (list[tuple]): Rules to apply, see apply_rules
+
+    Returns:
+        pd.Series: The normalised column
+    """
+    return values.map({value: apply_rules(value, rules) for value in values.dropna().unique()})
+
+
+def apply_corrections(entities: pd.DataFrame, corrections: pd.DataFrame) -> pd.DataFrame:
+    """
+    Correct entities from a lookup table with one merge
+    Columns prefixed with set_ hold corrected values, every other column is a key matched against entities, a missing key only matches
+    a missing value. Where a correction isn't missing it overwrites the entity's value, keys can be corrected too
+
+    e.g. a table with title, set_title and set_lastname columns and a row Harper, Mr, Harper moves a lastname tagged as a title
+
+    Args:
+        entities (pd.DataFrame): Entities to correct
+        corrections (pd.DataFrame): Lookup table of keys and set_ columns, at most one row per key
+
+    Returns:
+        pd.DataFrame: Corrected copy of entities
+    """
+    on = [column for column in corrections.columns if not column.startswith(SET_PREFIX)]
+    matched = entities[on].merge(corrections, on=on, how="left", validate="many_to_one")
+    matched.index = entities.index
+
+    entities = entities.copy()
+    for set_column in corrections.columns.difference(on, sort=False):
+        column = set_column.removeprefix(SET_PREFIX)
+        correction = matched[set_column]
+        if column in entities:
+            entities[column] = correction.where(correction.notna(), entities[column])
+        else:
+            entities[column] = correction
+    return entities
+
+
+def split_areas(entities: pd.DataFrame, column: str = "heading_survey_area", sep: str = AREA_SEPARATOR) -> pd.DataFrame:
+    """
+    Split entities under a multi-area heading into a row per area, keeping their index
+
+    Args:
+        entities (pd.DataFrame): Entities with normalised areas
+        column (str, optional): Column of areas. Defaults to "heading_survey_area".
+        sep (str, optional): Separator between areas. Defaults to AREA_SEPARATOR.
+
+    Returns:
+        pd.DataFrame: Entities with one area each
+    """
+    areas = entities[column].map({value: value.split(sep) for value in entities[column].dropna().unique()})
+    return entities.assign(**{column: areas}).explode(column)
+
+
+def normalise_entities(
+        entities: pd.DataFrame,
+        corrections: list[pd.DataFrame] = (),
+        column_rules: dict[str, list[tuple]] = None,
+        split: bool = True
+) -> pd.DataFrame:
+    """
+    Apply corrections, then the normalisation rules of each column, then split multi-area rows
+
+    Args:
+        entities (pd.DataFrame): Entities, e.g. combined_entities.csv
+        corrections (list[pd.DataFrame], optional): Lookup tables applied in order, see apply_corrections. Defaults to ().
+        column_rules (dict[str, list[tuple]], optional): Rules for each column. Defaults to None, COLUMN_RULES.
+        split (bool, optional): Split multi-area rows, see split_areas. Defaults to True.
+
+    Returns:
+        pd.DataFrame: Normalised copy of entities
+    """
+    for table in corrections:
+        entities = apply_corrections(entities, table)
+
+    entities = entities.copy()
+    for column, rules in (COLUMN_RULES if column_rules is None else column_rules).items():
+        entities[column] = normalise_column(entities[column], rules)
+
+    return split_areas(entities) if split else entities
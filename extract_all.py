@@ -0,0 +1,6 @@
+import sys
+
+from coleridge.cli import main
+
+if __name__ == "__main__":
+    main(["all"] + sys.argv[1:])
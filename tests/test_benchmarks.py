@@ -0,0 +1,30 @@
+import pytest
+
+pytest.importorskip("pandas")
+
+from benchmarks.compare import compare_results
+from benchmarks.synthetic import generate_corpus, generate_report
+from coleridge.data.pipeline import run_pipeline
+from coleridge.data.read_xml import iter_text_regions
+from coleridge.data.stages import EntityStage, MapStage, PlaceStage
+
+
+def test_generate_report(tmp_path):
+    counts = generate_report(str(tmp_path / "a.xml"), seed=3, pages=2)
+    generate_report(str(tmp_path / "b.xml"), seed=3, pages=2)
+    assert (tmp_path / "a.xml").read_bytes() == (tmp_path / "b.xml").read_bytes()
+    assert counts["regions"] == len(list(iter_text_regions(str(tmp_path / "a.xml"))))
+
+
+def test_corpus_fills_every_column(tmp_path):
+    report_paths = generate_corpus(str(tmp_path), [1865], pages=1)
+    run_pipeline(report_paths, stages=[EntityStage(), PlaceStage(), MapStage()], output_dir=str(tmp_path))
+    assert all((tmp_path / f).exists() for f in ["combined_entities.csv", "report_places.csv", "report_maps.csv"])
+
+
+def test_compare_results():
+    scale = {"pages": 10, "reports": 1}
+    baseline = {"results": [{"name": "parse_region", "scale": scale, "seconds": 1.0}, {"name": "old", "scale": scale, "seconds": 1.0}]}
+    current = {"results": [{"name": "parse_region", "scale": scale, "seconds": 1.5}, {"name": "new", "scale": scale, "seconds": 1.0}]}
+    comparisons = compare_results(baseline, current, threshold=1.25)
+    assert [(c["name"], c["ratio"], c["regression"]) for c in comparisons] == [("parse_region", 1.5, True)]
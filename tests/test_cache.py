@@ -0,0 +1,82 @@
+import os
+import pickle
+import shutil
+
+from coleridge.data.cache import PARSER_VERSION, cache_path, file_hash, load_cached_report
+from coleridge.data import pipeline
+from coleridge.data.pipeline import load_report, parse_report
+
+
+def test_cache_path_changes_with_contents(tmp_path):
+    report = tmp_path / "1865_combined_pages.xml"
+    shutil.copy("tests/test_extract_entities.xml", report)
+    before = cache_path(str(report), str(tmp_path))
+    assert before.endswith(f"{file_hash(str(report))}_v{PARSER_VERSION}.pickle")
+
+    assert cache_path(str(report), str(tmp_path), data=report.read_bytes()) == before  # Prefetched contents hash the same
+
+    with open(report, "a") as f:
+        f.write("\n")
+    assert cache_path(str(report), str(tmp_path)) != before
+
+
+def test_load_cached_report(tmp_path):
+    report_path = str(tmp_path / "1865_combined_pages.xml")
+    shutil.copy("tests/test_extract_entities.xml", report_path)
+    cache_dir = str(tmp_path / "cache")
+
+    loads = []
+    def load(path):
+        loads.append(path)
+        return parse_report(path)
+
+    parsed = load_cached_report(report_path, cache_dir, load)
+    assert os.path.exists(cache_path(report_path, cache_dir))
+    assert load_cached_report(report_path, cache_dir, load) == parsed
+    assert loads == [report_path]
+
+
+def test_unreadable_cache(tmp_path):
+    report_path = str(tmp_path / "1865_combined_pages.xml")
+    shutil.copy("tests/test_extract_entities.xml", report_path)
+    cache_dir = str(tmp_path / "cache")
+    os.makedirs(cache_dir)
+    with open(cache_path(report_path, cache_dir), "wb") as f:
+        f.write(b"")
+
+    assert load_cached_report(report_path, cache_dir, load_report) == load_report(report_path)
+
+
+def test_cached_report_keeps_own_date(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    report_paths = []
+    for report_date in [1865, 1866]:
+        report_paths.append(str(tmp_path / f"{report_date}_combined_pages.xml"))
+        shutil.copy("tests/test_extract_entities.xml", report_paths[-1])
+
+    reports = [load_cached_report(path, cache_dir, load_report) for path in report_paths]
+    assert len(os.listdir(cache_dir)) == 1  # Same contents, one cache file
+    assert [report["report_date"] for report in reports] == [1865, 1866]
+    assert [report["path"] for report in reports] == report_paths
+
+
+def test_sections_rebuilt_on_load(tmp_path, monkeypatch):
+    report_path = str(tmp_path / "1865_combined_pages.xml")
+    shutil.copy("tests/test_extract_entities.xml", report_path)
+    cache_dir = str(tmp_path / "cache")
+
+    class SectionsStage:
+        name = "sections"
+        version = 1
+
+        def extract(self, report):
+            return report["sections"]
+
+    _, [sections], _ = pipeline.extract_report(report_path, [SectionsStage()], cache_dir=cache_dir)
+    assert sections == load_report(report_path)["sections"]
+    with open(cache_path(report_path, cache_dir), "rb") as f:
+        assert "sections" not in pickle.load(f)
+
+    # A change to coleridge.data.sections reaches reports loaded from the cache
+    monkeypatch.setattr(pipeline, "SectionIndex", lambda regions: "rebuilt")
+    assert pipeline.extract_report(report_path, [SectionsStage()], cache_dir=cache_dir)[1] == ["rebuilt"]
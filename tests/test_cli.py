@@ -0,0 +1,67 @@
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from coleridge.cli import build_parser, build_stages, main
+from coleridge.data.stages import EntityStage, OverlapStatsStage
+
+
+@pytest.fixture
+def interim_dir(tmp_path):
+    interim_dir = tmp_path / "interim"
+    interim_dir.mkdir()
+    shutil.copy("tests/test_extract_entities.xml", interim_dir / "1865_combined_pages.xml")
+    return interim_dir
+
+
+def test_build_stages():
+    parser = build_parser()
+
+    stages = build_stages(parser.parse_args(["all", "--format", "parquet"]))
+    assert [stage.name for stage in stages] == ["entities", "places", "maps", "tag_stats", "overlaps"]
+    assert isinstance(stages[0], EntityStage) and stages[0].output_format == "parquet"
+
+    assert isinstance(stages[-1], OverlapStatsStage)
+
+    stages = build_stages(parser.parse_args(["entities", "--normalized"]))
+    assert [stage.name for stage in stages] == ["entity_tables"]
+
+
+def test_combine_arguments():
+    args = build_parser().parse_args(["combine", "1871", "--workers", "2", "--no-indent"])
+    assert args.report_dates == [1871]
+    assert args.workers == 2 and args.no_indent and not args.incremental
+
+
+def test_unknown_command():
+    with pytest.raises(SystemExit):
+        main(["unknown"])
+
+
+def test_stats_commands(interim_dir, tmp_path, monkeypatch):
+    from coleridge.data import pipeline
+    monkeypatch.setattr(pipeline, "load_report", lambda *args, **kwargs: pytest.fail("stats commands only tokenize the tags"))
+    monkeypatch.setattr(pipeline, "parse_report", lambda *args, **kwargs: pytest.fail("stats commands only tokenize the tags"))
+
+    output_dir = tmp_path / "processed"
+    output_dir.mkdir()
+    common = ["--interim-dir", str(interim_dir), "--output-dir", str(output_dir)]
+
+    main(["tag-stats", "--no-attributes"] + common)
+    main(["overlaps"] + common)
+    assert sorted(os.listdir(output_dir)) == ["overlapping_groups.txt", "tag_counts.txt", "tag_overlaps.csv"]
+
+
+def test_tag_stats_skips_heavy_imports(interim_dir, tmp_path):
+    code = (
+        "import sys\n"
+        "from coleridge.cli import main\n"
+        f"main(['tag-stats', '--interim-dir', {str(interim_dir)!r}, '--output-dir', {str(tmp_path)!r}])\n"
+        "print(sorted({'pandas', 'pyarrow'} & set(sys.modules)))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=os.getcwd())
+    assert result.stdout.splitlines()[-1] == "[]"
+    assert os.path.exists(tmp_path / "tag_counts.txt")
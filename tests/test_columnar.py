@@ -0,0 +1,49 @@
+import shutil
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from coleridge.data.columnar import ColumnBuilder, schema_for, write_parquet
+from coleridge.data.pipeline import load_report
+from coleridge.data.stages import ENTITY_COLUMNS, PLACE_COLUMNS, EntityStage, PlaceStage
+
+
+def test_schema_for():
+    schema = schema_for(ENTITY_COLUMNS)
+    assert schema.names.count("dateOfDeath") == 1
+    assert schema.field("report_date").type == pa.int32()
+    assert schema.field("leader").type == pa.bool_()
+    assert pa.types.is_dictionary(schema.field("heading_survey_area").type)
+    assert schema.field("person").type == pa.string()
+
+
+def test_column_builder():
+    builder = ColumnBuilder(schema_for(["person", "report_date", "season"]))
+    builder.extend([{"person": "A. Smith", "report_date": 1865, "season": "1862-63"}, {"person": "B. Jones", "extra": "dropped"}])
+    table = builder.to_table()
+    assert len(builder) == 2
+    assert table.to_pydict() == {"person": ["A. Smith", "B. Jones"], "report_date": [1865, None], "season": ["1862-63", None]}
+
+
+def test_stage_parquet(tmp_path):
+    report_path = tmp_path / "1865_combined_pages.xml"
+    shutil.copy("tests/test_extract_entities.xml", report_path)
+    report = load_report(str(report_path))
+
+    entities = EntityStage(output_format="parquet")
+    entities.write([entities.extract(report)], str(tmp_path))
+    table = pq.read_table(tmp_path / "combined_entities.parquet")
+    assert table.column("person").to_pylist()[:2] == ["James Mulheran, Esquire", "Mr. Andrew Chamarett"]
+    assert table.column("leader").to_pylist()[0] is True
+
+    places = PlaceStage(output_format="parquet")
+    place_rows = places.extract(report)
+    places.write([place_rows, place_rows], str(tmp_path))
+    assert pq.read_table(tmp_path / "report_places.parquet").num_rows == len(place_rows)
+
+
+def test_write_parquet(tmp_path):
+    table = write_parquet([{"text": "HYDRABAD", "frequency": 2}], PLACE_COLUMNS, str(tmp_path / "places" / "report_places.parquet"))
+    assert pq.read_table(tmp_path / "places" / "report_places.parquet").equals(table)
@@ -0,0 +1,57 @@
+import copy
+import os
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from coleridge.data.combine import combine_pages, combine_report, ordered_page_paths
+from coleridge.data.read_xml import iter_text_regions
+
+
+@pytest.fixture
+def raw_dir(tmp_path):
+    root = ET.parse("tests/test_extract_entities.xml").getroot()
+    page_dir = tmp_path / "raw" / "1865 Exported Files" / "XML" / "doc" / "page"
+    page_dir.mkdir(parents=True)
+    for n in [1, 2, 10]:
+        page = ET.Element(root.tag, root.attrib)
+        page.extend(copy.deepcopy(list(root)))
+        ET.ElementTree(page).write(page_dir / f"{n:04d}_p{n:03d}.xml", encoding="UTF-8")
+    (page_dir / "0003_Table.xml").write_text("")
+    return str(tmp_path / "raw")
+
+
+def append_combine(page_paths):
+    trees = [ET.parse(p) for p in page_paths]
+    for tree in trees[1:]:
+        for child in tree.getroot():
+            trees[0].getroot().append(child)
+    return trees[0]
+
+
+def test_ordered_page_paths(raw_dir):
+    assert [os.path.basename(p) for p in ordered_page_paths(1865, raw_dir=raw_dir)] == ["0001_p001.xml", "0002_p002.xml", "0010_p010.xml"]
+
+
+@pytest.mark.parametrize("pretty", [True, False])
+def test_matches_appended_tree(raw_dir, tmp_path, pretty):
+    page_paths = ordered_page_paths(1865, raw_dir=raw_dir)
+    expected = append_combine(page_paths)
+    if pretty:
+        ET.indent(expected, space="    ")
+    expected.write(tmp_path / "expected.xml", encoding="UTF-8")
+
+    combine_pages(page_paths, str(tmp_path / "combined.xml"), pretty=pretty)
+    assert (tmp_path / "combined.xml").read_bytes() == (tmp_path / "expected.xml").read_bytes()
+
+
+def test_combine_report(raw_dir, tmp_path):
+    combined = combine_report(1865, raw_dir=raw_dir, interim_dir=str(tmp_path))
+    assert os.path.basename(combined) == "1865_combined_pages.xml"
+    regions = list(iter_text_regions(combined))
+    assert len(regions) == 3 * len(list(iter_text_regions("tests/test_extract_entities.xml")))
+
+
+def test_no_pages(tmp_path):
+    with pytest.raises(ValueError):
+        combine_pages([], str(tmp_path / "combined.xml"))
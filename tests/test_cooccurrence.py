@@ -0,0 +1,64 @@
+from itertools import combinations
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+nx = pytest.importorskip("networkx")
+pytest.importorskip("scipy")
+
+from coleridge.network.cooccurrence import GROUP_COLUMNS, cooccurrence_edges, cooccurrence_graph, incidence_matrix, write_network
+
+
+@pytest.fixture
+def entities():
+    return pd.DataFrame({
+        "person": ["Mr. Kitchen", "J. Harper", "Golam Khan", "Mr. Kitchen", "J. Harper", "Strahan", None, "Mr. Kitchen"],
+        "report_date": [1865, 1865, 1865, 1866, 1866, 1866, 1866, 1865],
+        "heading_survey_party": ["1", "1", "1", "2", "2", None, "2", "1"],
+        "heading_survey_area": ["HYDERABAD"] * 8,
+        "ethnicity": ["Non-native", None, "Native", "Non-native", "Non-native", "Non-native", "Native", "Non-native"],
+    })
+
+
+def test_incidence_matrix(entities):
+    incidence, persons, groups = incidence_matrix(entities)
+    assert persons.tolist() == ["Mr. Kitchen", "J. Harper", "Golam Khan"]
+    assert groups.tolist() == [(1865, "1", "HYDERABAD"), (1866, "2", "HYDERABAD")]
+    assert incidence.toarray().tolist() == [[1, 1], [1, 1], [1, 0]]  # Mr. Kitchen is credited twice in 1865
+
+
+def test_cooccurrence_edges(entities):
+    edges = cooccurrence_edges(entities)
+    assert edges.to_dict(orient="records") == [
+        {"source": "Mr. Kitchen", "target": "J. Harper", "weight": 2},
+        {"source": "Mr. Kitchen", "target": "Golam Khan", "weight": 1},
+        {"source": "J. Harper", "target": "Golam Khan", "weight": 1},
+    ]
+
+
+def test_cooccurrence_edges_pairs(entities):
+    entities = pd.concat([entities] * 3 + [entities.assign(report_date=1870, person=entities["person"].str[:4])])
+    expected = {}
+    for _, group in entities.dropna(subset=["person"] + GROUP_COLUMNS).groupby(GROUP_COLUMNS):
+        for pair in combinations(sorted(group["person"].unique()), 2):
+            expected[pair] = expected.get(pair, 0) + 1
+
+    edges = cooccurrence_edges(entities)
+    assert {tuple(sorted([s, t])): w for s, t, w in edges.itertuples(index=False)} == expected
+
+
+def test_cooccurrence_graph(entities):
+    graph = cooccurrence_graph(entities, node_columns=["ethnicity"])
+    assert graph.nodes["J. Harper"] == {"ethnicity": ""}
+    assert graph["Mr. Kitchen"]["J. Harper"]["weight"] == 2
+    assert "Strahan" not in graph  # No survey party
+
+
+def test_write_network(entities, tmp_path):
+    graph = write_network(entities, str(tmp_path), node_columns=["ethnicity"])
+    edges = pd.read_csv(tmp_path / "cooccurrence_edges.csv", encoding="utf-8-sig")
+    assert edges.to_dict(orient="records") == cooccurrence_edges(entities).to_dict(orient="records")
+
+    read = nx.read_graphml(tmp_path / "cooccurrence.graphml")
+    assert dict(read.nodes(data=True)) == dict(graph.nodes(data=True))
+    assert sorted(read.edges(data="weight")) == sorted(graph.edges(data="weight"))
@@ -0,0 +1,92 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+rapidfuzz = pytest.importorskip("rapidfuzz")
+
+from rapidfuzz import fuzz, process, utils
+
+from coleridge.network.dedupe import candidate_blocks, candidate_matches, dedupe_entities, match_names, name_threshold, token_initials
+
+NAMES = [
+    "Andrew Chamarett", "James Mulheran", "A. Chamarett", "Golam Khan", "Gulam Khan", "Andrew Chamaret",
+    "Ramchunder", "Ramchundra", "J. Harper", "Strahan", "A. B. Strahan", "ttrahan", "Golam Kahn", "Kitchen",
+]
+ETHNICITIES = [
+    "Non-native", "Non-native", "Non-native", "Native", "Native", "Non-native",
+    "Native", "Non-native", "Non-native", "Native", "Non-native", "Non-native", "Native", "Non-native",
+]
+
+
+def notebook_match_names(names, ethnicities):
+    """
+    The loop network_conversion.ipynb used before coleridge.network.dedupe, kept to check the module gives the same groups
+    """
+    matches = {}
+    for i, name in enumerate(names):
+        matches[name] = [
+            m[:2] for scorer in [fuzz.token_set_ratio, fuzz.ratio]
+            for m in process.extract(name, names[i + 1:], limit=None, score_cutoff=75, scorer=scorer, processor=utils.default_process)
+        ]
+
+    matched = set()
+    groups = []
+    for name, ethnicity in zip(names, ethnicities):
+        if name in matched or not matches[name]:
+            continue
+        threshold = 80 if ethnicity == "Native" else 90
+        full_matches = [m for m, score in matches[name] if score > threshold]
+        for fm in full_matches:
+            full_matches += [m for m, score in matches[fm] if score > threshold and m not in full_matches]
+        full_matches = sorted(set(full_matches + [name]) - matched)
+        matched.update(full_matches)
+        groups.append(full_matches)
+
+    return groups + [[name] for name in names if name not in matched]
+
+
+def test_name_threshold():
+    assert name_threshold("Native") == 80
+    assert name_threshold("Non-native") == name_threshold(None) == 90
+
+
+def test_candidate_blocks():
+    processed = [utils.default_process(name) for name in ["A. Chamarett", "Kitchen", "Andrew Chamaret"]]
+    assert token_initials(processed[0]) == {"a", "c"}
+    assert candidate_blocks(processed) == [[0, 1, 2]]
+    assert candidate_blocks(processed, block_key=token_initials) == [[0, 2], [0, 2], [1]]
+
+
+def test_candidate_matches():
+    forward = candidate_matches(NAMES)
+    assert forward[0] == {2: 90, 5: pytest.approx(96.774, abs=1e-3)}
+    assert forward[9][10] == 100  # Strahan's words are a subset of A. B. Strahan's
+    assert all(j > i for i, matches in enumerate(forward) for j in matches)
+    assert all(score >= 75 for matches in forward for score in matches.values())
+
+
+def test_match_names():
+    groups = match_names(NAMES, ETHNICITIES)
+    assert groups == notebook_match_names(NAMES, ETHNICITIES)
+    assert ["Andrew Chamaret", "Andrew Chamarett"] in groups
+    assert ["A. Chamarett"] in groups  # Scores 90 with Andrew Chamarett, a match has to beat the threshold
+    assert ["Golam Kahn", "Golam Khan", "Gulam Khan"] in groups
+    assert ["A. B. Strahan", "Strahan", "ttrahan"] in groups
+    assert sorted(name for group in groups for name in group) == sorted(NAMES)
+
+
+def test_match_names_blocked():
+    blocked = match_names(NAMES, ETHNICITIES, block_key=token_initials)
+    assert ["Golam Kahn", "Golam Khan", "Gulam Khan"] in blocked
+    assert ["A. B. Strahan", "Strahan"] in blocked
+    assert ["ttrahan"] in blocked  # No initial in common with Strahan, so never scored against it
+
+
+def test_dedupe_entities():
+    entities = pd.DataFrame({
+        "fullname": ["Golam Khan", None, "Gulam Khan", "J. Harper", "Golam Khan"],
+        "ethnicity": ["Native", "Native", "Native", "Non-native", "Non-native"],
+    }, index=[10, 11, 12, 13, 14])
+    unique_ids = dedupe_entities(entities)
+    assert unique_ids.index.tolist() == entities.index.tolist()
+    assert unique_ids[10] == unique_ids[12] == unique_ids[14] != unique_ids[13]
+    assert pd.isna(unique_ids[11])
@@ -0,0 +1,53 @@
+import shutil
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from coleridge.data.entity_tables import join_headings, read_entity_tables
+from coleridge.data.pipeline import load_report, run_pipeline
+from coleridge.data.stages import ENTITY_COLUMNS, ENTITY_TABLE_COLUMNS, HEADING_COLUMNS, EntityStage, EntityTableStage
+
+
+@pytest.fixture
+def report_path(tmp_path):
+    path = tmp_path / "1865_combined_pages.xml"
+    shutil.copy("tests/test_extract_entities.xml", path)
+    return str(path)
+
+
+def test_entity_table_stage(report_path):
+    report = load_report(report_path)
+    tables = EntityTableStage().extract(report)
+    wide = EntityStage().extract(report)
+
+    assert [row["heading_id"] for row in tables["headings"]] == ["1865_0"]
+    assert tables["headings"][0]["heading_survey_area"] == "HYDRABAD SURVEY"
+    assert all(set(entity) & set(HEADING_COLUMNS) == {"heading_id"} for entity in tables["entities"])
+    assert [entity | tables["headings"][0] for entity in tables["entities"]] == [entity | {"heading_id": "1865_0"} for entity in wide]
+
+
+def test_join_headings():
+    entities = pd.DataFrame({"heading_id": ["1865_2", "1866_0", "1865_2"], "person": ["A", "B", "C"], "season": ["stale", None, None]}, index=[5, 6, 7])
+    headings = pd.DataFrame({"heading_id": ["1865_2", "1866_0"], "report_date": [1865, 1866], "season": ["1862-63", "1863-64"]})
+
+    wide = join_headings(entities, headings)
+    assert wide.index.tolist() == [5, 6, 7]
+    assert wide["report_date"].tolist() == [1865, 1866, 1865]
+    assert wide["season"].tolist() == ["1862-63", "1863-64", "1862-63"]  # The heading's value wins
+    assert wide.columns.tolist() == list(dict.fromkeys(ENTITY_COLUMNS))
+
+
+def test_read_entity_tables(report_path, tmp_path):
+    output_dir = tmp_path / "processed"
+    output_dir.mkdir()
+    run_pipeline([report_path], stages=[EntityTableStage()], output_dir=str(output_dir))
+
+    assert pd.read_csv(output_dir / "entities.csv").columns.tolist() == ENTITY_TABLE_COLUMNS
+    assert pd.read_csv(output_dir / "headings.csv").columns.tolist() == HEADING_COLUMNS
+
+    wide = pd.DataFrame(EntityStage().extract(load_report(report_path)))
+    joined = read_entity_tables(str(output_dir))
+    assert joined["person"].tolist() == wide["person"].tolist()
+    assert joined["heading_survey_area"].tolist() == wide["heading_survey_area"].tolist()
+    assert joined["report_date"].tolist() == wide["report_date"].tolist()
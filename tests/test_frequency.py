@@ -0,0 +1,22 @@
+import pytest
+
+from coleridge.data.frequency import count_occurrences
+
+
+@pytest.mark.parametrize("needles", [
+    ["Smith", "Smithson", "son", "Jones"],
+    ["aa", "aaa", "a"],
+    ["Mr. A. Smith", "A. Smith", ". "],
+    ["", "Smith", "Smith"],
+])
+def test_matches_str_count(needles):
+    text = "Mr. A. Smith and Mr. B. Smithson, aaaaa, son of Smith. "
+    assert count_occurrences(text, needles) == {needle: text.count(needle) for needle in needles}
+
+
+def test_non_overlapping():
+    assert count_occurrences("abababa", ["aba", "bab"]) == {"aba": 2, "bab": 1}
+
+
+def test_no_needles():
+    assert count_occurrences("HYDRABAD", []) == {}
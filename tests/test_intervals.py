@@ -0,0 +1,26 @@
+from coleridge.data.intervals import group_overlaps, overlapping_pairs
+
+
+def test_overlapping_pairs():
+    spans = [(12, 22), (2, 12), (24, 36), (12, 22), (36, 40)]
+    assert overlapping_pairs(spans) == [(0, 1), (0, 3), (1, 3), (2, 4)]
+
+
+def test_no_overlaps():
+    assert overlapping_pairs([(0, 4), (6, 9), (11, 11)]) == []
+
+
+def test_group_overlaps():
+    spans = [
+        ("role", 2, 12),
+        ("person0", 12, 22),
+        ("ethnicity0", 12, 22),
+        ("person1", 24, 36),
+        ("ethnicity1", 24, 36),
+        ("place", 50, 55),
+    ]
+    assert group_overlaps(spans) == {
+        (2, 12): ["role", "person0", "ethnicity0"],
+        (12, 22): ["person0", "ethnicity0"],
+        (24, 36): ["person1", "ethnicity1"],
+    }
@@ -0,0 +1,129 @@
+import copy
+import json
+import shutil
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from coleridge.data import manifest as manifest_module
+from coleridge.data.combine import combine_reports
+from coleridge.data.manifest import Manifest
+
+
+@pytest.fixture
+def raw_dir(tmp_path):
+    root = ET.parse("tests/test_extract_entities.xml").getroot()
+    for report_date in [1865, 1866]:
+        page_dir = tmp_path / "raw" / f"{report_date} Exported Files" / "XML" / "doc" / "page"
+        page_dir.mkdir(parents=True)
+        for n in [1, 2]:
+            page = ET.Element(root.tag, root.attrib)
+            page.extend(copy.deepcopy(list(root)))
+            ET.ElementTree(page).write(page_dir / f"{n:04d}_p{n:03d}.xml", encoding="UTF-8")
+    return tmp_path / "raw"
+
+
+def test_file_hash_reused(tmp_path, monkeypatch):
+    path = tmp_path / "page.xml"
+    path.write_text("<a/>")
+    manifest = Manifest(str(tmp_path / "manifest.json"))
+    first = manifest.file_hash(str(path))
+
+    monkeypatch.setattr(manifest_module, "file_hash", lambda p: pytest.fail("unchanged file hashed again"))
+    assert manifest.file_hash(str(path)) == first
+    assert manifest.file_hash(str(tmp_path / "missing.xml")) is None
+
+
+def test_unreadable_manifest(tmp_path):
+    path = tmp_path / "manifest.json"
+    path.write_text("{")
+    assert Manifest(str(path)).reports == {}
+    path.write_text(json.dumps({"version": 0, "files": {"a": {}}, "reports": {"1865": {}}}))
+    assert Manifest(str(path)).reports == {}
+
+
+def test_combine_reports_incremental(raw_dir, tmp_path):
+    interim_dir = tmp_path / "interim"
+    interim_dir.mkdir()
+    kwargs = {"raw_dir": str(raw_dir), "interim_dir": str(interim_dir)}
+    manifest_path = str(tmp_path / "manifest.json")
+
+    assert combine_reports([1865, 1866], manifest=Manifest(manifest_path), **kwargs) == [1865, 1866]
+    assert combine_reports([1865, 1866], manifest=Manifest(manifest_path), **kwargs) == []
+
+    page = raw_dir / "1866 Exported Files" / "XML" / "doc" / "page" / "0002_p002.xml"
+    page.write_text(page.read_text(encoding="utf-8").replace("HYDRABAD", "HYDERABAD"), encoding="utf-8")
+    assert combine_reports([1865, 1866], manifest=Manifest(manifest_path), **kwargs) == [1866]
+    assert "HYDERABAD" in (interim_dir / "1866_combined_pages.xml").read_text(encoding="utf-8")
+
+    (interim_dir / "1865_combined_pages.xml").unlink()
+    assert combine_reports([1865, 1866], manifest=Manifest(manifest_path), **kwargs) == [1865]
+    assert combine_reports([1865, 1866], pretty=False, manifest=Manifest(manifest_path), **kwargs) == [1865, 1866]
+    assert combine_reports([1865, 1866], **kwargs) == [1865, 1866]  # Without a manifest everything is combined
+
+
+def test_run_pipeline_incremental(tmp_path, monkeypatch):
+    pytest.importorskip("pandas")
+    from coleridge.data import pipeline
+    from coleridge.data.stages import OverlapStatsStage, TagStatsStage
+
+    report_paths = []
+    for report_date in [1865, 1866]:
+        report_paths.append(str(tmp_path / f"{report_date}_combined_pages.xml"))
+        shutil.copy("tests/test_extract_entities.xml", report_paths[-1])
+    output_dir = tmp_path / "processed"
+    output_dir.mkdir()
+    stages = [TagStatsStage(), OverlapStatsStage()]
+
+    def run():
+        manifest = Manifest(str(tmp_path / "manifest.json"), results_dir=str(tmp_path / "extracted"))
+        return pipeline.run_pipeline(report_paths, stages=stages, output_dir=str(output_dir), manifest=manifest)
+
+    full = run()
+    outputs = sorted((f.name, f.read_bytes()) for f in output_dir.iterdir())
+
+    extract_report = pipeline.extract_report
+    monkeypatch.setattr(pipeline, "extract_report", lambda *args, **kwargs: pytest.fail("unchanged report extracted again"))
+    assert run() == full
+    assert sorted((f.name, f.read_bytes()) for f in output_dir.iterdir()) == outputs
+
+    extracted = []
+    monkeypatch.setattr(pipeline, "extract_report", lambda path, *args, **kwargs: extracted.append(path) or extract_report(path, *args, **kwargs))
+    with open(report_paths[1], "a", encoding="utf-8") as f:
+        f.write("\n")
+    assert run() == full
+    assert extracted == [report_paths[1]]
+
+    extracted.clear()
+    stages[0].version = TagStatsStage.version + 1  # e.g. its extract changed, so every report is extracted again
+    assert run() == full
+    assert extracted == report_paths
+
+
+def test_stage_version(tmp_path):
+    from coleridge.data.stages import OverlapStatsStage, TagStatsStage
+
+    report_path = str(tmp_path / "1865_combined_pages.xml")
+    shutil.copy("tests/test_extract_entities.xml", report_path)
+    manifest = Manifest(str(tmp_path / "manifest.json"), results_dir=str(tmp_path / "extracted"))
+    stages = [TagStatsStage(), OverlapStatsStage()]
+    manifest.save_results(report_path, 1865, stages, [["stats"], ["overlaps"]])
+    assert manifest.load_results(report_path, 1865, stages) == [["stats"], ["overlaps"]]
+
+    newer = TagStatsStage()
+    newer.version = TagStatsStage.version + 1  # Its results changed form, the kept ones can't be reused
+    assert manifest.load_results(report_path, 1865, [newer, OverlapStatsStage()]) is None
+
+
+def test_every_stage_versioned(tmp_path):
+    from coleridge.data import stages as stages_module
+
+    stages = [stages_module.EntityStage(), stages_module.EntityTableStage(), stages_module.PlaceStage(), stages_module.MapStage(), stages_module.TagStatsStage(), stages_module.OverlapStatsStage()]
+    assert all(isinstance(stage.version, int) for stage in stages)
+
+    unversioned = stages_module.TagStatsStage()
+    unversioned.version = None
+    manifest = Manifest(str(tmp_path / "manifest.json"), results_dir=str(tmp_path / "extracted"))
+    with pytest.raises(ValueError):
+        manifest.save_results(str(tmp_path / "1865_combined_pages.xml"), 1865, [unversioned], [["stats"]])
+    assert not (tmp_path / "extracted").exists()
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from coleridge import metrics
+
+
+@pytest.fixture(autouse=True)
+def disabled_metrics():
+    yield
+    metrics.disable()
+    metrics.reset()
+
+
+def test_disabled_by_default():
+    with metrics.timer("xml_load"):
+        metrics.count("lines_parsed")
+    assert list(metrics.timed_iter([1, 2], "xml_load")) == [1, 2]
+    assert metrics.snapshot() == {"timers": {}, "counters": {}}
+
+
+def test_timers_and_counters():
+    metrics.enable()
+    for _ in range(2):
+        with metrics.timer("xml_load"):
+            pass
+    metrics.count("lines_parsed")
+    metrics.count("lines_parsed", 4)
+    assert list(metrics.timed_iter([1, 2], "report_text")) == [1, 2]
+
+    summary = metrics.snapshot()
+    assert summary["counters"] == {"lines_parsed": 5}
+    assert summary["timers"]["xml_load"]["calls"] == 2
+    assert summary["timers"]["report_text"]["calls"] == 3  # One per item, and the call that finds the end
+    assert summary["timers"]["xml_load"]["seconds"] >= 0
+
+
+def test_merge():
+    a = {"timers": {"xml_load": {"seconds": 1.0, "calls": 1}}, "counters": {"lines_parsed": 2}}
+    b = {"timers": {"xml_load": {"seconds": 0.5, "calls": 2}, "write:places": {"seconds": 0.25, "calls": 1}}, "counters": {}}
+    assert metrics.merge([a, b]) == {
+        "timers": {"write:places": {"seconds": 0.25, "calls": 1}, "xml_load": {"seconds": 1.5, "calls": 3}},
+        "counters": {"lines_parsed": 2},
+    }
+
+
+def test_run_pipeline_metrics(tmp_path):
+    pytest.importorskip("pandas")
+    from benchmarks.synthetic import generate_report
+    from coleridge.data.pipeline import run_pipeline
+    from coleridge.data.stages import OverlapStatsStage, PlaceStage, TagStatsStage
+
+    report_path = tmp_path / "1865_combined_pages.xml"
+    generate_report(str(report_path), pages=2)
+    output_dir = tmp_path / "processed"
+    output_dir.mkdir()
+    metrics_dir = tmp_path / "metrics"
+    stages = [PlaceStage(), TagStatsStage(check_attributes=False), OverlapStatsStage()]
+    run_pipeline([str(report_path)], stages=stages, output_dir=str(output_dir), metrics_dir=str(metrics_dir))
+
+    report_summary = json.loads((metrics_dir / "1865.json").read_text())
+    assert report_summary["report_date"] == 1865
+    assert {"xml_load", "region_build", "attribute_parsing", "report_text", "continuation_resolution", "extract:places"} <= set(report_summary["timers"])
+    regions = report_summary["counters"]["regions_parsed"]
+    assert report_summary["timers"]["region_build"]["calls"] == regions
+    assert report_summary["timers"]["xml_load"]["calls"] == regions + 1  # the last call finds the end of the report
+    assert report_summary["counters"]["lines_parsed"] > 0
+    assert report_summary["counters"]["rows:places"] > 0
+    assert (output_dir / "report_places.csv").exists()
+
+    run_summary = json.loads((metrics_dir / "run.json").read_text())
+    assert run_summary["reports"] == [1865]
+    assert "write:places" in run_summary["timers"]
+    assert run_summary["counters"] == report_summary["counters"]
+    assert not metrics.enabled()
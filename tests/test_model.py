@@ -0,0 +1,55 @@
+import pickle
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from coleridge.data.model import TextLine, TextRegion, unicode_text
+from coleridge.data.parse_xml import extract_entities, parse_attributes, parse_region
+from coleridge.data.read_xml import ns
+
+
+@pytest.fixture
+def root():
+    return ET.parse("tests/test_parse_attributes.xml").getroot()
+
+
+def test_from_element(root):
+    element = root[1][1]
+    region = TextRegion.from_element(element, idx=3)
+    assert region.idx == 3
+    assert region.id == element.attrib["id"]
+    assert len(region) == len(element) - 1  # The fixture region has Coords but no TextEquiv
+    assert region[1].text == element[2][2][0].text
+    assert region[1].custom == element[2].attrib["custom"]
+
+
+def test_parse_attributes_model(root):
+    element = root[1][1]
+    region = TextRegion.from_element(element)
+    assert parse_attributes(region) == parse_attributes(element)
+    assert parse_region(region) == parse_region(element[1:])
+    assert parse_attributes(region, line_idx=1) == parse_attributes(element, line_idx=2)
+
+
+def test_extract_entities_model():
+    element = ET.parse("tests/test_extract_entities.xml").getroot()[1][2]
+    region = TextRegion.from_element(element)
+    for line, line_attributes in zip(region.lines, parse_region(region)):
+        line.attributes = line_attributes
+    assert [extract_entities(line) for line in region] == [extract_entities(a) for a in parse_region(element[1:-1])]
+
+
+def test_unicode_text_by_tag():
+    line = ET.fromstring(f"""<TextLine xmlns="{ns['page']}" id="l1" custom="readingOrder {{index:0;}}">
+        <Coords/><Baseline/><Word id="w1"><Coords/><TextEquiv><Unicode>Smith</Unicode></TextEquiv></Word>
+        <TextEquiv><PlainText>plain</PlainText><Unicode>Mr. Smith</Unicode></TextEquiv>
+    </TextLine>""")
+    assert unicode_text(line) == "Mr. Smith"
+    assert TextLine.from_element(line).tags == (("readingOrder", (("index", "0"),)),)
+
+
+def test_pickle(root):
+    region = TextRegion.from_element(root[1][1])
+    region.lines[1].attributes = parse_attributes(region, line_idx=1)
+    assert pickle.loads(pickle.dumps(region)) == region
+    assert not hasattr(region.lines[0], "__dict__")
@@ -0,0 +1,87 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from coleridge.network.normalise import (
+    SURVEY_AREA_RULES, SURVEY_PARTY_RULES, apply_corrections, apply_rules, normalise_column, normalise_entities, split_areas
+)
+
+
+@pytest.mark.parametrize("area, normalised", [
+    ("THE HYDRABAD SURVEY.", "HYDERABAD"),
+    ("Rewah and Bundelcund", "REWAH, BUNDELKUND"),
+    ("CENTRAL PROVINCES AND VIZAGAPATAM\nAGENCY", "CENTRAL PROVINCES, VIZAGAPATAM AGENCY"),
+    ("'KOSSIA AND GARROW HILLS SURVEY'", "KHASIA AND GARO HILLS"),
+    ("GWALIOR AND CENTRAL INDIA, AND RAJPOOTANA", "GWALIOR AND CENTRAL INDIA, RAJPOOTANA"),
+])
+def test_survey_area_rules(area, normalised):
+    assert apply_rules(area, SURVEY_AREA_RULES) == normalised
+
+
+@pytest.mark.parametrize("party, normalised", [
+    ("No. III PARTY", "3"),
+    ("No. VII.—TOPOGRAPHICAL PARTY.", "7"),
+    ("No. 2.—TOPOGRAPHICAL PARTY", "2"),
+    ("PEGU SURVEY", "8"),
+])
+def test_survey_party_rules(party, normalised):
+    assert apply_rules(party, SURVEY_PARTY_RULES) == normalised
+
+
+def test_normalise_column():
+    values = pd.Series(["No. IV Party", None, "No. IV Party", "No. 1 PARTY"], index=[3, 4, 5, 6], name="heading_survey_party")
+    normalised = normalise_column(values, SURVEY_PARTY_RULES)
+    assert normalised.index.tolist() == [3, 4, 5, 6]
+    assert normalised.name == "heading_survey_party"
+    assert normalised[3] == normalised[5] == "4"
+    assert pd.isna(normalised[4])
+
+
+@pytest.fixture
+def entities():
+    return pd.DataFrame({
+        "person": ["Mr. J. Harper", "Baboo M. S. Dutt", "Golam Khan", "Mr. Kitchen"],
+        "title": ["Harper", None, None, "Mr."],
+        "lastname": [None, None, "Khan", "Kitchen"],
+        "report_date": [1866, 1866, 1867, 1867],
+        "heading_survey_area": ["REWAH AND BUNDELCUND", None, None, "THE HYDRABAD SURVEY"],
+        "heading_survey_party": ["No. III PARTY", "No. 1 TOPOGRAPHICAL PARTY", "No. 2 TOPOGRAPHICAL PARTY", "No. 2 TOPOGRAPHICAL PARTY"],
+    }, index=[10, 11, 12, 13])
+
+
+def test_apply_corrections(entities):
+    titles = pd.DataFrame([{"title": "Harper", "set_title": "Mr", "set_lastname": "Harper"}])
+    corrected = apply_corrections(entities, titles)
+    assert corrected.loc[10, ["title", "lastname"]].tolist() == ["Mr", "Harper"]
+    assert corrected.drop(index=10).equals(entities.drop(index=10))
+    assert entities.loc[10, "title"] == "Harper"  # Corrections don't change the entities passed in
+
+
+def test_apply_corrections_missing_keys(entities):
+    headings = pd.DataFrame([
+        {"report_date": 1867, "heading_survey_area": None, "heading_survey_party": "No. 2 TOPOGRAPHICAL PARTY", "set_heading_survey_area": "HYDERABAD"},
+        {"report_date": 1866, "heading_survey_area": None, "heading_survey_party": "No. 1 TOPOGRAPHICAL PARTY", "set_season": "1865-66"},
+    ])
+    corrected = apply_corrections(entities, headings)
+    assert corrected["heading_survey_area"].fillna("").tolist() == ["REWAH AND BUNDELCUND", "", "HYDERABAD", "THE HYDRABAD SURVEY"]
+    assert corrected["season"].fillna("").tolist() == ["", "1865-66", "", ""]
+
+
+def test_apply_corrections_duplicate_keys(entities):
+    with pytest.raises(pd.errors.MergeError):
+        apply_corrections(entities, pd.DataFrame({"title": ["Harper", "Harper"], "set_title": ["Mr", "Mr."]}))
+
+
+def test_split_areas():
+    entities = pd.DataFrame({"person": ["a", "b", "c"], "heading_survey_area": ["REWAH, BUNDELKUND", "HYDERABAD", None]})
+    split = split_areas(entities)
+    assert split.index.tolist() == [0, 0, 1, 2]
+    assert split["heading_survey_area"].tolist()[:3] == ["REWAH", "BUNDELKUND", "HYDERABAD"]
+    assert pd.isna(split["heading_survey_area"].iloc[3])
+
+
+def test_normalise_entities(entities):
+    normalised = normalise_entities(entities, corrections=[pd.DataFrame([{"person": "Baboo M. S. Dutt", "set_heading_survey_area": "Rewah Territory"}])])
+    assert normalised.index.tolist() == [10, 10, 11, 12, 13]
+    assert normalised["heading_survey_area"].tolist()[:3] == ["REWAH", "BUNDELKUND", "REWAH"]
+    assert normalised["heading_survey_party"].tolist() == ["3", "3", "1", "2", "2"]
@@ -0,0 +1,80 @@
+import shutil
+
+import pytest
+
+from coleridge.data.overlaps import OverlapStats, analyze_reports, line_spans, read_overlaps, relation, unique_tags, write_overlaps
+from coleridge.data.parse_custom import parse_custom_string
+
+LINE = (
+    "readingOrder {index:0;} role {offset:2; length:10;} person {offset:12; length:10;} ethnicity {offset:12; length:10;} "
+    "person {offset:24; length:12;} member {offset:26; length:4;} place {offset:30; length:10;}"
+)
+
+
+@pytest.fixture
+def report_paths(tmp_path):
+    paths = []
+    for report_date in [1865, 1866]:
+        paths.append(str(tmp_path / f"{report_date}_combined_pages.xml"))
+        shutil.copy("tests/test_extract_entities.xml", paths[-1])
+    return paths
+
+
+def test_line_spans():
+    assert unique_tags(["person", "role", "person"]) == ["person0", "role", "person1"]
+    assert line_spans(parse_custom_string(LINE)) == [
+        ("role", 2, 12), ("person0", 12, 22), ("ethnicity", 12, 22), ("person1", 24, 36), ("member", 26, 30), ("place", 30, 40),
+    ]
+
+
+def test_relation():
+    assert relation((12, 22), (12, 22)) == "identical"
+    assert relation((24, 36), (26, 30)) == relation((26, 30), (24, 36)) == "contains"
+    assert relation((24, 36), (30, 40)) == "partial"
+    assert relation((2, 12), (12, 22)) == "adjacent"
+
+
+def test_add():
+    stats = OverlapStats()
+    stats.add(parse_custom_string(LINE), (1865, 0, "l1"))
+
+    assert stats.groups == {
+        ("ethnicity", "person", "role"): 1, ("ethnicity", "person"): 1, ("member", "person", "place"): 1, ("member", "place"): 1,
+    }
+    assert stats.pairs == {
+        ("adjacent", "person", "role"): 1, ("adjacent", "ethnicity", "role"): 1, ("identical", "ethnicity", "person"): 1,
+        ("contains", "person", "member"): 1, ("partial", "person", "place"): 1, ("adjacent", "member", "place"): 1,
+    }
+    assert stats.samples[("contains", "person", "member")] == [(1865, 0, "l1")]
+
+
+def test_merge_and_samples():
+    lines = [parse_custom_string(LINE)] * 5
+    whole = OverlapStats()
+    for i, line_tags in enumerate(lines):
+        whole.add(line_tags, (1865, i, "l1"))
+
+    parts = [OverlapStats(), OverlapStats()]
+    for i, line_tags in enumerate(lines):
+        parts[i // 2 > 0].add(line_tags, (1865, i, "l1"))
+
+    assert OverlapStats.merged(parts) == whole
+    assert whole.groups[("ethnicity", "person")] == 5
+    assert whole.samples[("group", "ethnicity", "person")] == [(1865, 0, "l1"), (1865, 1, "l1"), (1865, 2, "l1")]
+
+
+def test_read_overlaps(report_paths, tmp_path):
+    pytest.importorskip("pandas")
+    from coleridge.data.pipeline import load_report
+    from coleridge.data.stages import OverlapStatsStage
+
+    stats = read_overlaps(report_paths[0])
+    assert stats == OverlapStatsStage().extract(load_report(report_paths[0]))
+    assert analyze_reports(report_paths, workers=2) == analyze_reports(report_paths)
+
+    write_overlaps(OverlapStats.merged(analyze_reports(report_paths)), str(tmp_path))
+    groups = (tmp_path / "overlapping_groups.txt").read_text().splitlines()
+    assert len(groups) == len(stats.groups)
+    rows = (tmp_path / "tag_overlaps.csv").read_text(encoding="utf-8-sig").splitlines()
+    assert rows[0] == "kind,tags,count,samples"
+    assert len(rows) == 1 + len(stats.groups) + len(stats.pairs)
@@ -0,0 +1,38 @@
+import pytest
+
+from coleridge.data.parse_custom import parse_custom_string, tokenize_block
+
+
+def test_reading_order_only():
+    assert parse_custom_string("readingOrder {index:7;}") == (("readingOrder", (("index", "7"),)),)
+
+
+def test_escaped_characters():
+    custom = r"readingOrder {index:1;} person {offset:0; length:17;firstname:J.; title:Esquire\u0020Jr; lastname:Mulheran'’-;}"
+    assert parse_custom_string(custom) == (
+        ("readingOrder", (("index", "1"),)),
+        ("person", (("offset", "0"), ("length", "17"), ("firstname", "J."), ("title", "Esquire Jr"), ("lastname", "Mulheran'’-"))),
+    )
+
+
+@pytest.mark.parametrize("normalise_role,expected", [(True, "role"), (False, "Role")])
+def test_normalise_role(normalise_role, expected):
+    custom = "readingOrder {index:1;} Role {offset:47; length:18;}"
+    assert parse_custom_string(custom, normalise_role=normalise_role)[1][0] == expected
+
+
+def test_malformed_tag_skipped():
+    # Commas aren't valid inside a tag, so the whole person tag is dropped
+    custom = "readingOrder {index:3;} person {offset:0; length:5;lastname:Dutt, M.;} place {offset:7; length:4;}"
+    assert [tag for tag, _ in parse_custom_string(custom)] == ["readingOrder", "place"]
+
+
+def test_tokenize_block():
+    assert tokenize_block("offset:0; length:72; continued:true;title:Degree Sheet No. 1.;") == (
+        ("offset", "0"), ("length", "72"), ("continued", "true"), ("title", "Degree Sheet No. 1.")
+    )
+
+
+def test_cached_result_shared():
+    custom = "readingOrder {index:12;}"
+    assert parse_custom_string(custom) is parse_custom_string(custom)
@@ -1,7 +1,10 @@
 import pytest
 import xml.etree.ElementTree as ET
 
-from coleridge.data.parse_xml import parse_attributes, extract_entities
+from coleridge import metrics
+from coleridge.data.model import TextLine, TextRegion
+from coleridge.data.parse_custom import parse_custom_string
+from coleridge.data.parse_xml import MULTI_TAG, SINGLE_TAG, TAG_FREE, classify_line, parse_attributes, parse_region, extract_entities
 
 
 @pytest.fixture
@@ -244,6 +247,57 @@ def test_final_textline_continue(root):
     assert parse_attributes(basic_region, line_idx=idx) == {}
 
 
+def test_parse_region(root):
+    region_lines = root[1][1][1:]
+    assert parse_region(region_lines) == [parse_attributes(region_lines, line_idx=i) for i, _ in enumerate(region_lines)]
+
+
+def test_parse_region_continued(root):
+    region_lines = root[1][1][1:]
+    line_attributes = parse_region(region_lines)
+    assert line_attributes[1]["map"]["text"] == "Degree Sheet No. 1.—Parts of Gwalior, Dholpore and Dattiah States. Scale\nmile = 1 inch."
+    assert line_attributes[2] == dict()
+    assert line_attributes[-1] == dict()
+
+
+
+def test_classify_line():
+    assert classify_line(parse_custom_string("readingOrder {index:3;}")) == TAG_FREE
+    assert classify_line(parse_custom_string("")) == TAG_FREE
+    assert classify_line(parse_custom_string("readingOrder {index:3;} place {offset:0; length:4;}")) == SINGLE_TAG
+    assert classify_line(parse_custom_string("readingOrder {index:3;} place {offset:0; length:4;} person {offset:5; length:4;}")) == MULTI_TAG
+    assert classify_line(parse_custom_string("readingOrder {index:3;} readingOrder {index:4;}")) == MULTI_TAG
+
+
+def test_line_classes(root):
+    region = TextRegion(idx=0, attrib={}, lines=[
+        TextLine(id="l0", text="Agra and Delhi", custom="readingOrder {index:0;} place {offset:0; length:4; placeName:Agra;}"),
+        TextLine(id="l1", text="nothing tagged", custom="readingOrder {index:1;}"),
+        TextLine(id="l2", text="Mr. Harper", custom="readingOrder {index:2;} person {offset:4; length:6;} title {offset:0; length:3;}"),
+    ])
+    metrics.enable()
+    try:
+        line_attributes = parse_region(region)
+        counters = metrics.snapshot()["counters"]
+    finally:
+        metrics.disable()
+        metrics.reset()
+
+    assert line_attributes[0] == {"place": {"placeName": "Agra", "text": "Agra"}}
+    assert line_attributes[1] == {}
+    assert line_attributes[2]["person"]["text"] == "Harper"
+    assert counters["lines_tag_free"] == counters["lines_single_tag"] == counters["lines_multi_tag"] == 1
+    assert "lines_continued" not in counters
+
+    region_lines = root[1][1][1:]
+    metrics.enable()
+    try:
+        parse_region(region_lines)
+        assert metrics.snapshot()["counters"]["lines_continued"] > 0
+    finally:
+        metrics.disable()
+        metrics.reset()
+
 def test_extract_one_person(entity_region_lines):
     entity = extract_entities(entity_region_lines[0])
     assert entity[0] == {
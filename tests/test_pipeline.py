@@ -0,0 +1,92 @@
+import os
+import shutil
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from coleridge.data.parse_xml import parse_region
+from coleridge.data.pipeline import load_report, report_date_from_path, run_pipeline
+from coleridge.data.read_xml import iter_text_regions
+from coleridge.data.stages import EntityStage, MapStage, OverlapStatsStage, PlaceStage, TagStatsStage
+
+
+@pytest.fixture
+def report_path(tmp_path):
+    path = tmp_path / "1865_combined_pages.xml"
+    shutil.copy("tests/test_extract_entities.xml", path)
+    return str(path)
+
+
+def test_report_date_from_path():
+    assert report_date_from_path(os.path.join("data", "interim", "1865_combined_pages.xml")) == 1865
+
+
+def test_load_report(report_path):
+    report = load_report(report_path)
+    assert report["report_date"] == 1865
+    assert [r.id for r in report["regions"]] == ["r_1", "r_4"]
+
+    for region, loaded in zip(iter_text_regions(report_path), report["regions"]):
+        assert [line.attributes for line in loaded.lines] == parse_region(region[1:-1])
+    assert report["text"].startswith("No. 2.—TOPOGRAPHICAL PARTY")
+
+
+def test_entity_stage(report_path):
+    entities = EntityStage().extract(load_report(report_path))
+    assert [e["person"] for e in entities][:2] == ["James Mulheran, Esquire", "Mr. Andrew Chamarett"]
+    assert all(e["heading_survey_area"] == "HYDRABAD SURVEY" for e in entities)
+    assert entities[0]["frequency"] == 1
+
+
+def test_tagged_text_stages(report_path):
+    report = load_report(report_path)
+    assert [p["placeName"] for p in PlaceStage().extract(report)] == ["HYDRABAD"]
+    assert MapStage().extract(report) == []
+
+
+def test_run_pipeline(report_path, tmp_path):
+    output_dir = tmp_path / "processed"
+    output_dir.mkdir()
+    results = run_pipeline([report_path], stages=[TagStatsStage(check_attributes=False), OverlapStatsStage()], output_dir=str(output_dir))
+
+    assert len(results["tag_stats"]) == len(results["overlaps"]) == 1
+    tag_counts = (output_dir / "tag_counts.txt").read_text().splitlines()
+    assert tag_counts[:2] == ["readingOrder: 10", "person: 7"]
+
+
+def test_run_pipeline_read_ahead(report_path, tmp_path):
+    second_path = tmp_path / "1866_combined_pages.xml"
+    shutil.copy(report_path, second_path)
+    report_paths = [report_path, str(second_path)]
+    cache_dir = str(tmp_path / "cache")
+
+    outputs = []
+    for read_ahead in [0, 2, 2]:  # The last run loads the reports cached from the prefetched bytes
+        output_dir = tmp_path / f"processed_{len(outputs)}"
+        output_dir.mkdir()
+        results = run_pipeline(report_paths, stages=[TagStatsStage(), OverlapStatsStage()], output_dir=str(output_dir), cache_dir=cache_dir, read_ahead=read_ahead)
+        outputs.append((results, sorted((f.name, f.read_bytes()) for f in output_dir.iterdir())))
+
+    assert outputs[0] == outputs[1] == outputs[2]
+    assert len(os.listdir(cache_dir)) == 1  # Both reports have the same contents
+
+    # Each report keeps its own year even though the second is loaded from the first one's cache file
+    for results, _ in outputs:
+        sample_dates = [{location[0] for locations in stats.samples.values() for location in locations} for stats in results["overlaps"]]
+        assert sample_dates == [{1865}, {1866}]
+
+
+def test_run_pipeline_workers(report_path, tmp_path):
+    second_path = tmp_path / "1866_combined_pages.xml"
+    shutil.copy(report_path, second_path)
+    report_paths = [report_path, str(second_path)]
+
+    outputs = []
+    for workers in [1, 2]:
+        output_dir = tmp_path / f"processed_{workers}"
+        output_dir.mkdir()
+        results = run_pipeline(report_paths, stages=[TagStatsStage(), OverlapStatsStage()], output_dir=str(output_dir), workers=workers)
+        outputs.append((results, sorted((f.name, f.read_bytes()) for f in output_dir.iterdir())))
+
+    assert outputs[0] == outputs[1]
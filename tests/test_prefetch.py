@@ -0,0 +1,48 @@
+import threading
+import time
+
+import pytest
+
+from coleridge.data import prefetch as prefetch_module
+from coleridge.data.prefetch import prefetch
+
+
+@pytest.fixture
+def paths(tmp_path):
+    paths = []
+    for i in range(6):
+        paths.append(str(tmp_path / f"{i}.xml"))
+        with open(paths[-1], "wb") as f:
+            f.write(f"<page>{i}</page>".encode())
+    return paths
+
+
+@pytest.mark.parametrize("read_ahead", [0, 1, 3, 10])
+def test_prefetch_order(paths, read_ahead):
+    assert list(prefetch(paths, read_ahead=read_ahead)) == [(path, f"<page>{i}</page>".encode()) for i, path in enumerate(paths)]
+
+
+def test_prefetch_read_ahead_bounded(paths, monkeypatch):
+    read_bytes = prefetch_module.read_bytes
+    lock = threading.Lock()
+    started = []
+
+    def slow_read(path):
+        with lock:
+            started.append(path)
+        time.sleep(0.01)
+        return read_bytes(path)
+
+    monkeypatch.setattr(prefetch_module, "read_bytes", slow_read)
+    consumed = 0
+    for path, _ in prefetch(paths, read_ahead=2):
+        consumed += 1
+        time.sleep(0.02)  # Parsing, the next reads finish meanwhile
+        with lock:
+            assert len(started) <= consumed + 2
+    assert consumed == len(paths)
+
+
+def test_prefetch_missing_file(paths):
+    with pytest.raises(FileNotFoundError):
+        list(prefetch(paths + [paths[0] + ".missing"]))
@@ -0,0 +1,55 @@
+import io
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from coleridge.data.parse_xml import parse_attributes
+from coleridge.data.read_xml import iter_text_regions, lxml_etree, ns
+
+backends = ["etree", pytest.param("lxml", marks=pytest.mark.skipif(lxml_etree is None, reason="lxml not installed"))]
+
+
+@pytest.mark.parametrize("xml_path", ["tests/test_parse_attributes.xml", "tests/test_extract_entities.xml"])
+def test_document_order(xml_path):
+    root = ET.parse(xml_path).getroot()
+    expected = [(tr.attrib["id"], len(tr)) for tr in root.iter(f"{{{ns['page']}}}TextRegion")]
+    assert [(tr.attrib["id"], len(tr)) for tr in iter_text_regions(xml_path)] == expected
+
+
+def test_regions_cleared():
+    regions = []
+    for region in iter_text_regions("tests/test_extract_entities.xml"):
+        assert parse_attributes(region)["readingOrder"]
+        regions.append(region)
+
+    assert all(len(region) == 0 for region in regions)
+
+
+def test_nested_regions():
+    xml = f"""<PcGts xmlns="{ns['page']}"><Page>
+        <TextRegion id="r1"><TextRegion id="r1_1"/></TextRegion>
+        <TableRegion id="t1"/>
+        <TextRegion id="r2"/>
+    </Page></PcGts>"""
+    assert [tr.attrib["id"] for tr in iter_text_regions(io.BytesIO(xml.encode()))] == ["r1", "r1_1", "r2"]
+
+
+@pytest.mark.parametrize("backend", backends)
+def test_backends(backend):
+    xml_path = "tests/test_parse_attributes.xml"
+    expected = [parse_attributes(tr) for tr in iter_text_regions(xml_path, backend="etree")]
+    assert [parse_attributes(tr) for tr in iter_text_regions(xml_path, backend=backend)] == expected
+
+
+@pytest.mark.parametrize("backend", backends)
+def test_comments_ignored(backend):
+    xml = f"""<PcGts xmlns="{ns['page']}"><Page><!-- exported -->
+        <TextRegion id="r1"><Coords/><!-- line --><TextLine id="l1"/><TextEquiv/></TextRegion>
+    </Page></PcGts>"""
+    region = next(iter_text_regions(io.BytesIO(xml.encode()), backend=backend))
+    assert [child.tag.split("}")[1] for child in region] == ["Coords", "TextLine", "TextEquiv"]
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        next(iter_text_regions("tests/test_parse_attributes.xml", backend="minidom"))
@@ -0,0 +1,59 @@
+import pytest
+
+from coleridge.data.model import TextLine, TextRegion
+from coleridge.data.parse_xml import parse_region
+from coleridge.data.read_xml import iter_text_regions
+from coleridge.data.sections import SectionIndex, heading_context, heading_id, region_kind
+
+
+def make_region(idx, structure=None):
+    attrib = {"custom": f"readingOrder {{index:{idx};}} structure {{type:{structure};}}"} if structure else {}
+    region = TextRegion(idx=idx, attrib=attrib, lines=[TextLine(id=f"l{idx}", text="text")])
+    if structure:
+        region.attributes = {"structure": {"type": structure}}
+    return region
+
+
+@pytest.fixture
+def regions():
+    structures = [None, "credit", "heading", None, "credit", "credit", "heading", "credit", None, None, "credit"]
+    return [make_region(i, s) for i, s in enumerate(structures)]
+
+
+def test_kinds(regions):
+    sections = SectionIndex(regions)
+    assert [sections.kind(i) for i in range(4)] == ["narrative", "credit", "heading", "narrative"]
+    assert [sections.heading(i) for i in range(len(regions))] == [None, None, 2, 2, 2, 2, 6, 6, 6, 6, 6]
+    assert [region_kind(s) for s in ["table", "marginalia", ""]] == ["table", "narrative", "narrative"]
+
+
+def test_follows_heading(regions):
+    sections = SectionIndex(regions)
+    assert [i for i in range(len(regions)) if sections.follows_heading(i)] == [3, 4, 7, 8]
+    assert [sections.credit_position(i) for i in [1, 4, 5, 7, 10]] == [0, 0, 1, 0, 1]
+
+
+def test_context(regions):
+    sections = SectionIndex(regions)
+    assert sections.context(0) == {}
+    assert sections.context(5) is sections.context(2)
+
+
+def test_heading_rows(regions):
+    sections = SectionIndex(regions)
+    rows = sections.heading_rows(1865)
+    assert [row["heading_id"] for row in rows] == [heading_id(1865, 2), heading_id(1865, 6)] == ["1865_2", "1865_6"]
+    assert rows[0] == {"heading_id": "1865_2", "report_date": 1865} | sections.context(2)
+
+
+def test_heading_context():
+    element = next(iter_text_regions("tests/test_extract_entities.xml"))
+    region = TextRegion.from_element(element)
+    for line, line_attributes in zip(region.lines, parse_region(region)):
+        line.attributes = line_attributes
+
+    context = heading_context(region)
+    assert context["heading_survey_area"] == "HYDRABAD SURVEY"
+    assert context["heading_survey_party"] == "No. 2.—TOPOGRAPHICAL PARTY"
+    assert context["heading_place_names"] == "HYDRABAD"
+    assert context["season"] == "1862-63"
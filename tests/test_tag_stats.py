@@ -0,0 +1,79 @@
+from collections import Counter
+import pickle
+import shutil
+
+from coleridge.data.model import TextLine, TextRegion
+from coleridge.data.parse_custom import parse_custom_string
+from coleridge.data.stages import TagStatsStage
+from coleridge.data.tag_stats import TagStats, count_reports, read_tag_stats
+
+LINES = [
+    "readingOrder {index:0;} person {offset:0; length:5; continued:true;} place {offset:6; length:3; placeName:Agra;}",
+    "readingOrder {index:1;} person {offset:0; length:5;}",
+    "readingOrder {index:2;} newTag {offset:0; length:2; note:x;}",
+    "readingOrder {index:3;}",
+]
+
+
+def test_from_lines():
+    stats = TagStats.from_lines(parse_custom_string(custom) for custom in LINES)
+    assert stats.tags == Counter({"readingOrder": 4, "person": 2, "place": 1, "newTag": 1})
+    assert stats.attributes["person"] == Counter({"offset": 2, "length": 2, "continued": 1})
+
+    assert stats.tag_counts() == [("readingOrder", 4), ("person", 2), ("place", 1), ("newTag", 1)]
+    assert stats.tag_counts(clean=True) == [("person", 2), ("place", 1), ("newTag", 1)]
+
+
+def test_attribute_counts():
+    stats = TagStats.from_lines(parse_custom_string(custom) for custom in LINES)
+
+    counts = stats.attribute_counts()
+    assert list(counts)[:3] == ["readingOrder", "place", "person"]
+    assert list(counts)[-1] == "newTag"  # Tags missing from TAG_ATTRIBUTES come last rather than raising
+    assert counts["person"] == [("offset", 2), ("length", 2), ("continued", 1)]
+    assert counts["map"] == []
+
+    clean = stats.attribute_counts(clean=True)
+    assert "readingOrder" not in clean
+    assert clean["place"] == [("placeName", 1)]
+    assert clean["newTag"] == [("note", 1)]
+
+
+def test_merge():
+    tags = [parse_custom_string(custom) for custom in LINES]
+    whole = TagStats.from_lines(tags)
+    parts = [TagStats.from_lines(tags[:1]), TagStats.from_lines(tags[1:3]), TagStats(), TagStats.from_lines(tags[3:])]
+
+    merged = TagStats.merged(parts)
+    assert merged == whole
+    assert merged.tag_counts() == whole.tag_counts()
+    assert merged.attribute_counts() == whole.attribute_counts()
+    assert parts[0] + parts[1] == TagStats.from_lines(tags[:3])
+    assert parts[0] == TagStats.from_lines(tags[:1])  # Adding leaves both sides unchanged
+    assert pickle.loads(pickle.dumps(whole)) == whole
+
+
+def test_stage_write(tmp_path, capsys):
+    lines = [TextLine(id=str(i), text="", custom=custom) for i, custom in enumerate(LINES)]
+    report = {"regions": [TextRegion(idx=0, attrib={}, lines=lines[:2]), TextRegion(idx=1, attrib={}, lines=lines[2:])]}
+
+    stage = TagStatsStage(clean=True)
+    stage.write([stage.extract(report), TagStats()], str(tmp_path))
+
+    assert (tmp_path / "tag_counts_clean.txt").read_text() == "person: 2\nplace: 1\nnewTag: 1\n"
+    assert "place: placeName, 1\n" in (tmp_path / "tag_attribute_counts_clean.txt").read_text()
+    assert capsys.readouterr().out == "Tag total: 4\nTag attribute total: 2\n"
+
+
+def test_read_tag_stats(tmp_path):
+    from coleridge.data.pipeline import load_report
+
+    report_paths = []
+    for report_date in [1865, 1866]:
+        report_paths.append(str(tmp_path / f"{report_date}_combined_pages.xml"))
+        shutil.copy("tests/test_extract_entities.xml", report_paths[-1])
+
+    stats = read_tag_stats(report_paths[0])
+    assert stats == TagStatsStage().extract(load_report(report_paths[0]))
+    assert stats.tags["readingOrder"] > 0
+    assert count_reports(report_paths, workers=2) == count_reports(report_paths) == [stats, stats]